@@ -0,0 +1,116 @@
+"""
+Cold start check of the Lambda entry points.
+
+Imports the handler module in fresh interpreters (python -X importtime), then sends a first
+GET /metrics invocation through the handler, and reports the import and first invocation times,
+the slowest imported modules and the heavy SDKs loaded before any client is needed. Exits with
+status 1 when the median import time is over --budget-ms or a lazily imported SDK was loaded,
+so it can gate a CI job.
+
+Usage:
+    python -m benchmarks.cold_start --budget-ms 800
+    python -m benchmarks.cold_start --module src.job_handler --no-invoke --runs 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# imported by the adapters on first use, never by the entry points
+LAZY_MODULES = ("google.genai", "pymongo", "pypdf", "tenacity", "boto3", "httpx", "requests")
+
+CHILD_SCRIPT = """
+import json, sys, time
+started_at = time.perf_counter()
+import {module} as entry_point
+import_ms = (time.perf_counter() - started_at) * 1000
+first_invocation_ms = None
+if {invoke}:
+    event = {{
+        "resource": "/metrics", "path": "/metrics", "httpMethod": "GET", "headers": {{}},
+        "multiValueHeaders": {{}}, "queryStringParameters": None, "multiValueQueryStringParameters": None,
+        "pathParameters": None, "stageVariables": None, "body": None, "isBase64Encoded": False,
+        "requestContext": {{"resourcePath": "/metrics", "httpMethod": "GET", "path": "/metrics", "stage": "Prod", "identity": {{"sourceIp": "127.0.0.1"}}}}
+    }}
+    started_at = time.perf_counter()
+    response = entry_point.handler(event, None)
+    first_invocation_ms = (time.perf_counter() - started_at) * 1000
+    assert response["statusCode"] == 200, response
+lazy_loaded = [name for name in {lazy_modules!r} if name in sys.modules]
+print(json.dumps({{"import_ms": import_ms, "first_invocation_ms": first_invocation_ms, "lazy_loaded": lazy_loaded}}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    """Returns the cumulative import time in ms of each module from the -X importtime output"""
+    cumulative_ms = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative_ms[name.strip()] = int(cumulative_us) / 1000
+    return cumulative_ms
+
+
+def run_once(module: str, invoke: bool) -> tuple[dict, dict[str, float]]:
+    script = CHILD_SCRIPT.format(module=module, invoke=invoke, lazy_modules=LAZY_MODULES)
+    env = {**os.environ, "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "cold-start-check")}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True, text=True, env=env, check=False
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Cold start of {module} failed:\n{completed.stderr[-4000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1]), parse_importtime(completed.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold start check of the Lambda entry points")
+    parser.add_argument("--module", default="src.lambda_handler", help="entry point module exposing handler")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters, the median is reported")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fails when the median import time is over it")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules listed")
+    parser.add_argument("--no-invoke", action="store_true", help="only imports the module (e.g. for src.job_handler)")
+    parser.add_argument("--output", help="writes the report as json to this file")
+    args = parser.parse_args(argv)
+
+    runs = [run_once(args.module, not args.no_invoke) for _ in range(max(1, args.runs))]
+    import_ms = statistics.median(result["import_ms"] for result, _ in runs)
+    invocations_ms = [result["first_invocation_ms"] for result, _ in runs if result["first_invocation_ms"] is not None]
+    first_invocation_ms = statistics.median(invocations_ms) if invocations_ms else None
+    lazy_loaded = sorted({name for result, _ in runs for name in result["lazy_loaded"]})
+    # the modules of the last run, without the entry point itself
+    modules_ms = {name: ms for name, ms in runs[-1][1].items() if name != args.module}
+    slowest = sorted(modules_ms.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print(f"module={args.module} runs={len(runs)}")
+    print(f"import median={import_ms:.1f}ms" + (f" first invocation median={first_invocation_ms:.1f}ms" if first_invocation_ms is not None else ""))
+    print(f"{'module':<60}{'cumulative ms':>15}")
+    for name, ms in slowest:
+        print(f"{name:<60}{ms:>15.1f}")
+
+    failures = []
+    if lazy_loaded:
+        failures.append(f"lazily imported SDKs loaded at import time: {', '.join(lazy_loaded)}")
+    if args.budget_ms is not None and import_ms > args.budget_ms:
+        failures.append(f"import median {import_ms:.1f}ms over the {args.budget_ms:.0f}ms budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({
+                "module": args.module,
+                "import_ms": round(import_ms, 1),
+                "first_invocation_ms": round(first_invocation_ms, 1) if first_invocation_ms is not None else None,
+                "lazy_loaded": lazy_loaded,
+                "slowest_modules_ms": dict(slowest),
+                "failures": failures
+            }, output, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
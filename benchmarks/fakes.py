@@ -0,0 +1,206 @@
+import asyncio
+import copy
+import json
+import random
+import threading
+import time
+from datetime import date, datetime, timezone
+from src.domain.ports.extraction_cache_interface import IExtractionCache
+from src.domain.ports.llm_client_interface import ILlmClient
+from src.domain.ports.storage_repository_interface import IStorageRepository
+
+# shaped like the mocked response of process_data_service.py
+CANNED_EXTRACTION = {
+    "resume": "This is a legal case involving José Ribamar Alves Filho, who is suing Fundo de Investimento em Direitos Creditorios Nao Padronizados NPL II for alleged inexistência de débitos and damages.",
+    "timeline": [
+        {
+            "event_id": 0,
+            "event_name": "Ajuizamento da Ação",
+            "event_description": "José Ribamar Alves Filho proposes an \"Ação Declaratória de Inexistência de Débitos c/c Indenização por Danos Morais\" against FUNDO DE INVESTIMENTO EM DIREITOS CREDITÓRIOS NAO PADRONIZADOS NPL II.",
+            "event_date": "2024-10-22",
+            "event_page_init": 1,
+            "event_page_end": 1
+        },
+        {
+            "event_id": 1,
+            "event_name": "Designação de Audiência",
+            "event_description": "Audiência de Conciliação designada para o dia 24/03/2025 às 14:20.",
+            "event_date": "2024-11-27",
+            "event_page_init": 3,
+            "event_page_end": 3
+        },
+        {
+            "event_id": 2,
+            "event_name": "Ata de Audiência",
+            "event_description": "Realizada audiência de conciliação, sem acordo.",
+            "event_date": "2025-03-24",
+            "event_page_init": 5,
+            "event_page_end": 5
+        }
+    ],
+    "evidence": [
+        {"evidence_id": 0, "evidence_name": "Documentos anexos", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 1, "evidence_page_end": 1},
+        {"evidence_id": 1, "evidence_name": "CredNet Light", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 2, "evidence_page_end": 2},
+        {"evidence_id": 2, "evidence_name": "Procuração", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 4, "evidence_page_end": 4}
+    ]
+}
+
+
+class FakeLlmError(Exception):
+    """Injected provider failure, the 503 code makes it a transient error for the policy layer"""
+    code = 503
+
+
+class FakeLlmClient(ILlmClient):
+    """ILlmClient returning canned data after a simulated latency, with an optional error rate"""
+    def __init__(self, latency_seconds: float = 1.0, jitter_seconds: float = 0.2, error_rate: float = 0.0, seed: int | None = None):
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _next_delay(self) -> float:
+        with self._lock:
+            if self._random.random() < self.error_rate:
+                raise FakeLlmError("503 UNAVAILABLE (injected by the benchmark)")
+            return max(0.0, self.latency_seconds + self._random.uniform(-self.jitter_seconds, self.jitter_seconds))
+
+    def extract_data_from_pdf(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        time.sleep(self._next_delay())
+        return copy.deepcopy(CANNED_EXTRACTION)
+
+    async def extract_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        await asyncio.sleep(self._next_delay())
+        return copy.deepcopy(CANNED_EXTRACTION)
+
+    def extract_data_from_text(self, document_text: str) -> dict:
+        time.sleep(self._next_delay())
+        return copy.deepcopy(CANNED_EXTRACTION)
+
+    async def extract_data_from_text_async(self, document_text: str) -> dict:
+        await asyncio.sleep(self._next_delay())
+        return copy.deepcopy(CANNED_EXTRACTION)
+
+    async def _stream_canned_extraction(self, fragments: int = 20):
+        # the simulated latency is spread over the fragments of the json text
+        delay = self._next_delay() / fragments
+        text = json.dumps(CANNED_EXTRACTION, ensure_ascii=False)
+        size = -(-len(text) // fragments)
+        for start in range(0, len(text), size):
+            await asyncio.sleep(delay)
+            yield text[start:start + size]
+
+    async def stream_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None):
+        async for fragment in self._stream_canned_extraction():
+            yield fragment
+
+    async def stream_data_from_text_async(self, document_text: str):
+        async for fragment in self._stream_canned_extraction():
+            yield fragment
+
+    async def extract_chunk_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        await asyncio.sleep(self._next_delay())
+        data = copy.deepcopy(CANNED_EXTRACTION)
+        return {"timeline": data["timeline"], "evidence": data["evidence"]}
+
+    async def generate_resume_async(self, data: dict) -> str:
+        await asyncio.sleep(self._next_delay())
+        return CANNED_EXTRACTION["resume"]
+
+    def get_fingerprint(self) -> str:
+        return "fake-llm"
+
+
+class InMemoryStorageRepository(IStorageRepository):
+    """IStorageRepository keeping the documents in dictionaries, replaces MongoDB in the benchmarks"""
+    def __init__(self):
+        self.process_data: dict[str, dict] = {}
+        self.jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def save(self, case_id: str, data: dict) -> None:
+        with self._lock:
+            self.process_data[case_id] = {**data, "updated_at": datetime.now(timezone.utc)}
+
+    async def save_async(self, case_id: str, data: dict) -> None:
+        self.save(case_id, data)
+
+    async def save_many_async(self, data_by_case_id: dict[str, dict]) -> None:
+        for case_id, data in data_by_case_id.items():
+            self.save(case_id, data)
+
+    def _project(self, data: dict, summary_only: bool) -> dict:
+        if summary_only:
+            return {key: data[key] for key in ("case_id", "resume", "persisted_at")}
+        return {key: value for key, value in data.items() if key not in ("updated_at", "page_hashes")}
+
+    async def find_by_case_id_async(self, case_id: str, summary_only: bool = False) -> dict | None:
+        with self._lock:
+            data = self.process_data.get(case_id)
+        return self._project(data, summary_only) if data else None
+
+    async def find_page_hashes_async(self, case_id: str) -> list[str] | None:
+        with self._lock:
+            return (self.process_data.get(case_id) or {}).get("page_hashes")
+
+    async def find_cases_async(
+        self,
+        persisted_from: datetime | None = None,
+        persisted_to: datetime | None = None,
+        event_date_from: date | None = None,
+        event_date_to: date | None = None,
+        evidence_name: str | None = None,
+        after: tuple[str, str] | None = None,
+        limit: int = 20,
+        summary_only: bool = True
+    ) -> list[dict]:
+        def parse(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+        def matches(data: dict) -> bool:
+            persisted_at = parse(data["persisted_at"])
+            if persisted_from and persisted_at < persisted_from or persisted_to and persisted_at >= persisted_to:
+                return False
+            if (event_date_from or event_date_to) and not any(
+                (not event_date_from or event["event_date"] >= event_date_from.isoformat())
+                and (not event_date_to or event["event_date"] <= event_date_to.isoformat())
+                for event in data["timeline"]
+            ):
+                return False
+            if evidence_name and not any(item["evidence_name"] == evidence_name for item in data["evidence"]):
+                return False
+            # compared as instants, like the mongo dates
+            return after is None or (persisted_at, data["case_id"]) < (parse(after[0]), after[1])
+
+        with self._lock:
+            cases = [data for data in self.process_data.values() if matches(data)]
+        cases.sort(key=lambda data: (parse(data["persisted_at"]), data["case_id"]), reverse=True)
+        return [self._project(data, summary_only) for data in cases[:limit]]
+
+    async def ensure_indexes_async(self) -> None:
+        pass
+
+    async def save_job_async(self, job_id: str, data: dict) -> None:
+        with self._lock:
+            self.jobs[job_id] = {**self.jobs.get(job_id, {}), **data}
+
+    async def find_job_async(self, job_id: str) -> dict | None:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+
+class NoExtractionCache(IExtractionCache):
+    """Cache that never hits, so every request goes through the extraction"""
+    def __init__(self):
+        self.misses = 0
+
+    def get(self, key: str) -> dict | None:
+        self.misses += 1
+        return None
+
+    def set(self, key: str, data: dict) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"hits": 0, "misses": self.misses}
@@ -0,0 +1,87 @@
+import io
+import logging
+import re
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+logger = logging.getLogger(__name__)
+
+PDF_PATH_PATTERN = re.compile(r"^/docs/(\d+)(?:-([\w-]+))?\.pdf$")
+
+
+@lru_cache(maxsize=32)
+def build_synthetic_pdf(page_count: int, variant: str = "") -> bytes:
+    """Returns a pdf with page_count A4 pages, each with a line of text, the variant makes its content unique"""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica")
+    }))
+    for page_number in range(1, page_count + 1):
+        page = writer.add_blank_page(width=595, height=842)
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 72 770 Td (Synthetic legal process {variant}, page {page_number} of {page_count}) Tj ET".encode("latin-1"))
+        page[NameObject("/Contents")] = writer._add_object(content)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+class _PdfRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        match = PDF_PATH_PATTERN.match(self.path)
+        if match is None:
+            self.send_error(404)
+            return
+        pdf_binary = build_synthetic_pdf(int(match.group(1)), match.group(2) or "")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(pdf_binary)))
+        self.end_headers()
+        self.wfile.write(pdf_binary)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _PdfHttpServer(ThreadingHTTPServer):
+    # the default backlog of 5 drops concurrent connections, which then wait for a syn retransmission
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class PdfServer:
+    """
+    Local http server of synthetic pdfs, GET /docs/{page_count}.pdf returns a document with that many pages
+    and GET /docs/{page_count}-{variant}.pdf a document of distinct content for each variant
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = _PdfHttpServer((host, port), _PdfRequestHandler)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, page_count: int, variant: str | None = None) -> str:
+        if variant:
+            return f"{self.base_url}/docs/{page_count}-{variant}.pdf"
+        return f"{self.base_url}/docs/{page_count}.pdf"
+
+    def start(self) -> "PdfServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="pdf-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Serving synthetic pdfs at {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,298 @@
+"""
+Offline load test of POST /extract.
+
+Runs the FastAPI app in-process, directly over ASGI or through the Mangum Lambda handler, with a
+fake LLM client, an in-memory repository and a local server of synthetic pdfs, so the download,
+extract and persist path can be measured without a Gemini key or a MongoDB.
+
+Usage:
+    python -m benchmarks.run_benchmark --mode asgi --requests 200 --concurrency 20 --pages 5,40,150
+    python -m benchmarks.run_benchmark --mode mangum --requests 100 --concurrency 4 --llm-latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import threading
+import time
+from functools import wraps
+from types import SimpleNamespace
+import httpx
+from src.application.services.process_data_service import ProcessDataService
+from src.application.use_cases.extract_process_data_use_case import ProcessDataUseCase
+from src.infrastruture.adapters.memory_extraction_cache import InMemoryExtractionCache
+from src.infrastruture.adapters.resilient_llm_client import ResilientLlmClient
+from src.infrastruture.configs.app_config import settings
+from src.main import app, handler
+from src.routes.process__data_routes import get_process_data_use_case
+from benchmarks.fakes import FakeLlmClient, InMemoryStorageRepository, NoExtractionCache
+from benchmarks.pdf_server import PdfServer
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Records the duration of the wrapped methods by stage name, shared by all the requests of a run"""
+    def __init__(self):
+        self.durations: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def wrap_async(self, obj, method_name: str, stage: str) -> None:
+        method = getattr(obj, method_name)
+
+        @wraps(method)
+        async def timed(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started_at)
+
+        setattr(obj, method_name, timed)
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile, 0 for an empty list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def get_peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_use_case(args, stage_timer: StageTimer, async_http_client: httpx.AsyncClient) -> ProcessDataUseCase:
+    """Wires the real service and use case with the fakes, timing each stage"""
+    llm_client = FakeLlmClient(
+        latency_seconds=args.llm_latency,
+        jitter_seconds=args.llm_jitter,
+        error_rate=args.llm_error_rate,
+        seed=args.seed
+    )
+    if args.with_policy:
+        llm_client = ResilientLlmClient(
+            llm_client,
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+            estimated_tokens_per_request=settings.LLM_ESTIMATED_TOKENS_PER_REQUEST,
+            max_retries=settings.LLM_MAX_RETRIES,
+            retry_base_seconds=settings.LLM_RETRY_BASE_SECONDS,
+            retry_max_seconds=settings.LLM_RETRY_MAX_SECONDS,
+            call_timeout_seconds=settings.LLM_CALL_TIMEOUT_SECONDS,
+            circuit_failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            circuit_reset_seconds=settings.LLM_CIRCUIT_RESET_SECONDS
+        )
+    extraction_cache = InMemoryExtractionCache(max_size=settings.EXTRACTION_CACHE_MAX_SIZE) if args.cache else NoExtractionCache()
+    process_data_service = ProcessDataService(
+        llm_client=llm_client,
+        async_http_client=async_http_client,
+        extraction_cache=extraction_cache
+    )
+    use_case = ProcessDataUseCase(
+        process_data_service=process_data_service,
+        storage_repository=InMemoryStorageRepository()
+    )
+    stage_timer.wrap_async(process_data_service, "dowload_pdf_from_url_async", "download")
+    stage_timer.wrap_async(process_data_service, "extract_information_from_pdf_async", "extract")
+    stage_timer.wrap_async(use_case.storage_repository, "save_async", "persist")
+    return use_case
+
+
+def build_payloads(pdf_server: PdfServer, page_counts: list[int], count: int, prefix: str, same_document: bool = False) -> list[dict]:
+    # distinct documents by default, so the coalescing of identical extractions does not skip the llm calls
+    return [
+        {
+            "pdf_url": pdf_server.url_for(page_counts[index % len(page_counts)], None if same_document else f"{prefix}-{index}"),
+            "case_id": f"{prefix}-{index}"
+        }
+        for index in range(count)
+    ]
+
+
+def build_api_gateway_event(payload: dict) -> dict:
+    """API Gateway REST (v1) proxy event of POST /extract, as sent to the Lambda function"""
+    return {
+        "resource": "/extract",
+        "path": "/extract",
+        "httpMethod": "POST",
+        "headers": {"content-type": "application/json", "host": "localhost"},
+        "multiValueHeaders": {},
+        "queryStringParameters": None,
+        "multiValueQueryStringParameters": None,
+        "pathParameters": None,
+        "stageVariables": None,
+        "requestContext": {
+            "resourcePath": "/extract",
+            "httpMethod": "POST",
+            "path": "/Prod/extract",
+            "stage": "Prod",
+            "identity": {"sourceIp": "127.0.0.1"}
+        },
+        "body": json.dumps(payload),
+        "isBase64Encoded": False
+    }
+
+
+async def run_asgi(args, stage_timer: StageTimer, payloads: list[dict], warmup_payloads: list[dict]) -> tuple[list[tuple[float, int]], float]:
+    """
+    Sends the requests to the app over ASGI, concurrency requests at a time, in a single event loop.
+    Returns the latency and status code of each request and the elapsed seconds after the warmup.
+    """
+    async with httpx.AsyncClient(follow_redirects=True) as async_http_client:
+        use_case = build_use_case(args, stage_timer, async_http_client)
+        app.dependency_overrides[get_process_data_use_case] = lambda: use_case
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def send(payload: dict) -> tuple[float, int]:
+                async with semaphore:
+                    started_at = time.perf_counter()
+                    response = await client.post("/extract", json=payload)
+                    return time.perf_counter() - started_at, response.status_code
+
+            await asyncio.gather(*[send(payload) for payload in warmup_payloads])
+            stage_timer.durations.clear()
+            started_at = time.perf_counter()
+            results = await asyncio.gather(*[send(payload) for payload in payloads])
+            return results, time.perf_counter() - started_at
+
+
+def run_mangum(args, stage_timer: StageTimer, payloads: list[dict], warmup_payloads: list[dict]) -> tuple[list[tuple[float, int]], float]:
+    """
+    Invokes the Mangum handler with API Gateway events. Each thread plays a warm Lambda container:
+    it has its own event loop and clients and handles one invocation at a time.
+    """
+    local = threading.local()
+
+    async def get_local_use_case() -> ProcessDataUseCase:
+        # async, so it is resolved in the thread of the invocation and not in the threadpool
+        return local.use_case
+
+    app.dependency_overrides[get_process_data_use_case] = get_local_use_case
+    results = []
+    results_lock = threading.Lock()
+    started_at = []
+
+    def start_measuring() -> None:
+        stage_timer.durations.clear()
+        started_at.append(time.perf_counter())
+
+    warmed_up = threading.Barrier(args.concurrency, action=start_measuring)
+
+    def container(index: int) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        async_http_client = httpx.AsyncClient(follow_redirects=True)
+        local.use_case = build_use_case(args, stage_timer, async_http_client)
+        context = SimpleNamespace(function_name="benchmark", aws_request_id=f"benchmark-{index}")
+        try:
+            for payload in warmup_payloads[index::args.concurrency]:
+                handler(build_api_gateway_event(payload), context)
+            warmed_up.wait()
+            for payload in payloads[index::args.concurrency]:
+                started_at = time.perf_counter()
+                response = handler(build_api_gateway_event(payload), context)
+                with results_lock:
+                    results.append((time.perf_counter() - started_at, response["statusCode"]))
+        finally:
+            loop.run_until_complete(async_http_client.aclose())
+            loop.close()
+
+    threads = [threading.Thread(target=container, args=(index,), name=f"container-{index}") for index in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started_at[0]
+
+
+def build_report(args, results: list[tuple[float, int]], stage_timer: StageTimer, elapsed_seconds: float) -> dict:
+    latencies = [latency for latency, _ in results]
+    errors = sum(1 for _, status_code in results if status_code != 200)
+    return {
+        "mode": args.mode,
+        "requests": len(results),
+        "concurrency": args.concurrency,
+        "pages": args.pages,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "rps": round(len(results) / elapsed_seconds, 2) if elapsed_seconds else 0.0,
+        "latency_ms": {f"p{p}": round(percentile(latencies, p) * 1000, 1) for p in (50, 95, 99)},
+        "stages_ms": {
+            stage: {f"p{p}": round(percentile(durations, p) * 1000, 1) for p in (50, 95, 99)}
+            for stage, durations in stage_timer.durations.items()
+        },
+        "peak_rss_mb": round(get_peak_rss_mb(), 1)
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"mode={report['mode']} requests={report['requests']} concurrency={report['concurrency']} pages={report['pages']}")
+    print(f"errors={report['errors']} elapsed={report['elapsed_seconds']}s rps={report['rps']} peak_rss={report['peak_rss_mb']}MB")
+    print(f"{'stage':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, latency in [("request", report["latency_ms"]), *report["stages_ms"].items()]:
+        print(f"{stage:<10}{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test of POST /extract")
+    parser.add_argument("--mode", choices=("asgi", "mangum"), default="asgi", help="call the app over ASGI or through the Lambda handler")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10, help="in-flight requests (asgi) or warm containers (mangum)")
+    parser.add_argument("--warmup", type=int, default=5, help="requests sent before measuring")
+    parser.add_argument("--pages", default="5,40", help="comma separated page counts of the synthetic pdfs")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per fake llm call")
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="share of fake llm calls failing with a 503")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--with-policy", action="store_true", help="wrap the fake llm in the retry/rate limit policy (LLM_* settings)")
+    parser.add_argument("--cache", action="store_true", help="enable the in-memory extraction cache")
+    parser.add_argument("--same-document", action="store_true", help="every request of a page count downloads the same pdf, concurrent extractions are coalesced")
+    parser.add_argument("--text-mode", action="store_true", help="send the page-tagged text layer instead of the pdf (PDF_TEXT_MODE_ENABLED)")
+    parser.add_argument("--output", help="writes the report as json to this file")
+    parser.add_argument("--verbose", action="store_true", help="keeps the info logs of the app")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    args.concurrency = max(1, args.concurrency)
+    if not args.verbose:
+        logging.disable(logging.INFO)
+    page_counts = [int(pages) for pages in args.pages.split(",")]
+    if args.text_mode:
+        settings.PDF_TEXT_MODE_ENABLED = True
+
+    pdf_server = PdfServer().start()
+    stage_timer = StageTimer()
+    try:
+        payloads = build_payloads(pdf_server, page_counts, args.requests, "bench", args.same_document)
+        warmup_payloads = build_payloads(pdf_server, page_counts, args.warmup, "warmup", args.same_document)
+        if args.mode == "asgi":
+            results, elapsed_seconds = asyncio.run(run_asgi(args, stage_timer, payloads, warmup_payloads))
+        else:
+            results, elapsed_seconds = run_mangum(args, stage_timer, payloads, warmup_payloads)
+    finally:
+        app.dependency_overrides.pop(get_process_data_use_case, None)
+        pdf_server.stop()
+
+    report = build_report(args, results, stage_timer, elapsed_seconds)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from fastapi import FastAPI, Request
+from starlette.routing import Match
+from src.routes.process__data_routes import router as process_data_router
+from src.routes.extraction_jobs_routes import router as extraction_jobs_router
+from src.routes.metrics_routes import router as metrics_router
+from src.routes.cases_routes import router as cases_router
+from src.infrastruture.configs.app_config import settings
+from src.infrastruture.adapters.prometheus_metrics_recorder import get_metrics_recorder
+
+
+def get_route_path(request: Request) -> str:
+    """Returns the path template of the matched route, so the metric labels do not grow with the ids"""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+def create_app(lifespan=None) -> FastAPI:
+    """
+    Builds the api with its routes and middlewares. The clients are not built here but by the
+    container on first use, so importing and creating the app stays cheap on a cold start.
+    """
+    app = FastAPI(title="Cria AI Juridic Intelligence Challenge", version="1.0.0", lifespan=lifespan)
+    app.include_router(process_data_router)
+    app.include_router(extraction_jobs_router)
+    app.include_router(metrics_router)
+    app.include_router(cases_router)
+
+    if settings.PROFILING_ENABLED:
+        from src.infrastruture.adapters.request_profiler import RequestProfiler
+        request_profiler = RequestProfiler(settings.PROFILING_OUTPUT_DIR)
+
+        @app.middleware("http")
+        async def profile_request(request: Request, call_next):
+            # the 'X-Profile: 1' header profiles a single request
+            if request.headers.get("x-profile") != "1":
+                return await call_next(request)
+            with request_profiler.profile(f"{request.method} {request.url.path}") as profile_path:
+                response = await call_next(request)
+            if profile_path:
+                response.headers["X-Profile-File"] = profile_path
+            return response
+
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        metrics_recorder = get_metrics_recorder()
+        route_path = get_route_path(request)
+        # the stage timings, sizes and tokens recorded while handling the request are published together
+        with metrics_recorder.request(f"{request.method} {route_path}") as request_metrics:
+            response = await call_next(request)
+        labels = {"method": request.method, "route": route_path}
+        metrics_recorder.increment("http_requests_total", labels={**labels, "status": str(response.status_code)})
+        metrics_recorder.observe("http_request_duration_seconds", request_metrics["request_seconds"], labels)
+        return response
+
+    return app
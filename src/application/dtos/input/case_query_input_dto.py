@@ -0,0 +1,19 @@
+import datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class CaseView(str, Enum):
+    SUMMARY = "summary"
+    FULL = "full"
+
+class CaseQueryInputDTO(BaseModel):
+    persisted_from: datetime.datetime | None = Field(None, description="Cases persisted at or after this instant")
+    persisted_to: datetime.datetime | None = Field(None, description="Cases persisted before this instant")
+    event_date_from: datetime.date | None = Field(None, description="Cases with a timeline event on or after this date")
+    event_date_to: datetime.date | None = Field(None, description="Cases with a timeline event on or before this date")
+    evidence_name: str | None = Field(None, description="Cases with an evidence item with exactly this name")
+    cursor: str | None = Field(None, description="The next_cursor of the previous page")
+    limit: int = Field(20, ge=1, le=100)
+    view: CaseView = CaseView.SUMMARY
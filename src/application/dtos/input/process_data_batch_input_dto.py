@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field, field_validator
+
+from src.application.dtos.input.process_data_input_dto import ProcessDataInputDTO
+
+
+class ProcessDataBatchInputDTO(BaseModel):
+    items: list[ProcessDataInputDTO] = Field(..., min_length=1)
+
+    @field_validator("items")
+    @classmethod
+    def check_unique_case_ids(cls, items: list[ProcessDataInputDTO]) -> list[ProcessDataInputDTO]:
+        # the results are persisted by case_id, a repeated case would overwrite the other one
+        case_ids = [item.case_id for item in items]
+        duplicates = sorted({case_id for case_id in case_ids if case_ids.count(case_id) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate case_id in the batch: {', '.join(duplicates)}")
+        return items
\ No newline at end of file
@@ -0,0 +1,16 @@
+import datetime
+
+from pydantic import BaseModel
+
+from src.application.dtos.output.process_data_output_dto import ProcessDataOutputDTO
+
+
+class CaseSummaryOutputDTO(BaseModel):
+    case_id: str
+    resume: str
+    persisted_at: datetime.datetime
+
+class CaseListOutputDTO(BaseModel):
+    items: list[ProcessDataOutputDTO | CaseSummaryOutputDTO]
+    # None on the last page
+    next_cursor: str | None = None
@@ -0,0 +1,20 @@
+import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ExtractionJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class ExtractionJobOutputDTO(BaseModel):
+    job_id: str
+    case_id: str
+    pdf_url: str
+    status: ExtractionJobStatus
+    error: str | None = None
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
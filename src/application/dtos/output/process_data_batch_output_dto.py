@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+from src.application.dtos.output.process_data_output_dto import ProcessDataOutputDTO
+
+
+class ProcessDataBatchItemOutputDTO(BaseModel):
+    case_id: str
+    pdf_url: str
+    success: bool
+    data: ProcessDataOutputDTO | None = None
+    error: str | None = None
+
+class ProcessDataBatchOutputDTO(BaseModel):
+    succeeded: int
+    failed: int
+    items: list[ProcessDataBatchItemOutputDTO]
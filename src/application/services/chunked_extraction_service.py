@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from src.domain.ports.llm_client_interface import ILlmClient
+from src.domain.ports.pdf_processor_interface import IPdfProcessor
+
+
+class ChunkedExtractionService:
+    """
+    Extracts large documents by splitting them into overlapping page ranges (map) and merging
+    the timeline and evidence of each range into a single result (reduce).
+    """
+    def __init__(
+        self,
+        llm_client: ILlmClient,
+        pdf_processor: IPdfProcessor,
+        chunk_pages: int = 40,
+        overlap_pages: int = 2,
+        max_parallel_chunks: int = 4
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.llm_client = llm_client
+        self.pdf_processor = pdf_processor
+        self.chunk_pages = chunk_pages
+        self.overlap_pages = min(overlap_pages, chunk_pages - 1)
+        self.max_parallel_chunks = max_parallel_chunks
+
+    def build_page_ranges(self, page_count: int, first_page: int = 1) -> list[tuple[int, int]]:
+        """Returns the 1-based inclusive page ranges of the chunks from first_page, consecutive ranges share overlap_pages pages"""
+        page_ranges = []
+        page_init = first_page
+        while True:
+            page_end = min(page_init + self.chunk_pages - 1, page_count)
+            page_ranges.append((page_init, page_end))
+            if page_end >= page_count:
+                return page_ranges
+            page_init = page_end - self.overlap_pages + 1
+
+    async def extract_async(self, pdf_binary: bytes, page_count: int) -> dict:
+        """
+        Extracts the data of the document chunk by chunk.
+
+        Args:
+            pdf_binary: the pdf file in binary format.
+            page_count: the number of pages of the document.
+
+        Returns:
+            a dictionary with the information extracted from the pdf document ('resume', 'timeline', 'evidence').
+        """
+        timeline, evidence = await self.extract_pages_async(pdf_binary, page_count)
+
+        merged_data = {
+            "timeline": self._merge_timeline(timeline),
+            "evidence": self._merge_evidence(evidence)
+        }
+
+        # reduce: the summary is written from the merged data of the whole document
+        merged_data["resume"] = await self.llm_client.generate_resume_async(merged_data)
+        return merged_data
+
+    async def extract_pages_async(self, pdf_binary: bytes, page_count: int, first_page: int = 1) -> tuple[list[dict], list[dict]]:
+        """
+        Extracts the pages from first_page to page_count chunk by chunk (map), without merging them.
+
+        Returns:
+            the timeline events and the evidence of every chunk, with absolute page numbers.
+        """
+        page_ranges = self.build_page_ranges(page_count, first_page)
+        self.logger.info(f"Extracting pages {first_page} to {page_count} in {len(page_ranges)} chunks")
+
+        # pdf parsing is cpu bound, it runs in a worker thread
+        chunks = await asyncio.to_thread(self.pdf_processor.split, pdf_binary, page_ranges)
+
+        semaphore = asyncio.Semaphore(self.max_parallel_chunks)
+
+        async def extract_chunk(chunk_binary: bytes, page_init: int, page_end: int) -> dict:
+            async with semaphore:
+                # the page count of the chunk is known, the router does not parse it again
+                return await self.llm_client.extract_chunk_data_from_pdf_async(chunk_binary, page_end - page_init + 1)
+
+        chunk_results = await asyncio.gather(*[
+            extract_chunk(chunk, page_init, page_end) for chunk, (page_init, page_end) in zip(chunks, page_ranges)
+        ])
+        del chunks
+
+        timeline = []
+        evidence = []
+        for (page_init, _), chunk_result in zip(page_ranges, chunk_results):
+            offset = page_init - 1
+            timeline.extend(self._offset_pages(chunk_result.get("timeline") or [], "event", offset))
+            evidence.extend(self._offset_pages(chunk_result.get("evidence") or [], "evidence", offset))
+        return timeline, evidence
+
+    def _offset_pages(self, items: list[dict], prefix: str, offset: int) -> list[dict]:
+        """Converts the page numbers relative to the chunk into absolute page numbers, -1 (unknown) is kept"""
+        for item in items:
+            for key in (f"{prefix}_page_init", f"{prefix}_page_end"):
+                page = item.get(key)
+                if isinstance(page, int) and page > 0:
+                    item[key] = page + offset
+        return items
+
+    def _normalize(self, text: str | None) -> str:
+        return " ".join((text or "").lower().split())
+
+    def _pages_overlap(self, item: dict, other: dict, prefix: str) -> bool:
+        init, end = item.get(f"{prefix}_page_init", -1), item.get(f"{prefix}_page_end", -1)
+        other_init, other_end = other.get(f"{prefix}_page_init", -1), other.get(f"{prefix}_page_end", -1)
+        if init < 0 or other_init < 0:
+            return init == other_init
+        return init <= max(other_end, other_init) and other_init <= max(end, init)
+
+    def _merge_duplicate(self, kept: dict, duplicate: dict, prefix: str, text_key: str) -> None:
+        """Merges an item extracted twice (from the overlap of two chunks) into the kept one"""
+        init_key, end_key = f"{prefix}_page_init", f"{prefix}_page_end"
+        pages_init = [page for page in (kept.get(init_key), duplicate.get(init_key)) if isinstance(page, int) and page > 0]
+        pages_end = [page for page in (kept.get(end_key), duplicate.get(end_key)) if isinstance(page, int) and page > 0]
+        if pages_init:
+            kept[init_key] = min(pages_init)
+        if pages_end:
+            kept[end_key] = max(pages_end)
+        if len(duplicate.get(text_key) or "") > len(kept.get(text_key) or ""):
+            kept[text_key] = duplicate[text_key]
+
+    def _deduplicate(self, items: list[dict], prefix: str, identity_keys: tuple[str, ...], text_key: str) -> list[dict]:
+        merged = []
+        for item in items:
+            identity = tuple(self._normalize(str(item.get(key))) for key in identity_keys)
+            duplicate_of = next((
+                kept for kept in merged
+                if tuple(self._normalize(str(kept.get(key))) for key in identity_keys) == identity
+                and self._pages_overlap(kept, item, prefix)
+            ), None)
+            if duplicate_of is None:
+                merged.append(item)
+            else:
+                self._merge_duplicate(duplicate_of, item, prefix, text_key)
+        return merged
+
+    def _merge_timeline(self, timeline: list[dict]) -> list[dict]:
+        """De-duplicates the events of the chunk boundaries, sorts them chronologically and renumbers the ids"""
+        events = self._deduplicate(timeline, "event", ("event_name", "event_date"), "event_description")
+        events.sort(key=lambda event: (event.get("event_date") or "", event.get("event_page_init", -1)))
+        for event_id, event in enumerate(events):
+            event["event_id"] = event_id
+        return events
+
+    def _merge_evidence(self, evidence: list[dict]) -> list[dict]:
+        """De-duplicates the evidence of the chunk boundaries, sorts it by page and renumbers the ids"""
+        items = self._deduplicate(evidence, "evidence", ("evidence_name",), "evidence_flaw")
+        items.sort(key=lambda item: item.get("evidence_page_init", -1))
+        for evidence_id, item in enumerate(items):
+            item["evidence_id"] = evidence_id
+        return items
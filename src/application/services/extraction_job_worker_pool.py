@@ -0,0 +1,45 @@
+import asyncio
+import logging
+from src.application.use_cases.extraction_job_use_case import ExtractionJobUseCase
+from src.domain.ports.job_queue_interface import IJobQueue
+
+
+class ExtractionJobWorkerPool:
+    """Consumes the job queue with a fixed number of workers, which bounds the concurrent extractions"""
+    def __init__(self, job_queue: IJobQueue, job_use_case: ExtractionJobUseCase, workers: int, wait_seconds: int = 20):
+        self.logger = logging.getLogger(__name__)
+        self.job_queue = job_queue
+        self.job_use_case = job_use_case
+        self.workers = workers
+        self.wait_seconds = wait_seconds
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._run(index)) for index in range(self.workers)]
+        self.logger.info(f"Started {self.workers} extraction job workers")
+
+    async def stop(self) -> None:
+        """Cancels the workers, a job interrupted mid-extraction stays in the 'running' state"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.logger.info("Stopped extraction job workers")
+
+    async def _run(self, index: int) -> None:
+        while True:
+            try:
+                received = await self.job_queue.dequeue(self.wait_seconds)
+                if received is None:
+                    continue
+                receipt, message = received
+                await self.job_use_case.process_async(message)
+                await self.job_queue.ack(receipt)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # keep the worker alive, the message is redelivered by queues with visibility timeout
+                self.logger.error(f"Extraction job worker {index} error: {e}", exc_info=True)
+                await asyncio.sleep(1)
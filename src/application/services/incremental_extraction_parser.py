@@ -0,0 +1,78 @@
+import json
+
+# top-level lists of the extraction json and the event name of their items
+LIST_EVENTS = {"timeline": "timeline_event", "evidence": "evidence"}
+
+
+class IncrementalExtractionParser:
+    """
+    Parses the json of an extraction ('resume', 'timeline', 'evidence') while it is streamed.
+
+    feed() scans the new text once, tracking the nesting and the strings, and returns the
+    top-level 'resume' and each item of the 'timeline' and 'evidence' lists as soon as its
+    closing quote or brace arrives, so they are delivered before the whole json is complete.
+    """
+    def __init__(self):
+        self._text = ""
+        self._position = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key = None
+        self._item_start = None
+
+    def feed(self, fragment: str) -> list[tuple[str, object]]:
+        """Adds a fragment of the json and returns the (event, value) of the values completed by it"""
+        self._text += fragment
+        events = []
+        text = self._text
+        for index in range(self._position, len(text)):
+            char = text[index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._end_top_level_string(text[self._string_start:index + 1], events)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                self._stack.append(char)
+                if len(self._stack) == 1:
+                    self._expect_key = True
+                elif len(self._stack) == 3 and char == "{" and self._stack[1] == "[" and self._key in LIST_EVENTS:
+                    self._item_start = index
+            elif char in "}]":
+                if len(self._stack) == 3 and char == "}" and self._item_start is not None:
+                    events.append((LIST_EVENTS[self._key], json.loads(text[self._item_start:index + 1])))
+                    self._item_start = None
+                if self._stack:
+                    self._stack.pop()
+            elif len(self._stack) == 1:
+                if char == ":":
+                    self._expect_key = False
+                elif char == ",":
+                    self._expect_key = True
+        self._position = len(text)
+        return events
+
+    def _end_top_level_string(self, raw: str, events: list) -> None:
+        if self._expect_key:
+            self._key = json.loads(raw)
+        elif self._key == "resume":
+            events.append(("resume", json.loads(raw)))
+
+    def result(self) -> dict:
+        """Parses the whole streamed json, once the stream is over"""
+        try:
+            return json.loads(self._text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON from the streamed response: {e}") from e
@@ -0,0 +1,73 @@
+import copy
+from src.application.services.chunked_extraction_service import ChunkedExtractionService
+
+
+class IncrementalExtractionService(ChunkedExtractionService):
+    """
+    Re-extracts a document that grew since its stored version: only the appended pages are sent to
+    the llm (chunk by chunk), their timeline and evidence are appended to the stored ones with
+    continued ids, and the resume is written again from the merged data.
+    """
+    def find_stored_page_count(self, stored_page_hashes: list[str] | None, page_hashes: list[str]) -> int | None:
+        """Returns the page count of the stored version when the document only has new pages at its end, else None"""
+        if not stored_page_hashes or len(page_hashes) <= len(stored_page_hashes):
+            return None
+        if page_hashes[:len(stored_page_hashes)] != stored_page_hashes:
+            return None
+        return len(stored_page_hashes)
+
+    async def extract_appended_async(self, pdf_binary: bytes, page_count: int, stored_data: dict, stored_page_count: int) -> dict:
+        """
+        Extracts the pages after stored_page_count and merges them into the stored data.
+
+        Args:
+            pdf_binary: the pdf file in binary format, with the stored pages first.
+            page_count: the number of pages of the document.
+            stored_data: the persisted extraction of the first stored_page_count pages ('timeline', 'evidence').
+            stored_page_count: the number of pages of the stored version.
+
+        Returns:
+            a dictionary with the information extracted from the whole document ('resume', 'timeline', 'evidence').
+        """
+        self.logger.info(f"Extracting the {page_count - stored_page_count} pages appended after page {stored_page_count}")
+        # the last stored pages are extracted again, as the overlap of two chunks, so an item continuing
+        # on the new pages is merged into its stored version
+        first_page = max(1, stored_page_count + 1 - self.overlap_pages)
+        timeline, evidence = await self.extract_pages_async(pdf_binary, page_count, first_page)
+
+        # the new pages are merged like the chunks of a document, then appended after the stored items
+        timeline = self._deduplicate(timeline, "event", ("event_name", "event_date"), "event_description")
+        timeline.sort(key=lambda event: (event.get("event_date") or "", event.get("event_page_init", -1)))
+        evidence = self._deduplicate(evidence, "evidence", ("evidence_name",), "evidence_flaw")
+        evidence.sort(key=lambda item: item.get("evidence_page_init", -1))
+
+        merged_data = {
+            "timeline": self._append_items(stored_data.get("timeline") or [], timeline, "event", ("event_name", "event_date"), "event_description"),
+            "evidence": self._append_items(stored_data.get("evidence") or [], evidence, "evidence", ("evidence_name",), "evidence_flaw")
+        }
+        merged_data["resume"] = await self.llm_client.generate_resume_async(merged_data)
+        return merged_data
+
+    def _append_items(self, stored_items: list[dict], new_items: list[dict], prefix: str, identity_keys: tuple[str, ...], text_key: str) -> list[dict]:
+        """
+        Keeps the stored items and their ids. A new item that is a stored one extracted again (from the
+        overlap pages) is merged into it, the others get the next ids.
+        """
+        id_key = f"{prefix}_id"
+        merged = copy.deepcopy(stored_items)
+        next_id = max((item.get(id_key, -1) for item in merged), default=-1) + 1
+        stored_count = len(merged)
+        for item in new_items:
+            identity = tuple(self._normalize(str(item.get(key))) for key in identity_keys)
+            duplicate_of = next((
+                kept for kept in merged[:stored_count]
+                if tuple(self._normalize(str(kept.get(key))) for key in identity_keys) == identity
+                and self._pages_overlap(kept, item, prefix)
+            ), None)
+            if duplicate_of is not None:
+                self._merge_duplicate(duplicate_of, item, prefix, text_key)
+                continue
+            item[id_key] = next_id
+            next_id += 1
+            merged.append(item)
+        return merged
@@ -1,163 +1,443 @@
-import tempfile
-import requests
+import asyncio
+import copy
+import hashlib
+import io
 import logging
+import re
+import time
+import uuid
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
-from src.infrastruture.adapters.gemini_client import GeminiClient
+from src.application.services.chunked_extraction_service import ChunkedExtractionService
+from src.application.services.incremental_extraction_parser import IncrementalExtractionParser
+from src.application.services.incremental_extraction_service import IncrementalExtractionService
+from src.application.services.single_flight import SingleFlight
+from src.domain.entities.pdf_document_entity import PdfDocument
+from src.domain.entities.process_data_entity import ExtractedProcessData
+from src.domain.ports.extraction_cache_interface import IExtractionCache
+from src.domain.ports.extraction_lease_interface import IExtractionLease
+from src.domain.ports.llm_client_interface import ILlmClient
+from src.domain.ports.metrics_recorder_interface import IMetricsRecorder
+from src.domain.ports.pdf_processor_interface import IPdfProcessor
+from src.infrastruture.adapters.extraction_cache_factory import get_extraction_cache
+from src.infrastruture.adapters.prometheus_metrics_recorder import get_metrics_recorder
+from src.infrastruture.configs.app_config import settings
+
+if TYPE_CHECKING:
+    import httpx
 
 logger = logging.getLogger(__name__)
 class ProcessDataService:
 
-    def __init__(self):
+    def __init__(
+        self,
+        llm_client: ILlmClient | None = None,
+        async_http_client: "httpx.AsyncClient | None" = None,
+        extraction_cache: IExtractionCache | None = None,
+        pdf_processor: IPdfProcessor | None = None,
+        metrics_recorder: IMetricsRecorder | None = None,
+        extraction_lease: IExtractionLease | None = None
+    ):
         self.logger = logging.getLogger(__name__)
-        self.llm_client =  GeminiClient()
-        
+        if llm_client is None:
+            # the sdk is only imported when no client is injected
+            from src.infrastruture.adapters.gemini_client import GeminiClient
+            llm_client = GeminiClient()
+        self.llm_client = llm_client
+        # when not provided, a client is opened per download
+        self.async_http_client = async_http_client
+        self.extraction_cache = extraction_cache or get_extraction_cache()
+        if pdf_processor is None:
+            from src.infrastruture.adapters.pypdf_processor import PyPdfProcessor
+            pdf_processor = PyPdfProcessor()
+        self.pdf_processor = pdf_processor
+        self.metrics_recorder = metrics_recorder or get_metrics_recorder()
+        # concurrent extractions of the same document share one llm call, in the process (single
+        # flight) and, with a lease and a shared cache, across instances
+        self.single_flight = SingleFlight()
+        self.extraction_lease = extraction_lease
+        self.chunked_extraction_service = None
+        if settings.CHUNKED_EXTRACTION_ENABLED:
+            self.chunked_extraction_service = ChunkedExtractionService(
+                llm_client=self.llm_client,
+                pdf_processor=self.pdf_processor,
+                chunk_pages=settings.CHUNK_PAGES,
+                overlap_pages=settings.CHUNK_OVERLAP_PAGES,
+                max_parallel_chunks=settings.CHUNK_MAX_PARALLEL
+            )
+        self.incremental_extraction_service = None
+        if settings.INCREMENTAL_EXTRACTION_ENABLED:
+            self.incremental_extraction_service = IncrementalExtractionService(
+                llm_client=self.llm_client,
+                pdf_processor=self.pdf_processor,
+                chunk_pages=settings.CHUNK_PAGES,
+                overlap_pages=settings.CHUNK_OVERLAP_PAGES,
+                max_parallel_chunks=settings.CHUNK_MAX_PARALLEL
+            )
+
+    def _build_cache_key(self, pdf_binary: bytes) -> str:
+        """Builds the content address of an extraction from the pdf hash and the llm prompt/model fingerprint"""
+        pdf_hash = hashlib.sha256(pdf_binary).hexdigest()
+        cache_key = f"{pdf_hash}:{self.llm_client.get_fingerprint()}"
+        # the text mode extracts from another input, its results are cached apart
+        return f"{cache_key}:text" if settings.PDF_TEXT_MODE_ENABLED else cache_key
     
-    def dowload_pdf_from_url(self, url: str) -> bytes:
+    def _validate_pdf_headers(self, headers) -> None:
+        """Validates the Content-Type and Content-Length headers before the body is downloaded"""
+        content_type = headers.get("Content-Type", "").lower()
+        if "application/pdf" not in content_type:
+            raise ValueError(f"Expected content type 'application/pdf' but got '{content_type}'")
+
+        content_length = headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > settings.PDF_MAX_SIZE_BYTES:
+            raise ValueError(f"PDF size {content_length} exceeds the limit of {settings.PDF_MAX_SIZE_BYTES} bytes")
+
+    def _append_pdf_chunk(self, buffer: io.BytesIO, chunk: bytes) -> None:
+        """Appends a downloaded chunk, validating the file signature and the max size as the body arrives"""
+        if buffer.tell() + len(chunk) > settings.PDF_MAX_SIZE_BYTES:
+            raise ValueError(f"PDF exceeds the limit of {settings.PDF_MAX_SIZE_BYTES} bytes")
+
+        # Validate file signature for PDF from the first bytes
+        if buffer.tell() < 5:
+            head = (buffer.getvalue() + chunk)[:5]
+            if len(head) == 5 and head != b'%PDF-':
+                raise ValueError("Downloaded file is not a valid PDF.")
+
+        buffer.write(chunk)
+
+    def _get_pdf_content(self, buffer: io.BytesIO) -> bytes:
+        if buffer.tell() < 5:
+            raise ValueError("Downloaded file is not a valid PDF.")
+        self.metrics_recorder.observe("pdf_bytes", buffer.tell())
+        # getvalue hands over the buffer without copying it
+        return buffer.getvalue()
+
+    def _count_pages(self, pdf_binary: bytes) -> int:
+        """Returns the page count of the pdf, or 0 if the pdf could not be parsed locally"""
+        try:
+            return self.pdf_processor.count_pages(pdf_binary)
+        except Exception as e:
+            self.logger.warning(f"Failed to count the pages of the PDF: {e}")
+            return 0
+
+    def _build_document_text(self, document: PdfDocument) -> str | None:
+        """Returns the compact page-tagged text of the document, or None if the pdf itself must be sent"""
+        if document.page_count == 0:
+            return None
+        scanned_ratio = document.scanned_page_count / document.page_count
+        if scanned_ratio > settings.PDF_TEXT_MODE_MAX_SCANNED_RATIO:
+            self.logger.info(f"{document.scanned_page_count} of {document.page_count} pages are scanned, sending the PDF")
+            return None
+
+        tagged_pages = []
+        for page in document.pages:
+            if page.is_scanned:
+                tagged_pages.append(f'<page number="{page.page_number}" scanned="true"/>')
+                continue
+            # one line per text line, without the layout spaces
+            lines = (re.sub(r"\s+", " ", line).strip() for line in page.text.splitlines())
+            text = "\n".join(line for line in lines if line)
+            tagged_pages.append(f'<page number="{page.page_number}">\n{text}\n</page>')
+        document_text = "\n".join(tagged_pages)
+
+        if len(document_text) > settings.PDF_TEXT_MODE_MAX_CHARS:
+            self.logger.info(f"Text of {len(document_text)} chars over the text mode limit, sending the PDF")
+            return None
+        return document_text
+
+    def _preprocess_pdf(self, pdf_binary: bytes, page_count: int | None = None) -> tuple[int, str | None]:
+        """
+        Parses the pdf locally, once. Returns its page count (0 if unknown) and, in text mode, the
+        page-tagged text to send instead of the pdf (None when the pdf must be sent). A page count
+        already known (from the page hashes) is not counted again.
+        """
+        if settings.PDF_TEXT_MODE_ENABLED:
+            try:
+                document = self.pdf_processor.read_pages(pdf_binary, settings.PDF_SCANNED_PAGE_MIN_CHARS)
+            except Exception as e:
+                self.logger.warning(f"Failed to read the text of the PDF, sending the PDF: {e}")
+                return 0, None
+            self.metrics_recorder.observe("pdf_scanned_pages", document.scanned_page_count)
+            return document.page_count, self._build_document_text(document)
+        if settings.PDF_PREPROCESSING_ENABLED or self.chunked_extraction_service is not None:
+            return page_count or self._count_pages(pdf_binary), None
+        return 0, None
+
+    def _clamp_page(self, page, page_count: int):
+        # -1 is the unknown page of the extraction prompt
+        if not isinstance(page, int) or page == -1:
+            return page
+        return min(max(page, 1), page_count)
+
+    def _clamp_page_ranges(self, data: dict, page_count: int) -> None:
+        """Clamps the page ranges returned by the llm to the real page count of the document"""
+        clamped = 0
+        for items, prefix in ((data.get("timeline") or [], "event"), (data.get("evidence") or [], "evidence")):
+            init_key, end_key = f"{prefix}_page_init", f"{prefix}_page_end"
+            for item in items:
+                page_init, page_end = item.get(init_key), item.get(end_key)
+                clamped_init, clamped_end = self._clamp_page(page_init, page_count), self._clamp_page(page_end, page_count)
+                if isinstance(clamped_init, int) and isinstance(clamped_end, int) and -1 < clamped_end < clamped_init:
+                    clamped_init, clamped_end = clamped_end, clamped_init
+                if (clamped_init, clamped_end) != (page_init, page_end):
+                    item[init_key], item[end_key] = clamped_init, clamped_end
+                    clamped += 1
+        if clamped:
+            self.logger.warning(f"Clamped {clamped} page ranges to the {page_count} pages of the document")
+            self.metrics_recorder.increment("pdf_page_ranges_clamped_total", clamped)
+
+    def _validate_extraction(self, data: dict) -> dict:
+        """Validates the extraction returned by the llm, only a valid extraction is cached"""
+        return ExtractedProcessData.model_validate(data).model_dump(mode="json")
+
+    async def hash_pages_async(self, pdf_binary: bytes) -> list[str] | None:
+        """Returns the hash of each page to store with the case, None when incremental extraction is disabled or the pdf could not be parsed"""
+        if self.incremental_extraction_service is None:
+            return None
+        try:
+            return await asyncio.to_thread(self.pdf_processor.hash_pages, pdf_binary)
+        except Exception as e:
+            self.logger.warning(f"Failed to hash the pages of the PDF: {e}")
+            return None
+
+    def find_stored_page_count(self, stored_page_hashes: list[str] | None, page_hashes: list[str] | None) -> int | None:
+        """Returns the page count of the stored version of a document that only has new pages at its end, else None"""
+        if self.incremental_extraction_service is None or not page_hashes:
+            return None
+        return self.incremental_extraction_service.find_stored_page_count(stored_page_hashes, page_hashes)
+
+    async def extract_appended_pages_async(self, pdf_binary: bytes, page_count: int, stored_data: dict, stored_page_count: int) -> dict:
+        """
+        Extracts only the pages appended to a stored document and merges them into its stored data.
+
+        Args:
+            pdf_binary: the pdf file in binary format.
+            page_count: the number of pages of the document.
+            stored_data: the persisted data of the case ('resume', 'timeline', 'evidence').
+            stored_page_count: the number of pages of the stored version, its first pages.
+
+        Returns:
+            a dictionary with the information extracted from the whole document ('resume', 'timeline', 'evidence').
+        """
+        try:
+            self.metrics_recorder.increment("pdf_extraction_mode_total", labels={"mode": "incremental"})
+            self.metrics_recorder.observe("pdf_pages", page_count)
+            self.metrics_recorder.observe("pdf_appended_pages", page_count - stored_page_count)
+            extracted_data = await self.incremental_extraction_service.extract_appended_async(
+                pdf_binary, page_count, stored_data, stored_page_count
+            )
+            self._clamp_page_ranges(extracted_data, page_count)
+            self.logger.info(f"Successfully extracted the pages appended after page {stored_page_count}")
+            return extracted_data
+        except Exception as e:
+            self.logger.error(f"Failed to extract the pages appended to the PDF: {e}", exc_info=True)
+            raise Exception(f"Failed to extract information from PDF: {e}") from e
+
+    async def dowload_pdf_from_url_async(self, url: str) -> bytes:
+        """Downloads the pdf with httpx, validating its headers, signature and size as the body arrives"""
         try:
             self.logger.info(f"Downloading PDF from URL: {url}")
 
-            # Validate URL format
             parsed_url = urlparse(url)
             if not parsed_url.path.lower().endswith('.pdf'):
                 self.logger.warning(f"URL is not a direct link to a PDF")
 
-            response = requests.get(url)
-            response.raise_for_status()
-
-            # Validate Content-Type header
-            content_type = response.headers.get("Content-Type", "").lower()
-            if "application/pdf" not in content_type:
-                raise ValueError(f"Expected content type 'application/pdf' but got '{content_type}'")
-
-            pdf_content = response.content
+            if self.async_http_client is not None:
+                buffer = await self._stream_pdf_async(self.async_http_client, url)
+            else:
+                import httpx
+                async with httpx.AsyncClient(follow_redirects=True) as client:
+                    buffer = await self._stream_pdf_async(client, url)
 
-            # Validate file signature for PDF
-            if not pdf_content.startswith(b'%PDF-'):
-                raise ValueError("Downloaded file is not a valid PDF.")
-
-            self.logger.info(f"Successfully downloaded and validated PDF from URL")
+            pdf_content = self._get_pdf_content(buffer)
+            self.logger.info(f"Successfully downloaded and validated PDF from URL ({len(pdf_content)} bytes)")
             return pdf_content
         except Exception as e:
             self.logger.error(f"Failed to download or validate PDF from URL: {e}", exc_info=True)
             raise Exception(f"Failed to process PDF from URL: {e}") from e
 
-    def extract_information_from_pdf(self, pdf_binary: bytes) -> dict:
+    async def _stream_pdf_async(self, client: "httpx.AsyncClient", url: str) -> io.BytesIO:
+        # the http client is only imported on the first download, not on the cold start of the handlers
+        import httpx
+        timeout = httpx.Timeout(settings.DOWNLOAD_READ_TIMEOUT_SECONDS, connect=settings.DOWNLOAD_CONNECT_TIMEOUT_SECONDS)
+        async with client.stream("GET", url, timeout=timeout) as response:
+            response.raise_for_status()
+            self._validate_pdf_headers(response.headers)
+
+            buffer = io.BytesIO()
+            async for chunk in response.aiter_bytes(chunk_size=settings.DOWNLOAD_CHUNK_SIZE_BYTES):
+                self._append_pdf_chunk(buffer, chunk)
+        return buffer
+
+    async def extract_information_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
         """
-        Extracts structured data from a PDF file binary using the GeminiClient.
+        Extracts structured data from a PDF file binary with the llm client, blocking cache operations run in a worker thread.
 
         Args:
             pdf_binary: the pdf file in binary format.
+            page_count: the page count of the pdf when already known, so it is not parsed again to count them.
 
         Returns:
             a dictionary with the information extracted from the pdf document ('resume', 'timeline', 'evidence').
         """
         try:
-            self.logger.info("Extracting information from PDF using GeminiClient")
+            cache_key = await asyncio.to_thread(self._build_cache_key, pdf_binary)
+            if self.extraction_cache is not None:
+                cached_data = await asyncio.to_thread(self.extraction_cache.get, cache_key)
+                if cached_data is not None:
+                    self.logger.info(f"Extraction cache hit for key: {cache_key}")
+                    return cached_data
+                self.logger.info(f"Extraction cache miss for key: {cache_key}")
+
+            extracted_data, shared = await self.single_flight.run(cache_key, self._extract_and_cache_async, pdf_binary, cache_key, page_count)
+            if shared:
+                self.logger.info(f"Shared the in-flight extraction of key: {cache_key}")
+                self.metrics_recorder.increment("extraction_coalesced_total", labels={"scope": "process"})
+                # every caller gets its own copy of the shared result
+                extracted_data = copy.deepcopy(extracted_data)
+            return extracted_data
+        except Exception as e:
+            self.logger.error(f"Failed to extract information from PDF: {e}", exc_info=True)
+            raise Exception(f"Failed to extract information from PDF: {e}") from e
+
+    def iter_extraction_events(self, data: dict):
+        """Returns the stream events of a complete extraction, for the extractions that are not streamed"""
+        yield "resume", data.get("resume")
+        for event in data.get("timeline") or []:
+            yield "timeline_event", event
+        for evidence in data.get("evidence") or []:
+            yield "evidence", evidence
+
+    async def stream_information_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None):
+        """
+        Streaming variant of extract_information_from_pdf_async.
+
+        Args:
+            pdf_binary: the pdf file in binary format.
+            page_count: the page count of the pdf when already known, so it is not parsed again to count them.
+
+        Yields:
+            ('resume', str), then ('timeline_event', dict) and ('evidence', dict) for each item as soon as the
+            llm completes it, and last ('completed', dict) with the whole extraction ('resume', 'timeline', 'evidence').
+        """
+        try:
+            cache_key = await asyncio.to_thread(self._build_cache_key, pdf_binary)
+            if self.extraction_cache is not None:
+                cached_data = await asyncio.to_thread(self.extraction_cache.get, cache_key)
+                if cached_data is not None:
+                    self.logger.info(f"Extraction cache hit for key: {cache_key}")
+                    for event in self.iter_extraction_events(cached_data):
+                        yield event
+                    yield "completed", cached_data
+                    return
+                self.logger.info(f"Extraction cache miss for key: {cache_key}")
 
-            # save binary to a temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
-                temp_pdf.write(pdf_binary)
-                temp_pdf_path = temp_pdf.name
-                self.logger.info(f"Temporary PDF file created at: {temp_pdf_path}")
+            self.logger.info("Streaming the extraction of the PDF")
+            page_count, document_text = await asyncio.to_thread(self._preprocess_pdf, pdf_binary, page_count)
+            if page_count > 0:
+                self.metrics_recorder.observe("pdf_pages", page_count)
 
-            extracted_data = self.llm_client.extract_data_from_pdf(temp_pdf_path)
+            if document_text is None and self.chunked_extraction_service is not None and page_count >= max(1, settings.CHUNKED_EXTRACTION_MIN_PAGES):
+                # the chunks are merged and summarized at the end, there is nothing to stream before
+                self.metrics_recorder.increment("pdf_extraction_mode_total", labels={"mode": "chunked"})
+                extracted_data = await self.chunked_extraction_service.extract_async(pdf_binary, page_count)
+                self._clamp_page_ranges(extracted_data, page_count)
+                for event in self.iter_extraction_events(extracted_data):
+                    yield event
+            else:
+                if document_text is not None:
+                    self.metrics_recorder.increment("pdf_extraction_mode_total", labels={"mode": "text"})
+                    fragments = self.llm_client.stream_data_from_text_async(document_text)
+                else:
+                    self.metrics_recorder.increment("pdf_extraction_mode_total", labels={"mode": "pdf"})
+                    fragments = self.llm_client.stream_data_from_pdf_async(pdf_binary, page_count or None)
+
+                parser = IncrementalExtractionParser()
+                streamed_items = {"timeline": [], "evidence": []}
+                async for fragment in fragments:
+                    for name, value in parser.feed(fragment):
+                        if name != "resume":
+                            key = "timeline" if name == "timeline_event" else "evidence"
+                            if page_count > 0:
+                                self._clamp_page_ranges({key: [value]}, page_count)
+                            streamed_items[key].append(value)
+                        yield name, value
+                extracted_data = parser.result()
+                # the result keeps the items as they were streamed, already clamped
+                extracted_data.update({key: items for key, items in streamed_items.items() if key in extracted_data})
             self.logger.info("Successfully extracted information from PDF")
 
-            return extracted_data
+            extracted_data = self._validate_extraction(extracted_data)
+            if self.extraction_cache is not None:
+                await asyncio.to_thread(self.extraction_cache.set, cache_key, extracted_data)
+            yield "completed", extracted_data
         except Exception as e:
-            self.logger.error(f"Failed to extract information from PDF: {e}", exc_info=True)
+            self.logger.error(f"Failed to stream the extraction of the PDF: {e}", exc_info=True)
             raise Exception(f"Failed to extract information from PDF: {e}") from e
 
-        # Mocked response for demonstration purposes
+    async def _wait_for_lease_async(self, cache_key: str) -> tuple[dict | None, str | None]:
+        """
+        Takes the cross-instance lease of the extraction. While another instance holds it, polls the
+        shared cache for its result. Returns (the shared result, None) or (None, the lease owner id,
+        or None if the extraction must go on without the lease).
         """
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.EXTRACTION_LEASE_WAIT_SECONDS
+        while True:
+            try:
+                if await asyncio.to_thread(self.extraction_lease.try_acquire, cache_key, owner, settings.EXTRACTION_LEASE_TTL_SECONDS):
+                    return None, owner
+            except Exception as e:
+                self.logger.warning(f"Failed to take the extraction lease of key {cache_key}, extracting without it: {e}")
+                return None, None
+
+            if time.monotonic() >= deadline:
+                self.logger.warning(f"Timed out waiting for the extraction of key {cache_key} by another instance, extracting it")
+                return None, None
+            await asyncio.sleep(settings.EXTRACTION_LEASE_POLL_SECONDS)
+            # the lease owner writes its result to the shared cache before releasing the lease
+            cached_data = await asyncio.to_thread(self.extraction_cache.get, cache_key)
+            if cached_data is not None:
+                self.logger.info(f"Shared the extraction of key {cache_key} made by another instance")
+                self.metrics_recorder.increment("extraction_coalesced_total", labels={"scope": "lease"})
+                return cached_data, None
+
+    async def _extract_and_cache_async(self, pdf_binary: bytes, cache_key: str, page_count: int | None = None) -> dict:
+        """Extracts the document under the lease of its key (when enabled) and caches the result"""
+        lease_owner = None
+        if self.extraction_lease is not None and self.extraction_cache is not None:
+            cached_data, lease_owner = await self._wait_for_lease_async(cache_key)
+            if cached_data is not None:
+                return cached_data
+        try:
+            extracted_data = self._validate_extraction(await self._extract_async(pdf_binary, page_count))
+            if self.extraction_cache is not None:
+                await asyncio.to_thread(self.extraction_cache.set, cache_key, extracted_data)
+            return extracted_data
+        finally:
+            if lease_owner is not None:
+                await asyncio.to_thread(self.extraction_lease.release, cache_key, lease_owner)
+
+    async def _extract_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        """Extracts the document with the llm, as text, in chunks or as a whole pdf"""
+        self.logger.info("Extracting information from PDF using GeminiClient")
+
+        # pdf parsing is cpu bound, it runs in a worker thread
+        page_count, document_text = await asyncio.to_thread(self._preprocess_pdf, pdf_binary, page_count)
+        if page_count > 0:
+            self.metrics_recorder.observe("pdf_pages", page_count)
 
-        return {
-            "resume": "This is a legal case involving José Ribamar Alves Filho, who is suing Fundo de Investimento em Direitos Creditorios Nao Padronizados NPL II for alleged inexistência de débitos and damages.",
-            "timeline": [
-                {
-                "event_id": 0,
-                "event_name": "Ajuizamento da Ação",
-                "event_description": "José Ribamar Alves Filho proposes an \"Ação Declaratória de Inexistência de Débitos c/c Indenização por Danos Morais e Pedido de Antecipação dos Efeitos da Tutela Provisória de Urgência\" against FUNDO DE INVESTIMENTO EM DIREITOS CREDITÓRIOS NAO PADRONIZADOS NPL II.",
-                "event_date": "2024-10-22",
-                "event_page_init": 1,
-                "event_page_end": 1
-                },
-                {
-                "event_id": 1,
-                "event_name": "Designação de Audiência",
-                "event_description": "Audiência de Conciliação designada para o dia 24/03/2025 às 14:20.",
-                "event_date": "2024-11-27",
-                "event_page_init": 37,
-                "event_page_end": 37
-                },
-                {
-                "event_id": 2,
-                "event_name": "Remessa de Relação",
-                "event_description": "Certidão de Remessa de Relação referente a decisão que defere tutela.",
-                "event_date": "2024-11-14",
-                "event_page_init": 35,
-                "event_page_end": 35
-                },
-                {
-                "event_id": 3,
-                "event_name": "Publicação da Relação",
-                "event_description": "Publicação da Relação referente a decisão que defere tutela.",
-                "event_date": "2024-11-18",
-                "event_page_init": 36,
-                "event_page_end": 36
-                },
-                {
-                "event_id": 4,
-                "event_name": "Carta de Citação e Intimação",
-                "event_description": "Expedição de Carta de Citação e Intimação para audiência de conciliação.",
-                "event_date": "2025-01-07",
-                "event_page_init": 131,
-                "event_page_end": 131
-                },
-                {
-                "event_id": 5,
-                "event_name": "Ata de Audiência",
-                "event_description": "Realizada audiência de conciliação, sem acordo.",
-                "event_date": "2025-03-24",
-                "event_page_init": 139,
-                "event_page_end": 139
-                },
-                {
-                "event_id": 6,
-                "event_name": "Juntada de Documentos",
-                "event_description": "A parte Ré apresenta documentos.",
-                "event_date": "2025-03-21",
-                "event_page_init": 40,
-                "event_page_end": 40
-                },
-                {
-                "event_id": 7,
-                "event_name": "Substabelecimento",
-                "event_description": "Substabelecimento de poderes.",
-                "event_date": "2025-03-21",
-                "event_page_init": 135,
-                "event_page_end": 135
-                }
-            ],
-            "evidence": [
-                { "evidence_id": 0, "evidence_name": "Documentos anexos", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 1, "evidence_page_end": 1 },
-                { "evidence_id": 1, "evidence_name": "Comprovante de mácula", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 2, "evidence_page_end": 2 },
-                { "evidence_id": 2, "evidence_name": "CredNet Light", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 14, "evidence_page_end": 15 },
-                { "evidence_id": 3, "evidence_name": "Procuração", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 16, "evidence_page_end": 16 },
-                { "evidence_id": 4, "evidence_name": "Declaração de Hipossuficiência", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 17, "evidence_page_end": 17 },
-                { "evidence_id": 5, "evidence_name": "Documento de Identidade", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 18, "evidence_page_end": 20 },
-                { "evidence_id": 6, "evidence_name": "Comprovante de residência", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 21, "evidence_page_end": 21 },
-                { "evidence_id": 7, "evidence_name": "Carteira de trabalho", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 22, "evidence_page_end": 22 },
-                { "evidence_id": 8, "evidence_name": "Comprovante de Inscrição CPF", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 23, "evidence_page_end": 24 },
-                { "evidence_id": 9, "evidence_name": "Consulta restituição IRPF", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 25, "evidence_page_end": 26 },
-                { "evidence_id": 10, "evidence_name": "Declaração do Imposto sobre a Renda Retido na Fonte", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 27, "evidence_page_end": 27 },
-                { "evidence_id": 11, "evidence_name": "Certidão Negativa de Débitos Trabalhistas", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 28, "evidence_page_end": 28 },
-                { "evidence_id": 12, "evidence_name": "Certidão Negativa de Débitos", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 29, "evidence_page_end": 29 },
-                { "evidence_id": 13, "evidence_name": "Regulamento do Fundo de Investimento", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 41, "evidence_page_end": 83 },
-                { "evidence_id": 14, "evidence_name": "Termo de Transferência da sede social", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 111, "evidence_page_end": 111 },
-                { "evidence_id": 15, "evidence_name": "Procuração", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 114, "evidence_page_end": 116 },
-                { "evidence_id": 16, "evidence_name": "Substabelecimento", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 128, "evidence_page_end": 128 },
-                { "evidence_id": 17, "evidence_name": "Carta de Preposição", "evidence_flaw": "Sem inconsistências", "evidence_page_init": 134, "evidence_page_end": 134 }
-            ]
-        }
-        """
\ No newline at end of file
+        if document_text is not None:
+            # the text of a large document fits a single call, it is not chunked
+            self.metrics_recorder.increment("pdf_extraction_mode_total", labels={"mode": "text"})
+            extracted_data = await self.llm_client.extract_data_from_text_async(document_text)
+        elif self.chunked_extraction_service is not None and page_count >= max(1, settings.CHUNKED_EXTRACTION_MIN_PAGES):
+            self.metrics_recorder.increment("pdf_extraction_mode_total", labels={"mode": "chunked"})
+            extracted_data = await self.chunked_extraction_service.extract_async(pdf_binary, page_count)
+        else:
+            self.metrics_recorder.increment("pdf_extraction_mode_total", labels={"mode": "pdf"})
+            extracted_data = await self.llm_client.extract_data_from_pdf_async(pdf_binary, page_count or None)
+        if page_count > 0:
+            self._clamp_page_ranges(extracted_data, page_count)
+        self.logger.info("Successfully extracted information from PDF")
+        return extracted_data
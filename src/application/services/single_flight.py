@@ -0,0 +1,32 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls by key: the first caller starts the call and the callers arriving
+    while it is in flight await the same result (or exception) instead of running it again.
+
+    The call runs in its own task, so a caller that is cancelled (e.g. the client disconnected)
+    does not cancel it for the others. Calls are only shared within an event loop.
+    """
+    def __init__(self):
+        self._calls: dict[tuple, asyncio.Task] = {}
+
+    def _forget(self, call_key: tuple, task: asyncio.Task) -> None:
+        if self._calls.get(call_key) is task:
+            del self._calls[call_key]
+        if not task.cancelled():
+            # retrieved, so an exception no caller awaited anymore is not logged as never retrieved
+            task.exception()
+
+    async def run(self, key: str, function, *args) -> tuple[object, bool]:
+        """Returns the result of function(*args) and whether it was shared with an in-flight call"""
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        task = self._calls.get(call_key)
+        shared = task is not None
+        if task is None:
+            task = loop.create_task(function(*args))
+            self._calls[call_key] = task
+            task.add_done_callback(lambda done: self._forget(call_key, done))
+        return await asyncio.shield(task), shared
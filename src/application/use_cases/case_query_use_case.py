@@ -0,0 +1,77 @@
+import base64
+import binascii
+import datetime
+import json
+import logging
+from src.application.dtos.input.case_query_input_dto import CaseQueryInputDTO, CaseView
+from src.application.dtos.output.case_output_dto import CaseListOutputDTO, CaseSummaryOutputDTO
+from src.application.dtos.output.process_data_output_dto import ProcessDataOutputDTO
+from src.domain.ports.storage_repository_interface import IStorageRepository
+
+
+class CaseQueryUseCase:
+    """Reads the persisted extractions, without going back to the LLM"""
+    def __init__(self, storage_repository: IStorageRepository):
+        self.logger = logging.getLogger(__name__)
+        self.storage_repository = storage_repository
+        self._indexes_checked = False
+
+    async def _ensure_indexes(self) -> None:
+        # the api server creates them at startup, lambda containers check once on their first read
+        if self._indexes_checked:
+            return
+        self._indexes_checked = True
+        try:
+            await self.storage_repository.ensure_indexes_async()
+        except Exception as e:
+            self.logger.warning(f"Reading without ensuring the indexes: {e}")
+
+    def _to_output_dto(self, data: dict, view: CaseView) -> ProcessDataOutputDTO | CaseSummaryOutputDTO:
+        return CaseSummaryOutputDTO(**data) if view == CaseView.SUMMARY else ProcessDataOutputDTO(**data)
+
+    def _encode_cursor(self, data: dict) -> str:
+        position = json.dumps([data["persisted_at"], data["case_id"]]).encode("utf-8")
+        return base64.urlsafe_b64encode(position).decode("ascii")
+
+    def _decode_cursor(self, cursor: str) -> tuple[str, str]:
+        """Returns the (persisted_at, case_id) of the last case of the previous page"""
+        try:
+            persisted_at, case_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        if not isinstance(persisted_at, str) or not isinstance(case_id, str):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        try:
+            # the repositories compare it as an instant
+            datetime.datetime.fromisoformat(persisted_at.replace("Z", "+00:00"))
+        except ValueError as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        return persisted_at, case_id
+
+    async def get_case_async(self, case_id: str, view: CaseView = CaseView.FULL) -> ProcessDataOutputDTO | CaseSummaryOutputDTO | None:
+        """Returns the persisted data of a case, or None if the case was not found"""
+        await self._ensure_indexes()
+        data = await self.storage_repository.find_by_case_id_async(case_id, summary_only=view == CaseView.SUMMARY)
+        return self._to_output_dto(data, view) if data else None
+
+    async def list_cases_async(self, query_dto: CaseQueryInputDTO) -> CaseListOutputDTO:
+        """Returns a page of the persisted cases matching the filters, newest first"""
+        after = self._decode_cursor(query_dto.cursor) if query_dto.cursor else None
+        await self._ensure_indexes()
+        # one extra case tells whether there is a next page
+        cases = await self.storage_repository.find_cases_async(
+            persisted_from=query_dto.persisted_from,
+            persisted_to=query_dto.persisted_to,
+            event_date_from=query_dto.event_date_from,
+            event_date_to=query_dto.event_date_to,
+            evidence_name=query_dto.evidence_name,
+            after=after,
+            limit=query_dto.limit + 1,
+            summary_only=query_dto.view == CaseView.SUMMARY
+        )
+        page = cases[:query_dto.limit]
+        next_cursor = self._encode_cursor(page[-1]) if len(cases) > query_dto.limit else None
+        return CaseListOutputDTO(
+            items=[self._to_output_dto(data, query_dto.view) for data in page],
+            next_cursor=next_cursor
+        )
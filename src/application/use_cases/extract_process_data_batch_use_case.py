@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from src.application.dtos.input.process_data_batch_input_dto import ProcessDataBatchInputDTO
+from src.application.dtos.input.process_data_input_dto import ProcessDataInputDTO
+from src.application.dtos.output.process_data_batch_output_dto import ProcessDataBatchItemOutputDTO, ProcessDataBatchOutputDTO
+from src.application.dtos.output.process_data_output_dto import ProcessDataOutputDTO
+from src.application.services.process_data_service import ProcessDataService
+from src.application.use_cases.extract_process_data_use_case import ProcessDataUseCase
+from src.domain.ports.metrics_recorder_interface import IMetricsRecorder
+from src.domain.ports.storage_repository_interface import IStorageRepository, PartialSaveError
+from src.infrastruture.adapters.prometheus_metrics_recorder import get_metrics_recorder
+
+
+class ProcessDataBatchUseCase:
+    """Extracts a list of pdf files concurrently and persists all the results with a single bulk write"""
+    def __init__(
+        self,
+        process_data_service: ProcessDataService,
+        storage_repository: IStorageRepository,
+        max_parallel_downloads: int = 8,
+        max_parallel_extractions: int = 4,
+        metrics_recorder: IMetricsRecorder | None = None,
+        process_data_use_case: ProcessDataUseCase | None = None
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.process_data_service = process_data_service
+        self.storage_repository = storage_repository
+        self.max_parallel_downloads = max_parallel_downloads
+        self.max_parallel_extractions = max_parallel_extractions
+        self.metrics_recorder = metrics_recorder or get_metrics_recorder()
+        # the items are extracted as single extractions are, incrementally when a case only grew
+        self.process_data_use_case = process_data_use_case or ProcessDataUseCase(
+            process_data_service=process_data_service,
+            storage_repository=storage_repository,
+            metrics_recorder=self.metrics_recorder
+        )
+
+    async def execute_async(self, batch_dto: ProcessDataBatchInputDTO) -> ProcessDataBatchOutputDTO:
+        self.logger.info(f"Executing ProcessDataBatchUseCase with {len(batch_dto.items)} items")
+        download_semaphore = asyncio.Semaphore(self.max_parallel_downloads)
+        extraction_semaphore = asyncio.Semaphore(self.max_parallel_extractions)
+
+        # download and extract concurrently, one failing item does not cancel the others
+        page_hashes_by_case_id = {}
+        results = await asyncio.gather(*[
+            self._extract_item(item, download_semaphore, extraction_semaphore, page_hashes_by_case_id)
+            for item in batch_dto.items
+        ])
+
+        # persist all extracted data in a single write
+        extracted = [result.data for result in results if result.success]
+        if extracted:
+            try:
+                with self.metrics_recorder.time("persist_seconds"):
+                    await self.storage_repository.save_many_async({
+                        output_dto.case_id: {
+                            **output_dto.model_dump(mode='json'),
+                            "page_hashes": page_hashes_by_case_id.get(output_dto.case_id)
+                        }
+                        for output_dto in extracted
+                    })
+            except PartialSaveError as e:
+                # the other cases were saved, only the failed ones are reported
+                self.logger.error(f"Failed to persist some batch results: {e}")
+                for result in results:
+                    if result.success and result.case_id in e.errors_by_case_id:
+                        self._fail_result(result, e.errors_by_case_id[result.case_id])
+            except Exception as e:
+                self.logger.error(f"Failed to persist batch results: {e}")
+                for result in results:
+                    if result.success:
+                        self._fail_result(result, str(e))
+
+        succeeded = sum(1 for result in results if result.success)
+        return ProcessDataBatchOutputDTO(
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            items=results
+        )
+
+    def _fail_result(self, result: ProcessDataBatchItemOutputDTO, error: str) -> None:
+        result.success = False
+        result.data = None
+        result.error = f"Failed to persist extracted data: {error}"
+
+    async def _extract_item(
+        self,
+        input_dto: ProcessDataInputDTO,
+        download_semaphore: asyncio.Semaphore,
+        extraction_semaphore: asyncio.Semaphore,
+        page_hashes_by_case_id: dict[str, list[str] | None]
+    ) -> ProcessDataBatchItemOutputDTO:
+        pdf_url = input_dto.pdf_url.encoded_string()
+        try:
+            async with download_semaphore:
+                with self.metrics_recorder.time("pdf_download_seconds"):
+                    pdf_binary = await self.process_data_service.dowload_pdf_from_url_async(pdf_url)
+                # the download slot is held until an extraction slot is free, so at most
+                # max_parallel_downloads pdfs wait in memory for their extraction
+                await extraction_semaphore.acquire()
+
+            try:
+                with self.metrics_recorder.time("extraction_seconds"):
+                    pdf_data, page_hashes = await self.process_data_use_case.extract_document_async(input_dto.case_id, pdf_binary)
+            finally:
+                extraction_semaphore.release()
+            # stored for a later incremental extraction of the case
+            page_hashes_by_case_id[input_dto.case_id] = page_hashes
+
+            output_dto = ProcessDataOutputDTO(**{
+                "case_id": input_dto.case_id,
+                "persisted_at": datetime.now(timezone.utc),
+                **pdf_data
+            })
+            return ProcessDataBatchItemOutputDTO(case_id=input_dto.case_id, pdf_url=pdf_url, success=True, data=output_dto)
+        except Exception as e:
+            self.logger.error(f"Failed to extract batch item with case_id {input_dto.case_id}: {e}")
+            return ProcessDataBatchItemOutputDTO(case_id=input_dto.case_id, pdf_url=pdf_url, success=False, error=str(e))
@@ -1,37 +1,167 @@
 import logging
+import time
 from datetime import datetime, timezone
 from src.application.dtos.input.process_data_input_dto import ProcessDataInputDTO
-from src.application.dtos.output.process_data_output_dto import ProcessDataOutputDTO
+from src.application.dtos.output.process_data_output_dto import EvidenceDTO, ProcessDataOutputDTO, TimelineEventDTO
 from src.application.services.process_data_service import ProcessDataService
-from src.infrastruture.adapters.mongodb_repository import MongoDBRepository
+from src.application.services.single_flight import SingleFlight
+from src.domain.ports.metrics_recorder_interface import IMetricsRecorder
+from src.domain.ports.storage_repository_interface import IStorageRepository
+from src.infrastruture.adapters.prometheus_metrics_recorder import get_metrics_recorder
 
 class ProcessDataUseCase:
-    def __init__(self):
+    def __init__(
+        self,
+        process_data_service: ProcessDataService | None = None,
+        storage_repository: IStorageRepository | None = None,
+        metrics_recorder: IMetricsRecorder | None = None
+    ):
         self.logger = logging.getLogger(__name__)
-        self.process_data_service = ProcessDataService()
-        self.storage_repository = MongoDBRepository()
+        self.process_data_service = process_data_service or ProcessDataService()
+        if storage_repository is None:
+            from src.infrastruture.adapters.mongodb_repository import MongoDBRepository
+            storage_repository = MongoDBRepository()
+        self.storage_repository = storage_repository
+        self.metrics_recorder = metrics_recorder or get_metrics_recorder()
+        # a retried or duplicated request attaches to the execution in flight for the same case and url
+        self.single_flight = SingleFlight()
 
-    def execute(self, input_dto: ProcessDataInputDTO) -> ProcessDataOutputDTO:
+    async def execute_async(self, input_dto: ProcessDataInputDTO) -> ProcessDataOutputDTO:
+        """Extracts and persists the data of a case, concurrent requests for the same case_id and pdf_url share one execution"""
+        key = f"{input_dto.case_id}\n{input_dto.pdf_url.encoded_string()}"
+        output_dto, shared = await self.single_flight.run(key, self._execute_async, input_dto)
+        if shared:
+            self.logger.info(f"Shared the in-flight execution of case_id: {input_dto.case_id}")
+            self.metrics_recorder.increment("extraction_coalesced_total", labels={"scope": "request"})
+            return output_dto.model_copy(deep=True)
+        return output_dto
+
+    async def _execute_async(self, input_dto: ProcessDataInputDTO) -> ProcessDataOutputDTO:
+        """Every stage is awaited so the event loop keeps serving other requests"""
         self.logger.info(f"Executing ProcessDataUseCase with input: {input_dto}")
         # download PDF from url
-        pdf_binary =self.process_data_service.dowload_pdf_from_url(input_dto.pdf_url.encoded_string())
-        
-        # extract infromation from pdf binary
-        pdf_data = self.process_data_service.extract_information_from_pdf(pdf_binary)
-        
+        with self.metrics_recorder.time("pdf_download_seconds"):
+            pdf_binary = await self.process_data_service.dowload_pdf_from_url_async(input_dto.pdf_url.encoded_string())
+
+        # extract infromation from pdf binary, only from its new pages when the case was stored with fewer
+        with self.metrics_recorder.time("extraction_seconds"):
+            pdf_data, page_hashes = await self.extract_document_async(input_dto.case_id, pdf_binary)
+
         # map and validate data with ProcessDataOutputDTO
         output_dto = ProcessDataOutputDTO(**{
                 "case_id": input_dto.case_id,
                 "persisted_at": datetime.now(timezone.utc),
                 **pdf_data
             })
-        
-        # persist extracted data in database
-        self.storage_repository.save(
-            case_id=output_dto.case_id, 
-            data=output_dto.model_dump(
-                mode='json'
-            ))
+
+        # persist extracted data in database, with the page hashes of this version of the document
+        with self.metrics_recorder.time("persist_seconds"):
+            await self.storage_repository.save_async(
+                case_id=output_dto.case_id,
+                data={
+                    **output_dto.model_dump(mode='json'),
+                    "page_hashes": page_hashes
+                })
 
         # return ProcessDataOutputDTO
-        return output_dto
\ No newline at end of file
+        return output_dto
+
+    async def extract_document_async(self, case_id: str, pdf_binary: bytes) -> tuple[dict, list[str] | None]:
+        """
+        Extracts the downloaded document of a case, only its appended pages when the case was stored with fewer.
+        Returns the extracted data and the page hashes to store with it.
+        """
+        page_hashes = await self.process_data_service.hash_pages_async(pdf_binary)
+        pdf_data = await self._extract_appended_pages_async(case_id, pdf_binary, page_hashes)
+        if pdf_data is None:
+            # the pages were counted by hashing them, the pdf is not parsed again to count them
+            pdf_data = await self.process_data_service.extract_information_from_pdf_async(pdf_binary, len(page_hashes) if page_hashes else None)
+        return pdf_data, page_hashes
+
+    async def _stream_document_async(self, case_id: str, pdf_binary: bytes, page_hashes: list[str] | None):
+        """Streaming variant of extract_document_async, an incremental extraction is sent once merged"""
+        pdf_data = await self._extract_appended_pages_async(case_id, pdf_binary, page_hashes)
+        if pdf_data is not None:
+            for event in self.process_data_service.iter_extraction_events(pdf_data):
+                yield event
+            yield "completed", pdf_data
+            return
+        async for event in self.process_data_service.stream_information_from_pdf_async(pdf_binary, len(page_hashes) if page_hashes else None):
+            yield event
+
+    async def _extract_appended_pages_async(self, case_id: str, pdf_binary: bytes, page_hashes: list[str] | None) -> dict | None:
+        """Extracts only the pages appended since the stored version of the case, None when the whole document must be extracted"""
+        if not page_hashes:
+            return None
+        try:
+            stored_page_hashes = await self.storage_repository.find_page_hashes_async(case_id)
+            stored_page_count = self.process_data_service.find_stored_page_count(stored_page_hashes, page_hashes)
+            stored_data = await self.storage_repository.find_by_case_id_async(case_id) if stored_page_count else None
+        except Exception as e:
+            self.logger.warning(f"Failed to read the stored version of case_id {case_id}, extracting the whole document: {e}")
+            return None
+        if not stored_data:
+            self.metrics_recorder.increment("incremental_extraction_total", labels={"outcome": "full"})
+            return None
+
+        self.logger.info(f"Case_id {case_id} has {len(page_hashes) - stored_page_count} pages appended to its {stored_page_count} stored pages")
+        self.metrics_recorder.increment("incremental_extraction_total", labels={"outcome": "appended"})
+        return await self.process_data_service.extract_appended_pages_async(pdf_binary, len(page_hashes), stored_data, stored_page_count)
+
+    async def execute_stream_async(self, input_dto: ProcessDataInputDTO):
+        """
+        Streaming variant of execute_async. Yields ('started', ...) once the pdf is downloaded, then
+        ('resume', ...), ('timeline_event', TimelineEventDTO) and ('evidence', EvidenceDTO) as soon as each
+        one is extracted and validated, and ('completed', ...) once the whole case is validated and persisted.
+        """
+        self.logger.info(f"Executing ProcessDataUseCase (streaming) with input: {input_dto}")
+        with self.metrics_recorder.time("pdf_download_seconds"):
+            pdf_binary = await self.process_data_service.dowload_pdf_from_url_async(input_dto.pdf_url.encoded_string())
+        yield "started", {"case_id": input_dto.case_id}
+
+        # the consumer time between the events is not part of the extraction time
+        page_hashes = await self.process_data_service.hash_pages_async(pdf_binary)
+        extraction_seconds = 0.0
+        first_item = True
+        pdf_data = None
+        events = self._stream_document_async(input_dto.case_id, pdf_binary, page_hashes)
+        while True:
+            started_at = time.perf_counter()
+            try:
+                name, value = await anext(events)
+            except StopAsyncIteration:
+                break
+            extraction_seconds += time.perf_counter() - started_at
+            if name == "completed":
+                pdf_data = value
+                continue
+            if first_item:
+                self.metrics_recorder.observe("extraction_first_item_seconds", extraction_seconds)
+                first_item = False
+
+            # each item is validated as the whole case will be
+            if name == "timeline_event":
+                value = TimelineEventDTO(**value).model_dump(mode='json')
+            elif name == "evidence":
+                value = EvidenceDTO(**value).model_dump(mode='json')
+            else:
+                if not isinstance(value, str):
+                    raise ValueError(f"Expected the resume to be a string but got {type(value).__name__}")
+                value = {"resume": value}
+            yield name, value
+        self.metrics_recorder.observe("extraction_seconds", extraction_seconds)
+        if pdf_data is None:
+            # nothing is persisted from a stream that did not complete
+            raise ValueError("The extraction stream ended without the extracted data of the whole document")
+
+        output_dto = ProcessDataOutputDTO(**{
+                "case_id": input_dto.case_id,
+                "persisted_at": datetime.now(timezone.utc),
+                **pdf_data
+            })
+
+        data = output_dto.model_dump(mode='json')
+        with self.metrics_recorder.time("persist_seconds"):
+            await self.storage_repository.save_async(case_id=output_dto.case_id, data={**data, "page_hashes": page_hashes})
+
+        yield "completed", {"case_id": data["case_id"], "persisted_at": data["persisted_at"]}
@@ -0,0 +1,101 @@
+import logging
+import uuid
+from datetime import datetime, timezone
+from src.application.dtos.input.process_data_input_dto import ProcessDataInputDTO
+from src.application.dtos.output.extraction_job_output_dto import ExtractionJobOutputDTO, ExtractionJobStatus
+from src.application.dtos.output.process_data_output_dto import ProcessDataOutputDTO
+from src.application.use_cases.extract_process_data_use_case import ProcessDataUseCase
+from src.domain.ports.job_queue_interface import IJobQueue
+from src.domain.ports.metrics_recorder_interface import IMetricsRecorder
+from src.domain.ports.storage_repository_interface import IStorageRepository
+from src.infrastruture.adapters.prometheus_metrics_recorder import get_metrics_recorder
+
+
+class ExtractionJobUseCase:
+    """Submits extractions as background jobs and tracks their state in the storage repository"""
+    def __init__(
+        self,
+        process_data_use_case: ProcessDataUseCase,
+        storage_repository: IStorageRepository,
+        job_queue: IJobQueue,
+        metrics_recorder: IMetricsRecorder | None = None
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.process_data_use_case = process_data_use_case
+        self.storage_repository = storage_repository
+        self.job_queue = job_queue
+        self.metrics_recorder = metrics_recorder or get_metrics_recorder()
+
+    async def submit_async(self, input_dto: ProcessDataInputDTO) -> ExtractionJobOutputDTO:
+        """Saves a queued job and publishes it, returns without waiting for the extraction"""
+        now = datetime.now(timezone.utc)
+        job = ExtractionJobOutputDTO(
+            job_id=uuid.uuid4().hex,
+            case_id=input_dto.case_id,
+            pdf_url=input_dto.pdf_url.encoded_string(),
+            status=ExtractionJobStatus.QUEUED,
+            created_at=now,
+            updated_at=now
+        )
+        self.logger.info(f"Submitting extraction job {job.job_id} for case_id: {job.case_id}")
+        await self.storage_repository.save_job_async(job.job_id, job.model_dump(mode='json', exclude={"job_id"}))
+
+        try:
+            await self.job_queue.enqueue({"job_id": job.job_id, "case_id": job.case_id, "pdf_url": job.pdf_url})
+        except Exception as e:
+            self.logger.error(f"Failed to enqueue job {job.job_id}: {e}")
+            await self._set_status(job.job_id, ExtractionJobStatus.FAILED, error=f"Failed to enqueue job: {e}")
+            raise
+
+        return job
+
+    async def get_job_async(self, job_id: str) -> ExtractionJobOutputDTO | None:
+        job = await self.storage_repository.find_job_async(job_id)
+        return ExtractionJobOutputDTO(**job) if job else None
+
+    async def get_result_async(self, job_id: str) -> ProcessDataOutputDTO | None:
+        """Returns the extracted data of a succeeded job, or None if the data was not found"""
+        job = await self.get_job_async(job_id)
+        if job is None or job.status != ExtractionJobStatus.SUCCEEDED:
+            return None
+        data = await self.storage_repository.find_by_case_id_async(job.case_id)
+        return ProcessDataOutputDTO(**data) if data else None
+
+    async def process_async(self, message: dict) -> bool:
+        """
+        Runs the extraction of a dequeued job and records its final state.
+
+        Args:
+            message: the job payload ('job_id', 'case_id', 'pdf_url').
+
+        Returns:
+            True if the extraction succeeded, False otherwise.
+        """
+        job_id = message["job_id"]
+        self.logger.info(f"Processing extraction job {job_id}")
+        await self._set_status(job_id, ExtractionJobStatus.RUNNING)
+        try:
+            # jobs run outside of an http request, their metrics are published per job
+            with self.metrics_recorder.request("extraction_job"):
+                await self.process_data_use_case.execute_async(ProcessDataInputDTO(
+                    pdf_url=message["pdf_url"],
+                    case_id=message["case_id"]
+                ))
+        except Exception as e:
+            self.logger.error(f"Extraction job {job_id} failed: {e}")
+            self.metrics_recorder.increment("extraction_jobs_total", labels={"status": ExtractionJobStatus.FAILED.value})
+            await self._set_status(job_id, ExtractionJobStatus.FAILED, error=str(e))
+            return False
+
+        self.metrics_recorder.increment("extraction_jobs_total", labels={"status": ExtractionJobStatus.SUCCEEDED.value})
+
+        await self._set_status(job_id, ExtractionJobStatus.SUCCEEDED)
+        self.logger.info(f"Extraction job {job_id} succeeded")
+        return True
+
+    async def _set_status(self, job_id: str, status: ExtractionJobStatus, error: str | None = None) -> None:
+        await self.storage_repository.save_job_async(job_id, {
+            "status": status.value,
+            "error": error,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        })
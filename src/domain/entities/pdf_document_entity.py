@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+class PdfPage(BaseModel):
+    page_number: int = Field(..., description="Page number in the document, starting from 1")
+    text: str = Field("", description="Text layer of the page")
+    is_scanned: bool = Field(..., description="True when the page has no usable text layer (e.g. a scanned image)")
+
+class PdfDocument(BaseModel):
+    """Pages of a pdf parsed locally, before it is sent to the LLM"""
+    page_count: int = Field(..., description="Number of pages of the document")
+    pages: list[PdfPage] = Field(..., description="Text layer of each page, in page order")
+
+    @property
+    def scanned_page_count(self) -> int:
+        return sum(1 for page in self.pages if page.is_scanned)
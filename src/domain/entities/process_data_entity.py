@@ -22,4 +22,15 @@ class ProcessDataEntity(BaseModel):
     resume: str = Field(..., description="Summary of the legal case")
     timeline: list[TimelineEvent] = Field(..., description="List of significant events in the case timeline")
     evidence: list[Evidence] = Field(..., description="List of evidence items related to the case")
-    persisted_at: datetime.datetime = Field(default_factory=lambda: datetime.datetime.now(datetime.timezone.utc), description="Timestamp when the data was persisted")
\ No newline at end of file
+    persisted_at: datetime.datetime = Field(default_factory=lambda: datetime.datetime.now(datetime.timezone.utc), description="Timestamp when the data was persisted")
+
+class ExtractedProcessData(BaseModel):
+    """Data extracted from the whole document by the LLM, used as the response schema of the extraction"""
+    resume: str = Field(..., description="Summary of the legal case")
+    timeline: list[TimelineEvent] = Field(..., description="List of significant events in the case timeline")
+    evidence: list[Evidence] = Field(..., description="List of evidence items related to the case")
+
+class ExtractedChunkData(BaseModel):
+    """Data extracted from a range of pages by the LLM, used as the response schema of the chunk extraction"""
+    timeline: list[TimelineEvent] = Field(..., description="List of significant events found in the pages")
+    evidence: list[Evidence] = Field(..., description="List of evidence items found in the pages")
\ No newline at end of file
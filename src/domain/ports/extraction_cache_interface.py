@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+
+
+class IExtractionCache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> dict | None:
+        """
+        Returns the cached extraction result for the given key
+
+        Args:
+            key: the content address of the extraction (pdf hash + llm fingerprint)
+        Returns:
+            the cached dictionary ('resume', 'timeline', 'evidence') or None on a cache miss
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, data: dict) -> None:
+        """
+        Stores an extraction result in the cache
+
+        Args:
+            key: the content address of the extraction (pdf hash + llm fingerprint)
+            data: the strutured data extracted from the pdf document
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """
+        Returns the cache counters
+
+        Returns:
+            a dictionary with the 'hits' and 'misses' counters and the backend 'size' when available
+        """
+        pass
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+
+
+class IExtractionLease(ABC):
+    @abstractmethod
+    def try_acquire(self, key: str, owner: str, ttl_seconds: int) -> bool:
+        """
+        Takes the lease of an extraction, so a single instance extracts a document at a time
+
+        Args:
+            key: the content address of the extraction (pdf hash + llm fingerprint)
+            owner: a unique identifier of the caller
+            ttl_seconds: the lease expires after this time, so a crashed owner does not block the key
+        Returns:
+            True if the lease was taken (or renewed) by the owner, False if another owner holds it
+        """
+        pass
+
+    @abstractmethod
+    def release(self, key: str, owner: str) -> None:
+        """
+        Releases the lease of an extraction, only if it is still held by the owner
+
+        Args:
+            key: the content address of the extraction (pdf hash + llm fingerprint)
+            owner: the identifier given when the lease was taken
+        Returns:
+            None
+        """
+        pass
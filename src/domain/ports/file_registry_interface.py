@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class IFileRegistry(ABC):
+    @abstractmethod
+    def get(self, content_hash: str) -> dict | None:
+        """
+        Finds the remote file uploaded for a document
+
+        Args:
+            content_hash: the sha256 of the pdf binary
+        Returns:
+            the file entry ('name', 'uri', 'mime_type', 'expires_at', 'last_used_at') or None if not registered
+        """
+        pass
+
+    @abstractmethod
+    def save(self, content_hash: str, entry: dict) -> None:
+        """
+        Registers the remote file uploaded for a document
+
+        Args:
+            content_hash: the sha256 of the pdf binary
+            entry: the file entry ('name', 'uri', 'mime_type', 'expires_at', 'last_used_at')
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def touch(self, content_hash: str) -> None:
+        """
+        Updates the last use of a registered file
+
+        Args:
+            content_hash: the sha256 of the pdf binary
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, content_hash: str) -> None:
+        """
+        Removes a file from the registry
+
+        Args:
+            content_hash: the sha256 of the pdf binary
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def find_stale(self, expires_before: datetime, unused_before: datetime) -> list[dict]:
+        """
+        Finds the files to be cleaned up
+
+        Args:
+            expires_before: files expiring before this time are returned
+            unused_before: files not used since this time are returned
+        Returns:
+            the stale file entries, with their 'content_hash'
+        """
+        pass
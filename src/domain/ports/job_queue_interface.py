@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+
+
+class IJobQueue(ABC):
+    @abstractmethod
+    async def enqueue(self, message: dict) -> None:
+        """
+        Publishes a job message into the queue
+
+        Args:
+            message: the job payload ('job_id', 'case_id', 'pdf_url')
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    async def dequeue(self, wait_seconds: int) -> tuple[str, dict] | None:
+        """
+        Waits for the next job message
+
+        Args:
+            wait_seconds: the max time to wait for a message
+        Returns:
+            a tuple with the receipt used to acknowledge the message and the job payload, or None if the wait timed out
+        """
+        pass
+
+    @abstractmethod
+    async def ack(self, receipt: str) -> None:
+        """
+        Acknowledges a processed message so it is not delivered again
+
+        Args:
+            receipt: the receipt returned by dequeue
+        Returns:
+            None
+        """
+        pass
@@ -1,16 +1,125 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 
 class ILlmClient(ABC):
     @abstractmethod
-    def extract_data_from_pdf(self, file_path: str) -> dict:
+    def extract_data_from_pdf(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
         """
         Extracts structured data from a PDF file binary.
         
         Args:
             pdf_binary: the pdf file in binary format.
+            page_count: the page count of the pdf when already known, so it is not parsed again (e.g. to route it).
         
         Returns:
             a dictionary with the information extracted from the pdf document ('resume', 'timeline', 'evidence').
         """
+        pass
+
+    @abstractmethod
+    async def extract_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        """
+        Async variant of extract_data_from_pdf, it must not block the event loop.
+
+        Args:
+            pdf_binary: the pdf file in binary format.
+            page_count: the page count of the pdf when already known, so it is not parsed again (e.g. to route it).
+
+        Returns:
+            a dictionary with the information extracted from the pdf document ('resume', 'timeline', 'evidence').
+        """
+        pass
+
+    @abstractmethod
+    def extract_data_from_text(self, document_text: str) -> dict:
+        """
+        Extracts structured data from the text layer of a document, used instead of the pdf when its pages have text.
+
+        Args:
+            document_text: the text of the document, each page between <page number="N"> and </page> tags.
+
+        Returns:
+            a dictionary with the information extracted from the document ('resume', 'timeline', 'evidence').
+        """
+        pass
+
+    @abstractmethod
+    async def extract_data_from_text_async(self, document_text: str) -> dict:
+        """
+        Async variant of extract_data_from_text, it must not block the event loop.
+
+        Args:
+            document_text: the text of the document, each page between <page number="N"> and </page> tags.
+
+        Returns:
+            a dictionary with the information extracted from the document ('resume', 'timeline', 'evidence').
+        """
+        pass
+
+    @abstractmethod
+    def stream_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> AsyncIterator[str]:
+        """
+        Streaming variant of extract_data_from_pdf_async, it must not block the event loop.
+
+        Args:
+            pdf_binary: the pdf file in binary format.
+            page_count: the page count of the pdf when already known, so it is not parsed again (e.g. to route it).
+
+        Returns:
+            an async iterator of the fragments of the json text of the extraction ('resume', 'timeline', 'evidence'), as the model generates them.
+        """
+        pass
+
+    @abstractmethod
+    def stream_data_from_text_async(self, document_text: str) -> AsyncIterator[str]:
+        """
+        Streaming variant of extract_data_from_text_async, it must not block the event loop.
+
+        Args:
+            document_text: the text of the document, each page between <page number="N"> and </page> tags.
+
+        Returns:
+            an async iterator of the fragments of the json text of the extraction ('resume', 'timeline', 'evidence'), as the model generates them.
+        """
+        pass
+
+    @abstractmethod
+    async def extract_chunk_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        """
+        Extracts the timeline and evidence of an excerpt (a range of pages) of a larger document.
+
+        Args:
+            pdf_binary: the pdf excerpt in binary format.
+            page_count: the page count of the excerpt when already known, so it is not parsed again (e.g. to route it).
+
+        Returns:
+            a dictionary with the 'timeline' and 'evidence' of the excerpt, with page numbers relative to the excerpt.
+        """
+        pass
+
+    @abstractmethod
+    async def generate_resume_async(self, data: dict) -> str:
+        """
+        Writes the summary of the case from the data extracted from the whole document.
+
+        Args:
+            data: a dictionary with the 'timeline' and 'evidence' of the document.
+
+        Returns:
+            the summary text of the case.
+        """
+        pass
+
+    @abstractmethod
+    def get_fingerprint(self) -> str:
+        """
+        Returns an identifier of the prompt and model used for the extraction.
+
+        Results extracted with a different prompt or model must not be reused, so the
+        fingerprint is part of the extraction cache key.
+
+        Returns:
+            a hash string of the extraction prompt and the model name.
+        """
         pass
\ No newline at end of file
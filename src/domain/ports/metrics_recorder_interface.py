@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
+
+
+class IMetricsRecorder(ABC):
+    @abstractmethod
+    def increment(self, name: str, amount: float = 1.0, labels: dict[str, str] | None = None) -> None:
+        """
+        Adds the amount to a counter, and to the metrics of the current request
+
+        Args:
+            name: the counter name, e.g. 'gemini_tokens_total'
+            amount: the value added to the counter
+            labels: the label values of the series
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def observe(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
+        """
+        Records a value in a histogram, and adds it to the metrics of the current request
+
+        Args:
+            name: the histogram name, the '_seconds' and '_bytes' suffixes select the buckets
+            value: the observed value
+            labels: the label values of the series
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def set_gauge(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
+        """
+        Sets the current value of a gauge
+
+        Args:
+            name: the gauge name
+            value: the current value
+            labels: the label values of the series
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def time(self, name: str, labels: dict[str, str] | None = None) -> AbstractContextManager:
+        """
+        Observes the duration in seconds of the block in the histogram name
+
+        Args:
+            name: the histogram name, it should end with '_seconds'
+            labels: the label values of the series
+        Returns:
+            a context manager timing the block
+        """
+        pass
+
+    @abstractmethod
+    def request(self, operation: str) -> AbstractContextManager:
+        """
+        Collects the metrics recorded while the block runs (in the same task or in tasks started by it)
+        and publishes them as a single structured log when the block exits
+
+        Args:
+            operation: the name of the request, e.g. 'POST /extract'
+        Returns:
+            a context manager yielding the dictionary of the request metrics
+        """
+        pass
+
+    @abstractmethod
+    def render(self) -> str:
+        """
+        Returns the metrics of the process in the Prometheus text exposition format
+
+        Returns:
+            the text of the /metrics endpoint
+        """
+        pass
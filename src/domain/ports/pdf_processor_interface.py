@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from src.domain.entities.pdf_document_entity import PdfDocument
+
+
+class IPdfProcessor(ABC):
+    @abstractmethod
+    def count_pages(self, pdf_binary: bytes) -> int:
+        """
+        Counts the pages of a PDF file
+
+        Args:
+            pdf_binary: the pdf file in binary format.
+        Returns:
+            the number of pages of the document
+        """
+        pass
+
+    @abstractmethod
+    def read_pages(self, pdf_binary: bytes, min_text_chars: int = 20) -> PdfDocument:
+        """
+        Parses a PDF file once and reads the text layer of every page
+
+        Args:
+            pdf_binary: the pdf file in binary format.
+            min_text_chars: pages with less text than this are considered scanned
+        Returns:
+            the page count and the text of each page, flagging the scanned pages
+        """
+        pass
+
+    @abstractmethod
+    def hash_pages(self, pdf_binary: bytes) -> list[str]:
+        """
+        Hashes the content of each page of a PDF file, a page keeps its hash when pages are appended to the file
+
+        Args:
+            pdf_binary: the pdf file in binary format.
+        Returns:
+            the hex digest of each page, in page order
+        """
+        pass
+
+    @abstractmethod
+    def split(self, pdf_binary: bytes, page_ranges: list[tuple[int, int]]) -> list[bytes]:
+        """
+        Splits a PDF file into smaller documents, parsing it only once
+
+        Args:
+            pdf_binary: the pdf file in binary format.
+            page_ranges: the (page_init, page_end) ranges of each document, 1-based and inclusive
+        Returns:
+            the binary of each document, in the order of the page ranges
+        """
+        pass
@@ -1,6 +1,14 @@
+import datetime
 from abc import ABC, abstractmethod
 
 
+class PartialSaveError(Exception):
+    """Raised by save_many_async when the data of some cases was not saved, the other cases were"""
+    def __init__(self, errors_by_case_id: dict[str, str]):
+        super().__init__(f"Failed to save {len(errors_by_case_id)} cases: {', '.join(errors_by_case_id)}")
+        self.errors_by_case_id = errors_by_case_id
+
+
 class IStorageRepository(ABC):
     @abstractmethod
     def save(self, case_id: str, data: dict) -> None:
@@ -13,4 +21,120 @@ class IStorageRepository(ABC):
         Returns:
             None
         """
+        pass
+
+    @abstractmethod
+    async def save_async(self, case_id: str, data: dict) -> None:
+        """
+        Async variant of save, it must not block the event loop.
+
+        Args:
+            case_id: the unique id of the file
+            data: the strutured data extracted from the pdf document
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    async def save_many_async(self, data_by_case_id: dict[str, dict]) -> None:
+        """
+        Saves the extracted data of several documents in a single write
+
+        Args:
+            data_by_case_id: the strutured data extracted from each pdf document, by case_id
+        Returns:
+            None
+        Raises:
+            PartialSaveError: with the error of each case not saved, when the other cases were saved
+        """
+        pass
+
+    @abstractmethod
+    async def find_by_case_id_async(self, case_id: str, summary_only: bool = False) -> dict | None:
+        """
+        Finds the extracted data persisted for a case
+
+        Args:
+            case_id: the unique id of the file
+            summary_only: returns only the 'case_id', 'resume' and 'persisted_at' fields, without the timeline and evidence
+        Returns:
+            the persisted data or None if the case was not found
+        """
+        pass
+
+    @abstractmethod
+    async def find_page_hashes_async(self, case_id: str) -> list[str] | None:
+        """
+        Finds the page hashes stored with the extracted data of a case, without loading the data
+
+        Args:
+            case_id: the unique id of the file
+        Returns:
+            the hash of each page of the stored document, or None if the case or its hashes were not found
+        """
+        pass
+
+    @abstractmethod
+    async def find_cases_async(
+        self,
+        persisted_from: datetime.datetime | None = None,
+        persisted_to: datetime.datetime | None = None,
+        event_date_from: datetime.date | None = None,
+        event_date_to: datetime.date | None = None,
+        evidence_name: str | None = None,
+        after: tuple[str, str] | None = None,
+        limit: int = 20,
+        summary_only: bool = True
+    ) -> list[dict]:
+        """
+        Lists the persisted cases, newest first (persisted_at then case_id, descending)
+
+        Args:
+            persisted_from: inclusive lower bound of persisted_at
+            persisted_to: exclusive upper bound of persisted_at
+            event_date_from: inclusive lower bound of the date of at least one timeline event
+            event_date_to: inclusive upper bound of the date of that same event
+            evidence_name: exact name of at least one evidence item
+            after: the (persisted_at, case_id) of the last case of the previous page
+            limit: the max number of cases returned
+            summary_only: returns only the 'case_id', 'resume' and 'persisted_at' fields
+        Returns:
+            the persisted data of the cases
+        """
+        pass
+
+    @abstractmethod
+    async def ensure_indexes_async(self) -> None:
+        """
+        Converts the data stored in a previous format and creates the indexes backing the lookups and listings, it is idempotent
+
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    async def save_job_async(self, job_id: str, data: dict) -> None:
+        """
+        Creates or updates the state of an extraction job
+
+        Args:
+            job_id: the unique id of the job
+            data: the job fields to be saved
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    async def find_job_async(self, job_id: str) -> dict | None:
+        """
+        Finds the state of an extraction job
+
+        Args:
+            job_id: the unique id of the job
+        Returns:
+            the job data or None if the job was not found
+        """
         pass
\ No newline at end of file
@@ -0,0 +1,36 @@
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from src.domain.ports.extraction_cache_interface import IExtractionCache
+from src.infrastruture.configs.app_config import settings
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+logger = logging.getLogger(__name__)
+
+
+def build_extraction_cache(mongo_client: "MongoClient | None" = None) -> IExtractionCache | None:
+    """Builds the extraction cache selected by EXTRACTION_CACHE_BACKEND ('memory', 'mongodb' or 'none')"""
+    backend = settings.EXTRACTION_CACHE_BACKEND.lower()
+    if backend == "memory":
+        from src.infrastruture.adapters.memory_extraction_cache import InMemoryExtractionCache
+        return InMemoryExtractionCache(
+            max_size=settings.EXTRACTION_CACHE_MAX_SIZE,
+            ttl_seconds=settings.EXTRACTION_CACHE_TTL_SECONDS
+        )
+    if backend == "mongodb":
+        from src.infrastruture.adapters.mongodb_extraction_cache import MongoDBExtractionCache
+        return MongoDBExtractionCache(
+            client=mongo_client,
+            ttl_seconds=settings.EXTRACTION_CACHE_TTL_SECONDS
+        )
+    if backend != "none":
+        logger.warning(f"Unknown extraction cache backend '{backend}', cache disabled")
+    return None
+
+
+@lru_cache(maxsize=1)
+def get_extraction_cache() -> IExtractionCache | None:
+    """Returns a process-wide extraction cache for components built without the container"""
+    return build_extraction_cache()
@@ -0,0 +1,24 @@
+import logging
+from typing import TYPE_CHECKING
+from src.domain.ports.extraction_lease_interface import IExtractionLease
+from src.infrastruture.configs.app_config import settings
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+logger = logging.getLogger(__name__)
+
+
+def build_extraction_lease(mongo_client: "MongoClient | None" = None) -> IExtractionLease | None:
+    """Builds the cross-instance extraction lease selected by EXTRACTION_LEASE_BACKEND ('mongodb' or 'none')"""
+    backend = settings.EXTRACTION_LEASE_BACKEND.lower()
+    if backend == "mongodb":
+        if settings.EXTRACTION_CACHE_BACKEND.lower() != "mongodb":
+            # the waiting instances read the result of the lease owner from the shared cache
+            logger.warning("The extraction lease requires EXTRACTION_CACHE_BACKEND=mongodb, lease disabled")
+            return None
+        from src.infrastruture.adapters.mongodb_extraction_lease import MongoDBExtractionLease
+        return MongoDBExtractionLease(client=mongo_client)
+    if backend != "none":
+        logger.warning(f"Unknown extraction lease backend '{backend}', lease disabled")
+    return None
@@ -0,0 +1,23 @@
+import logging
+from typing import TYPE_CHECKING
+from src.domain.ports.file_registry_interface import IFileRegistry
+from src.infrastruture.configs.app_config import settings
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+logger = logging.getLogger(__name__)
+
+
+def build_file_registry(mongo_client: "MongoClient | None" = None) -> IFileRegistry | None:
+    """Builds the uploaded files registry selected by GEMINI_FILE_REGISTRY_BACKEND ('memory', 'mongodb' or 'none')"""
+    backend = settings.GEMINI_FILE_REGISTRY_BACKEND.lower()
+    if backend == "memory":
+        from src.infrastruture.adapters.memory_file_registry import InMemoryFileRegistry
+        return InMemoryFileRegistry()
+    if backend == "mongodb":
+        from src.infrastruture.adapters.mongodb_file_registry import MongoDBFileRegistry
+        return MongoDBFileRegistry(client=mongo_client)
+    if backend != "none":
+        logger.warning(f"Unknown file registry backend '{backend}', registry disabled")
+    return None
@@ -1,19 +1,51 @@
+import asyncio
+import hashlib
+import io
 import json
 import logging
-import os
+import time
+from datetime import datetime, timedelta, timezone
+from src.domain.entities.process_data_entity import ExtractedChunkData, ExtractedProcessData
+from src.domain.ports.file_registry_interface import IFileRegistry
 from src.domain.ports.llm_client_interface import ILlmClient
+from src.domain.ports.metrics_recorder_interface import IMetricsRecorder
 from google import genai
+from google.genai import errors, types
+from src.infrastruture.adapters.llm_call_usage import record_call_tokens
+from src.infrastruture.adapters.prometheus_metrics_recorder import get_metrics_recorder
 from src.infrastruture.configs.app_config import settings
 
 environ = __import__('os').environ
 
+# registered files expiring sooner than this are uploaded again
+FILE_EXPIRY_MARGIN = timedelta(minutes=10)
+# cached prompts expiring sooner than this are cached again
+PROMPT_CACHE_EXPIRY_MARGIN = timedelta(minutes=1)
+# rough size of a token of the prompts, to skip the prompts too small to be cached without an api call
+CHARS_PER_TOKEN = 4
+
 class GeminiClient(ILlmClient):
     """Implementation of the LLM client using Gemini API"""
-    def __init__(self):
+    def __init__(
+        self,
+        client: genai.Client | None = None,
+        file_registry: IFileRegistry | None = None,
+        metrics_recorder: IMetricsRecorder | None = None,
+        model_name: str | None = None
+    ):
         self.logger = logging.getLogger(__name__)
         api_key = settings.GEMINI_API_KEY
-        self.model_name = settings.GEMINI_MODEL_NAME
-        self.client = genai.Client(api_key=api_key)
+        self.model_name = model_name or settings.GEMINI_MODEL_NAME
+        self.client = client or genai.Client(api_key=api_key)
+        # maps the pdf hash to the uploaded file, so a document is uploaded once while the file lives
+        self.file_registry = file_registry
+        # cached content handles of the system prompts, by prompt hash
+        self._prompt_caches: dict[str, tuple[str, datetime]] = {}
+        self._uncacheable_prompts: set[str] = set()
+        self.metrics_recorder = metrics_recorder or get_metrics_recorder()
+        # monotonic time of the last sweep of the stale uploaded files, by the sweeper or by an upload
+        self._last_sweep_at: float | None = None
+        self._sweep_task: asyncio.Task | None = None
 
     def _get_extraction_prompt(self) -> str:
         """Returns the system prompt for the extration of the data into an strutured json format"""
@@ -45,60 +77,483 @@ class GeminiClient(ILlmClient):
         Analyze the entire document carefully to ensure all events and evidence are captured accurately. The goal is to provide a clear, structured overview of the legal case based on the document content.
         """
 
-    def extract_data_from_pdf(self, file_path: str) -> dict:
-        """Uses the Gemini API to extract the information from the PDF binary and returns it as a dictionary"""
+    def _get_chunk_extraction_prompt(self) -> str:
+        """Returns the system prompt for the extraction of the timeline and evidence of a range of pages of a larger document"""
+        return """
+        Your are a specialized legal assistant AI. The provided PDF is an excerpt with some consecutive pages of a larger legal process document.
+        Your task is to extract the timeline events and the evidence found in these pages into a structured JSON format.
+
+        The response must be a single valid JSON object without any additional text or explanation. Do not inlcude marckdown formatting like ```json.
+
+        The JSON object must have two top-level keys: "timeline" and "evidence".
+
+        1.  "timeline": Create a list of all relevant events found in the excerpt in chronological order. Each event must be an object with these exact keys:
+            - "event_id": integer, starting from 0.
+            - "event_name": string, a short title for the event (e.g., "Ajuizamento da Ação", "Decisão Interlocutória").
+            - "event_description": string, a detailed description of the event.
+            - "event_date": string, in "YYYY-MM-DD" format.
+            - "event_page_init": integer, the starting page number of the event.
+            - "event_page_end": integer, the ending page number of the event.
+        2.  "evidence": Create a list of all attached evidence/proofs found in the excerpt. Each item must be an object with these exact keys:
+            - "evidence_id": integer, starting from 0.
+            - "evidence_name": string, the name of the document (e.g., "Fatura CredNet", "Procuração").
+            - "evidence_flaw": string, describe any inconsistencies or "Sem inconsistências" if none.
+            - "evidence_page_init": integer, the starting page number.
+            - "evidence_page_end": integer, the ending page number.
+
+        Page numbers must be relative to the excerpt, the first page of the provided PDF is page 1.
+        Ensure the JSON structure is strictly followed, with correct key names and data types. If certain information is not available, use null for strings and -1 for integers.
+        """
+
+    def _get_resume_prompt(self) -> str:
+        """Returns the system prompt for the summary of the case from its extracted timeline and evidence"""
+        return """
+        Your are a specialized legal assistant AI. The following JSON has the timeline of events and the evidence extracted from a legal process document.
+        Write a concise text summary of the legal case based only on this data.
+
+        The response must be only the summary text, without any additional explanation or markdown formatting.
+        """
+
+    def get_fingerprint(self) -> str:
+        """Returns a hash of the extraction prompts and the model name"""
+        fingerprint = "\n".join([
+            self.model_name,
+            self._get_extraction_prompt(),
+            self._get_chunk_extraction_prompt(),
+            self._get_resume_prompt(),
+            self._get_text_instruction(),
+            json.dumps(ExtractedProcessData.model_json_schema(), sort_keys=True),
+            json.dumps(ExtractedChunkData.model_json_schema(), sort_keys=True)
+        ])
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def _get_upload_config(self) -> dict:
+        """Returns the upload configuration of the pdf file"""
+        return {
+            "mime_type": "application/pdf",
+            "display_name": "legal_process.pdf"
+        }
+
+    def _build_contents(self, pdf_file) -> list:
+        """Returns the contents of the generation request for the uploaded pdf file, the prompt goes in the system instruction"""
+        return [
+            pdf_file,
+            "Extract the data from the legal process document into the required JSON format."
+        ]
+
+    def _get_text_instruction(self) -> str:
+        """Returns the request instruction of the text mode, the system prompt is the same as for the pdf"""
+        return (
+            "The legal process document is given as the text layer of its pages, each page between <page number=\"N\"> and </page> tags "
+            "(scanned pages without text are marked as <page number=\"N\" scanned=\"true\"/>). Use these page numbers for the page fields. "
+            "Extract the data from the document into the required JSON format."
+        )
+
+    def _build_text_contents(self, document_text: str) -> list:
+        """Returns the contents of the generation request for the page-tagged text of the document"""
+        return [self._get_text_instruction(), document_text]
+
+    def _get_prompt_key(self, system_prompt: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\n{system_prompt}".encode("utf-8")).hexdigest()
+
+    def _find_cached_prompt(self, prompt_key: str) -> str | None:
+        cached = self._prompt_caches.get(prompt_key)
+        if cached and cached[1] > datetime.now(timezone.utc) + PROMPT_CACHE_EXPIRY_MARGIN:
+            return cached[0]
+        return None
+
+    def _should_cache_prompt(self, prompt_key: str, system_prompt: str) -> bool:
+        if not settings.GEMINI_PROMPT_CACHE_ENABLED or prompt_key in self._uncacheable_prompts:
+            return False
+        estimated_tokens = len(system_prompt) // CHARS_PER_TOKEN
+        if estimated_tokens < settings.GEMINI_PROMPT_CACHE_MIN_TOKENS:
+            # gemini would refuse it, checked once per prompt instead of a failing caches.create call
+            self._uncacheable_prompts.add(prompt_key)
+            self.logger.info(
+                f"System prompt of about {estimated_tokens} tokens is under the cache minimum of "
+                f"{settings.GEMINI_PROMPT_CACHE_MIN_TOKENS} tokens, sending it inline"
+            )
+            return False
+        return True
+
+    def _get_prompt_cache_config(self, system_prompt: str) -> dict:
+        return {
+            "system_instruction": system_prompt,
+            "ttl": f"{settings.GEMINI_PROMPT_CACHE_TTL_SECONDS}s",
+            "display_name": "legal_process_extraction_prompt"
+        }
+
+    def _store_cached_prompt(self, prompt_key: str, cached_content: types.CachedContent) -> None:
+        expires_at = cached_content.expire_time or datetime.now(timezone.utc) + timedelta(seconds=settings.GEMINI_PROMPT_CACHE_TTL_SECONDS)
+        self._prompt_caches[prompt_key] = (cached_content.name, expires_at)
+        self.logger.info(f"Cached system prompt as {cached_content.name}")
+
+    def _mark_uncacheable(self, prompt_key: str, error: Exception) -> None:
+        # e.g. the prompt is under the minimum token count of the model, it is sent inline from now on
+        self._uncacheable_prompts.add(prompt_key)
+        self.logger.info(f"System prompt can not be cached, sending it inline: {error}")
+
+    def _build_generation_config(self, system_prompt: str, response_schema, cached_content: str | None) -> dict:
+        """Returns the generation configuration, referencing the cached prompt when available"""
+        config = {}
+        if response_schema is not None:
+            config["response_mime_type"] = "application/json"
+            config["response_schema"] = response_schema
+        if cached_content:
+            config["cached_content"] = cached_content
+        else:
+            config["system_instruction"] = system_prompt
+        return config
+
+    def _get_generation_config(self, system_prompt: str, response_schema=None) -> dict:
+        """Returns the generation configuration of a request, caching its system prompt on first use"""
+        prompt_key = self._get_prompt_key(system_prompt)
+        cached_content = self._find_cached_prompt(prompt_key)
+        if cached_content is None and self._should_cache_prompt(prompt_key, system_prompt):
+            try:
+                cached = self.client.caches.create(model=self.model_name, config=self._get_prompt_cache_config(system_prompt))
+                self._store_cached_prompt(prompt_key, cached)
+                cached_content = cached.name
+            except Exception as e:
+                self._mark_uncacheable(prompt_key, e)
+        return self._build_generation_config(system_prompt, response_schema, cached_content)
+
+    async def _get_generation_config_async(self, system_prompt: str, response_schema=None) -> dict:
+        """Async variant of _get_generation_config"""
+        prompt_key = self._get_prompt_key(system_prompt)
+        cached_content = self._find_cached_prompt(prompt_key)
+        if cached_content is None and self._should_cache_prompt(prompt_key, system_prompt):
+            try:
+                cached = await self.client.aio.caches.create(model=self.model_name, config=self._get_prompt_cache_config(system_prompt))
+                self._store_cached_prompt(prompt_key, cached)
+                cached_content = cached.name
+            except Exception as e:
+                self._mark_uncacheable(prompt_key, e)
+        return self._build_generation_config(system_prompt, response_schema, cached_content)
+
+    def _parse_response(self, response) -> dict:
+        """Reads the text content of the Gemini API response and parses it as JSON"""
+        self.logger.info(f"Gemini API response: {response}")
+        content = getattr(response, "text", None)
+
+        if not content:
+            response_dict = response.model_dump_json()
+            response_dict = json.loads(response_dict)
+            content = response_dict.get("text", "")
+            if not content:
+                raise ValueError("No text content found in Gemini API response")
+
+        # Attempt to parse the content as JSON
         try:
-            # pdf_file = self.client.files.upload(
-            #     file=pdf_binary,
-            #     config={"file_type": "application/pdf", "name": "legal_process.pdf"}
-            # )
+            json_data = json.loads(content)
+            return json_data
+        except json.JSONDecodeError as json_err:
+            self.logger.error(f"JSON decoding error: {json_err}")
+            self.logger.error(f"Response content: {content}")
+            raise ValueError("Failed to parse JSON from Gemini API response")
+
+    def _build_chunk_contents(self, pdf_file) -> list:
+        """Returns the contents of the generation request for an uploaded excerpt of the document"""
+        return [
+            pdf_file,
+            "Extract the timeline and evidence from the pages of the legal process document into the required JSON format."
+        ]
+
+    def _find_registered_file(self, content_hash: str):
+        """Returns a reference to the file already uploaded for the pdf, or None if it must be uploaded"""
+        entry = self.file_registry.get(content_hash)
+        if entry is None:
+            return None
+        if entry["expires_at"] <= datetime.now(timezone.utc) + FILE_EXPIRY_MARGIN:
+            self.file_registry.delete(content_hash)
+            return None
+        self.file_registry.touch(content_hash)
+        self.logger.info(f"Reusing uploaded file {entry['name']} for pdf {content_hash}")
+        return types.Part.from_uri(file_uri=entry["uri"], mime_type=entry["mime_type"])
+
+    def _register_file(self, content_hash: str, pdf_file: types.File) -> None:
+        now = datetime.now(timezone.utc)
+        self.file_registry.save(content_hash, {
+            "name": pdf_file.name,
+            "uri": pdf_file.uri,
+            "mime_type": pdf_file.mime_type or "application/pdf",
+            "expires_at": pdf_file.expiration_time or now + timedelta(seconds=settings.GEMINI_FILE_TTL_SECONDS),
+            "last_used_at": now
+        })
+
+    def _is_missing_file_error(self, error: Exception) -> bool:
+        return isinstance(error, errors.ClientError) and error.code in (403, 404)
+
+    def _upload_pdf(self, pdf_binary: bytes, content_hash: str, reuse: bool = True):
+        if self.file_registry is not None and reuse:
+            registered_file = self._find_registered_file(content_hash)
+            if registered_file is not None:
+                self.metrics_recorder.increment("gemini_file_reuses_total")
+                return registered_file, True
+
+        with self.metrics_recorder.time("gemini_upload_seconds"):
             pdf_file = self.client.files.upload(
-                file=file_path,
-                config={
-                    "mime_type": "application/pdf",
-                    "display_name": "legal_process.pdf"
-                }
+                file=io.BytesIO(pdf_binary),
+                config=self._get_upload_config()
             )
+        if self.file_registry is not None:
+            self._register_file(content_hash, pdf_file)
+        return pdf_file, False
 
+    def _sweep_if_due(self) -> None:
+        """
+        Starts a sweep of the stale uploaded files in the background when none ran for the sweep interval.
+        With the periodic sweeper (API server) it never is due, on Lambda the sweeps follow the uploads.
+        """
+        interval_seconds = settings.GEMINI_FILE_SWEEP_INTERVAL_SECONDS
+        if self.file_registry is None or interval_seconds <= 0:
+            return
+        if self._sweep_task is not None and not self._sweep_task.done():
+            return
+        if self._last_sweep_at is not None and time.monotonic() - self._last_sweep_at < interval_seconds:
+            return
+        self._sweep_task = asyncio.create_task(self._sweep_async())
 
-            prompt = self._get_extraction_prompt()
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=[
-                    prompt,
-                    pdf_file,
-                    "Extract the data from the legal process document into the required JSON format."
-                ],
-                config={"response_mime_type": "application/json"}
+    async def _sweep_async(self) -> None:
+        try:
+            await self.delete_stale_files_async(settings.GEMINI_FILE_MAX_IDLE_SECONDS)
+        except Exception as e:
+            self.logger.error(f"Uploaded files sweep failed: {e}", exc_info=True)
+
+    async def _upload_pdf_async(self, pdf_binary: bytes, content_hash: str, reuse: bool = True):
+        self._sweep_if_due()
+        # the registry may block (mongodb backend), it runs in a worker thread
+        if self.file_registry is not None and reuse:
+            registered_file = await asyncio.to_thread(self._find_registered_file, content_hash)
+            if registered_file is not None:
+                self.metrics_recorder.increment("gemini_file_reuses_total")
+                return registered_file, True
+
+        with self.metrics_recorder.time("gemini_upload_seconds"):
+            pdf_file = await self.client.aio.files.upload(
+                file=io.BytesIO(pdf_binary),
+                config=self._get_upload_config()
             )
+        if self.file_registry is not None:
+            await asyncio.to_thread(self._register_file, content_hash, pdf_file)
+        return pdf_file, False
 
-            self.logger.info(f"Gemini API response: {response}")
-            content = getattr(response, "text", None)
+    def _record_usage(self, response) -> None:
+        """Counts the tokens billed for a response, from its usage metadata"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        # the policy layer charges the actual tokens to its tokens per minute limiter
+        record_call_tokens(usage.total_token_count)
+        for name, count in (
+            ("gemini_prompt_tokens_total", usage.prompt_token_count),
+            ("gemini_cached_tokens_total", usage.cached_content_token_count),
+            ("gemini_output_tokens_total", usage.candidates_token_count),
+            ("gemini_thoughts_tokens_total", usage.thoughts_token_count)
+        ):
+            if count:
+                self.metrics_recorder.increment(name, count)
 
-            if not content:
-                response_dict = response.model_dump_json()
-                response_dict = json.loads(response_dict)
-                content = response_dict.get("text", "")
-                if not content:
-                    raise ValueError("No text content found in Gemini API response")
+    def _generate_content(self, contents: list, config: dict):
+        with self.metrics_recorder.time("gemini_generate_seconds"):
+            response = self.client.models.generate_content(model=self.model_name, contents=contents, config=config)
+        self._record_usage(response)
+        return response
 
-            # Attempt to parse the content as JSON
-            try:
-                json_data = json.loads(content)
-                return json_data
-            except json.JSONDecodeError as json_err:
-                self.logger.error(f"JSON decoding error: {json_err}")
-                self.logger.error(f"Response content: {content}")
-                raise ValueError("Failed to parse JSON from Gemini API response")
+    async def _generate_content_async(self, contents: list, config: dict):
+        with self.metrics_recorder.time("gemini_generate_seconds"):
+            response = await self.client.aio.models.generate_content(model=self.model_name, contents=contents, config=config)
+        self._record_usage(response)
+        return response
+
+    async def _stream_content_async(self, contents: list, config: dict):
+        """Yields the text of the response chunks as they are generated, the usage comes with the last chunk"""
+        last_chunk = None
+        # only the waits on gemini are timed, not the time the consumer takes with each fragment
+        started_at = time.perf_counter()
+        stream = await self.client.aio.models.generate_content_stream(model=self.model_name, contents=contents, config=config)
+        generate_seconds = time.perf_counter() - started_at
+        try:
+            while True:
+                started_at = time.perf_counter()
+                try:
+                    chunk = await anext(stream)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    generate_seconds += time.perf_counter() - started_at
+                last_chunk = chunk
+                if chunk.text:
+                    yield chunk.text
+        finally:
+            self.metrics_recorder.observe("gemini_generate_seconds", generate_seconds)
+        if last_chunk is not None:
+            self._record_usage(last_chunk)
+
+    def _generate_from_pdf(self, pdf_binary: bytes, build_contents, config: dict):
+        """Uploads the pdf (or reuses its registered file) and generates the content for it"""
+        content_hash = hashlib.sha256(pdf_binary).hexdigest()
+        pdf_file, reused = self._upload_pdf(pdf_binary, content_hash)
+        try:
+            return self._generate_content(build_contents(pdf_file), config)
+        except Exception as e:
+            if not (reused and self._is_missing_file_error(e)):
+                raise
+            # the registered file was deleted remotely, upload it again
+            self.logger.warning(f"Registered file of pdf {content_hash} is not available, uploading it again: {e}")
+            self.file_registry.delete(content_hash)
+            pdf_file, _ = self._upload_pdf(pdf_binary, content_hash, reuse=False)
+            return self._generate_content(build_contents(pdf_file), config)
+
+    async def _generate_from_pdf_async(self, pdf_binary: bytes, build_contents, config: dict):
+        """Async variant of _generate_from_pdf"""
+        content_hash = hashlib.sha256(pdf_binary).hexdigest()
+        pdf_file, reused = await self._upload_pdf_async(pdf_binary, content_hash)
+        try:
+            return await self._generate_content_async(build_contents(pdf_file), config)
+        except Exception as e:
+            if not (reused and self._is_missing_file_error(e)):
+                raise
+            self.logger.warning(f"Registered file of pdf {content_hash} is not available, uploading it again: {e}")
+            await asyncio.to_thread(self.file_registry.delete, content_hash)
+            pdf_file, _ = await self._upload_pdf_async(pdf_binary, content_hash, reuse=False)
+            return await self._generate_content_async(build_contents(pdf_file), config)
+
+    def extract_data_from_pdf(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        """Uses the Gemini API to extract the information from the PDF binary and returns it as a dictionary, the whole file is sent whatever its page count"""
+        try:
+            config = self._get_generation_config(self._get_extraction_prompt(), ExtractedProcessData)
+            response = self._generate_from_pdf(pdf_binary, self._build_contents, config)
+            return self._parse_response(response)
 
         except Exception as e:
             self.logger.error(f"Error extracting data from PDF: {e}")
             raise e
-        
-        finally:
-            if file_path:
-                try:
-                    os.remove(file_path)
-                    self.logger.info(f"Temporary file {file_path} removed successfully.")
-                except Exception as cleanup_err:
-                    self.logger.warning(f"Failed to remove temporary file {file_path}: {cleanup_err}")
\ No newline at end of file
+
+    async def extract_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        """Async variant of extract_data_from_pdf using the non-blocking client of the Gemini SDK (client.aio)"""
+        try:
+            config = await self._get_generation_config_async(self._get_extraction_prompt(), ExtractedProcessData)
+            response = await self._generate_from_pdf_async(pdf_binary, self._build_contents, config)
+            return self._parse_response(response)
+
+        except Exception as e:
+            self.logger.error(f"Error extracting data from PDF: {e}")
+            raise e
+
+    def extract_data_from_text(self, document_text: str) -> dict:
+        """Uses the Gemini API to extract the information from the page-tagged text of the document, nothing is uploaded"""
+        try:
+            config = self._get_generation_config(self._get_extraction_prompt(), ExtractedProcessData)
+            response = self._generate_content(self._build_text_contents(document_text), config)
+            return self._parse_response(response)
+
+        except Exception as e:
+            self.logger.error(f"Error extracting data from the document text: {e}")
+            raise e
+
+    async def extract_data_from_text_async(self, document_text: str) -> dict:
+        """Async variant of extract_data_from_text"""
+        try:
+            config = await self._get_generation_config_async(self._get_extraction_prompt(), ExtractedProcessData)
+            response = await self._generate_content_async(self._build_text_contents(document_text), config)
+            return self._parse_response(response)
+
+        except Exception as e:
+            self.logger.error(f"Error extracting data from the document text: {e}")
+            raise e
+
+    async def stream_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None):
+        """Streaming variant of extract_data_from_pdf_async, yields the json text of the extraction as it is generated"""
+        try:
+            config = await self._get_generation_config_async(self._get_extraction_prompt(), ExtractedProcessData)
+            content_hash = hashlib.sha256(pdf_binary).hexdigest()
+            pdf_file, reused = await self._upload_pdf_async(pdf_binary, content_hash)
+            streamed = False
+            try:
+                async for fragment in self._stream_content_async(self._build_contents(pdf_file), config):
+                    streamed = True
+                    yield fragment
+            except Exception as e:
+                # once a fragment is out the stream can not be restarted
+                if streamed or not (reused and self._is_missing_file_error(e)):
+                    raise
+                self.logger.warning(f"Registered file of pdf {content_hash} is not available, uploading it again: {e}")
+                await asyncio.to_thread(self.file_registry.delete, content_hash)
+                pdf_file, _ = await self._upload_pdf_async(pdf_binary, content_hash, reuse=False)
+                async for fragment in self._stream_content_async(self._build_contents(pdf_file), config):
+                    yield fragment
+
+        except Exception as e:
+            self.logger.error(f"Error streaming data from PDF: {e}")
+            raise e
+
+    async def stream_data_from_text_async(self, document_text: str):
+        """Streaming variant of extract_data_from_text_async"""
+        try:
+            config = await self._get_generation_config_async(self._get_extraction_prompt(), ExtractedProcessData)
+            async for fragment in self._stream_content_async(self._build_text_contents(document_text), config):
+                yield fragment
+
+        except Exception as e:
+            self.logger.error(f"Error streaming data from the document text: {e}")
+            raise e
+
+    async def extract_chunk_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        """Uses the Gemini API to extract the timeline and evidence of an excerpt of the document, with page numbers relative to the excerpt"""
+        try:
+            config = await self._get_generation_config_async(self._get_chunk_extraction_prompt(), ExtractedChunkData)
+            response = await self._generate_from_pdf_async(pdf_binary, self._build_chunk_contents, config)
+            return self._parse_response(response)
+
+        except Exception as e:
+            self.logger.error(f"Error extracting data from PDF excerpt: {e}")
+            raise e
+
+    async def generate_resume_async(self, data: dict) -> str:
+        """Uses the Gemini API to write the summary of the case from its merged timeline and evidence"""
+        try:
+            response = await self._generate_content_async(
+                [json.dumps(data, ensure_ascii=False)],
+                await self._get_generation_config_async(self._get_resume_prompt())
+            )
+
+            content = getattr(response, "text", None)
+            if not content:
+                raise ValueError("No text content found in Gemini API response")
+            return content.strip()
+
+        except Exception as e:
+            self.logger.error(f"Error generating the case resume: {e}")
+            raise e
+
+    async def delete_stale_files_async(self, max_idle_seconds: int) -> int:
+        """Deletes the remote files that are about to expire or were not used for max_idle_seconds, returns how many were deleted"""
+        if self.file_registry is None:
+            return 0
+
+        self._last_sweep_at = time.monotonic()
+        now = datetime.now(timezone.utc)
+        stale_files = await asyncio.to_thread(
+            self.file_registry.find_stale,
+            now + FILE_EXPIRY_MARGIN,
+            now - timedelta(seconds=max_idle_seconds)
+        )
+        deleted = 0
+        for entry in stale_files:
+            try:
+                await self.client.aio.files.delete(name=entry["name"])
+            except errors.ClientError as e:
+                # already expired or deleted remotely
+                if e.code not in (403, 404):
+                    self.logger.warning(f"Failed to delete uploaded file {entry['name']}: {e}")
+                    continue
+            except Exception as e:
+                self.logger.warning(f"Failed to delete uploaded file {entry['name']}: {e}")
+                continue
+            await asyncio.to_thread(self.file_registry.delete, entry["content_hash"])
+            deleted += 1
+
+        if deleted:
+            self.logger.info(f"Deleted {deleted} stale uploaded files")
+        return deleted
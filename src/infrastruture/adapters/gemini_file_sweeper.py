@@ -0,0 +1,35 @@
+import asyncio
+import logging
+from src.infrastruture.adapters.gemini_client import GeminiClient
+
+
+class GeminiFileSweeper:
+    """Periodically deletes the uploaded Gemini files that are expiring or no longer used"""
+    def __init__(self, gemini_client: GeminiClient, interval_seconds: int, max_idle_seconds: int):
+        self.logger = logging.getLogger(__name__)
+        self.gemini_client = gemini_client
+        self.interval_seconds = interval_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self.logger.info("Started uploaded files sweeper")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self.logger.info("Stopped uploaded files sweeper")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.gemini_client.delete_stale_files_async(self.max_idle_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Uploaded files sweep failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,18 @@
+from src.domain.ports.job_queue_interface import IJobQueue
+from src.infrastruture.configs.app_config import settings
+
+
+def build_job_queue() -> IJobQueue:
+    """Builds the job queue selected by JOB_QUEUE_BACKEND ('memory' or 'sqs')"""
+    backend = settings.JOB_QUEUE_BACKEND.lower()
+    if backend == "memory":
+        from src.infrastruture.adapters.memory_job_queue import InMemoryJobQueue
+        return InMemoryJobQueue()
+    if backend == "sqs":
+        from src.infrastruture.adapters.sqs_job_queue import SQSJobQueue
+        return SQSJobQueue(
+            queue_url=settings.JOB_QUEUE_URL,
+            region_name=settings.JOB_QUEUE_REGION,
+            endpoint_url=settings.JOB_QUEUE_ENDPOINT_URL
+        )
+    raise ValueError(f"Unknown job queue backend '{backend}'")
@@ -0,0 +1,26 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# the tokens billed for the responses of the llm call in progress, read by the policy layer
+_call_tokens: ContextVar[list[int] | None] = ContextVar("llm_call_tokens", default=None)
+
+
+def record_call_tokens(token_count: int | None) -> None:
+    """Reports the total tokens of a provider response to the policy layer tracking the current call, if any"""
+    call_tokens = _call_tokens.get()
+    if call_tokens is not None and token_count:
+        call_tokens.append(token_count)
+
+
+@contextmanager
+def track_call_tokens(call_tokens: list[int]):
+    """
+    Collects into call_tokens the tokens reported by the provider responses of the calls made inside the block.
+    The tasks and threads started inside the block (asyncio.wait_for, asyncio.to_thread) copy the context, so
+    they report into the same list.
+    """
+    reset_token = _call_tokens.set(call_tokens)
+    try:
+        yield call_tokens
+    finally:
+        _call_tokens.reset(reset_token)
@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from src.domain.ports.llm_client_interface import ILlmClient
+from src.domain.ports.metrics_recorder_interface import IMetricsRecorder
+from src.domain.ports.pdf_processor_interface import IPdfProcessor
+from src.infrastruture.adapters.prometheus_metrics_recorder import get_metrics_recorder
+
+# size of the json of a resume request counted as one page
+CHARS_PER_PAGE = 3000
+# latencies kept per route for the latency budget and the stats
+LATENCY_WINDOW = 100
+# successful calls needed before the latency budget of a route is enforced
+MIN_LATENCY_SAMPLES = 10
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+@dataclass
+class LlmRoute:
+    """A model of a provider, serving the documents up to max_pages pages (0 for any size)"""
+    name: str
+    llm_client: ILlmClient
+    max_pages: int = 0
+    # relative cost of a page, the cheapest route that fits a document is tried first
+    cost_per_page: float = 1.0
+    # p95 latency above which the route is tried after the others, 0 for none
+    latency_budget_seconds: float = 0.0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    counters: dict = field(default_factory=lambda: {"routed": 0, "errors": 0, "failovers": 0})
+
+    def fits(self, page_count: float) -> bool:
+        return self.max_pages <= 0 or page_count <= self.max_pages
+
+
+class LlmRouter(ILlmClient):
+    """
+    Routes each request to a model/provider by the size of the document, and fails over to the next
+    route when a call fails.
+
+    The routes that fit the page count of the document are tried from the cheapest. A route whose
+    policy layer is saturated (open circuit or rate limited) or whose recent p95 latency is over its
+    budget is tried after the healthy ones. Each route keeps its latency and error stats.
+    """
+    def __init__(
+        self,
+        routes: list[LlmRoute],
+        pdf_processor: IPdfProcessor | None = None,
+        metrics_recorder: IMetricsRecorder | None = None
+    ):
+        if not routes:
+            raise ValueError("The LLM router needs at least one route")
+        self.logger = logging.getLogger(__name__)
+        self.routes = routes
+        if pdf_processor is None:
+            from src.infrastruture.adapters.pypdf_processor import PyPdfProcessor
+            pdf_processor = PyPdfProcessor()
+        self.pdf_processor = pdf_processor
+        self.metrics_recorder = metrics_recorder or get_metrics_recorder()
+        self._lock = threading.Lock()
+
+    def _count_pdf_pages(self, pdf_binary: bytes, page_count: int | None = None) -> float:
+        """Returns the page count given by the caller, the pdf is only parsed when it is not known"""
+        if page_count:
+            return page_count
+        try:
+            return self.pdf_processor.count_pages(pdf_binary)
+        except Exception as e:
+            # an unknown size goes to the routes without a page limit
+            self.logger.warning(f"Failed to count the pages of the PDF to route it: {e}")
+            return math.inf
+
+    def _count_text_pages(self, document_text: str) -> float:
+        return max(1, len(re.findall(r"<page number=", document_text)))
+
+    def _is_healthy(self, route: LlmRoute) -> bool:
+        is_saturated = getattr(route.llm_client, "is_saturated", None)
+        if is_saturated is not None and is_saturated():
+            return False
+        if route.latency_budget_seconds > 0:
+            with self._lock:
+                latencies = list(route.latencies)
+            if len(latencies) >= MIN_LATENCY_SAMPLES and _percentile(latencies, 95) > route.latency_budget_seconds:
+                return False
+        return True
+
+    def _select_routes(self, page_count: float) -> list[LlmRoute]:
+        """Returns the routes to try for a document, in order"""
+        candidates = [route for route in self.routes if route.fits(page_count)]
+        if not candidates:
+            # no route declares this size, the largest ones are the best bet
+            largest = max(route.max_pages for route in self.routes)
+            candidates = [route for route in self.routes if route.max_pages == largest]
+        candidates.sort(key=lambda route: route.cost_per_page)
+        healthy = [route for route in candidates if self._is_healthy(route)]
+        return healthy + [route for route in candidates if route not in healthy]
+
+    def _record_success(self, route: LlmRoute, seconds: float) -> None:
+        with self._lock:
+            route.counters["routed"] += 1
+            route.latencies.append(seconds)
+        self.metrics_recorder.observe("llm_route_seconds", seconds, {"route": route.name})
+        self.metrics_recorder.increment("llm_route_calls_total", labels={"route": route.name, "outcome": "success"})
+
+    def _record_failure(self, route: LlmRoute, error: Exception, has_next: bool) -> None:
+        with self._lock:
+            route.counters["routed"] += 1
+            route.counters["errors"] += 1
+            if has_next:
+                route.counters["failovers"] += 1
+        self.metrics_recorder.increment("llm_route_calls_total", labels={"route": route.name, "outcome": "error"})
+        if has_next:
+            self.metrics_recorder.increment("llm_route_failovers_total", labels={"route": route.name})
+            self.logger.warning(f"LLM route '{route.name}' failed, failing over: {error!r}")
+
+    def _call(self, method_name: str, page_count: float, *args):
+        routes = self._select_routes(page_count)
+        for index, route in enumerate(routes):
+            started_at = time.perf_counter()
+            try:
+                result = getattr(route.llm_client, method_name)(*args)
+            except Exception as e:
+                self._record_failure(route, e, index < len(routes) - 1)
+                if index == len(routes) - 1:
+                    raise
+                continue
+            self._record_success(route, time.perf_counter() - started_at)
+            return result
+
+    async def _call_async(self, method_name: str, page_count: float, *args):
+        routes = self._select_routes(page_count)
+        for index, route in enumerate(routes):
+            started_at = time.perf_counter()
+            try:
+                result = await getattr(route.llm_client, method_name)(*args)
+            except Exception as e:
+                self._record_failure(route, e, index < len(routes) - 1)
+                if index == len(routes) - 1:
+                    raise
+                continue
+            self._record_success(route, time.perf_counter() - started_at)
+            return result
+
+    async def _stream_async(self, method_name: str, page_count: float, *args):
+        """Fails over only before the first fragment, the fragments already handed to the caller can not be taken back"""
+        routes = self._select_routes(page_count)
+        for index, route in enumerate(routes):
+            started_at = time.perf_counter()
+            streamed = False
+            try:
+                async with aclosing(getattr(route.llm_client, method_name)(*args)) as fragments:
+                    async for fragment in fragments:
+                        streamed = True
+                        yield fragment
+            except Exception as e:
+                is_last = streamed or index == len(routes) - 1
+                self._record_failure(route, e, not is_last)
+                if is_last:
+                    raise
+                continue
+            self._record_success(route, time.perf_counter() - started_at)
+            return
+
+    async def _count_pdf_pages_async(self, pdf_binary: bytes, page_count: int | None) -> float:
+        if page_count:
+            return page_count
+        return await asyncio.to_thread(self._count_pdf_pages, pdf_binary)
+
+    def _known_page_count(self, page_count: float) -> int | None:
+        """The page count handed to the route clients, None when the pdf could not be parsed"""
+        return None if math.isinf(page_count) else int(page_count)
+
+    def extract_data_from_pdf(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        page_count = self._count_pdf_pages(pdf_binary, page_count)
+        return self._call("extract_data_from_pdf", page_count, pdf_binary, self._known_page_count(page_count))
+
+    async def extract_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        page_count = await self._count_pdf_pages_async(pdf_binary, page_count)
+        return await self._call_async("extract_data_from_pdf_async", page_count, pdf_binary, self._known_page_count(page_count))
+
+    def extract_data_from_text(self, document_text: str) -> dict:
+        return self._call("extract_data_from_text", self._count_text_pages(document_text), document_text)
+
+    async def extract_data_from_text_async(self, document_text: str) -> dict:
+        return await self._call_async("extract_data_from_text_async", self._count_text_pages(document_text), document_text)
+
+    async def stream_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None):
+        page_count = await self._count_pdf_pages_async(pdf_binary, page_count)
+        async with aclosing(self._stream_async("stream_data_from_pdf_async", page_count, pdf_binary, self._known_page_count(page_count))) as fragments:
+            async for fragment in fragments:
+                yield fragment
+
+    async def stream_data_from_text_async(self, document_text: str):
+        async with aclosing(self._stream_async("stream_data_from_text_async", self._count_text_pages(document_text), document_text)) as fragments:
+            async for fragment in fragments:
+                yield fragment
+
+    async def extract_chunk_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        page_count = await self._count_pdf_pages_async(pdf_binary, page_count)
+        return await self._call_async("extract_chunk_data_from_pdf_async", page_count, pdf_binary, self._known_page_count(page_count))
+
+    async def generate_resume_async(self, data: dict) -> str:
+        page_count = math.ceil(len(json.dumps(data, ensure_ascii=False)) / CHARS_PER_PAGE)
+        return await self._call_async("generate_resume_async", page_count, data)
+
+    def get_fingerprint(self) -> str:
+        """Changes with the model of any route and with the page limits, which decide the model of a document"""
+        fingerprint = "\n".join(
+            f"{route.name}:{route.max_pages}:{route.llm_client.get_fingerprint()}" for route in self.routes
+        )
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def stats(self) -> dict:
+        """Returns the stats of each route: its policy layer counters, its routed calls, errors, failovers and latency"""
+        routes = {}
+        for route in self.routes:
+            with self._lock:
+                latencies = list(route.latencies)
+                counters = dict(route.counters)
+            route_stats = getattr(route.llm_client, "stats", dict)()
+            routes[route.name] = {
+                **route_stats,
+                **counters,
+                "latency_p50_seconds": _percentile(latencies, 50),
+                "latency_p95_seconds": _percentile(latencies, 95)
+            }
+        return {"routes": routes}
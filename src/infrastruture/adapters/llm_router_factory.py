@@ -0,0 +1,78 @@
+import logging
+from typing import TYPE_CHECKING
+from src.domain.ports.file_registry_interface import IFileRegistry
+from src.domain.ports.llm_client_interface import ILlmClient
+from src.domain.ports.metrics_recorder_interface import IMetricsRecorder
+from src.infrastruture.adapters.llm_router import LlmRoute, LlmRouter
+from src.infrastruture.configs.app_config import settings
+
+if TYPE_CHECKING:
+    from google import genai
+
+logger = logging.getLogger(__name__)
+
+
+def build_resilient_llm_client(llm_client: ILlmClient, route_config: dict | None = None) -> ILlmClient:
+    """Wraps a provider client in the call policy of the LLM_* settings, a route may override its rate limits"""
+    from src.infrastruture.adapters.resilient_llm_client import ResilientLlmClient
+    route_config = route_config or {}
+    return ResilientLlmClient(
+        llm_client,
+        requests_per_minute=route_config.get("requests_per_minute", settings.LLM_REQUESTS_PER_MINUTE),
+        tokens_per_minute=route_config.get("tokens_per_minute", settings.LLM_TOKENS_PER_MINUTE),
+        estimated_tokens_per_request=route_config.get("estimated_tokens_per_request", settings.LLM_ESTIMATED_TOKENS_PER_REQUEST),
+        max_retries=settings.LLM_MAX_RETRIES,
+        retry_base_seconds=settings.LLM_RETRY_BASE_SECONDS,
+        retry_max_seconds=settings.LLM_RETRY_MAX_SECONDS,
+        call_timeout_seconds=route_config.get("call_timeout_seconds", settings.LLM_CALL_TIMEOUT_SECONDS),
+        circuit_failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        circuit_reset_seconds=settings.LLM_CIRCUIT_RESET_SECONDS
+    )
+
+
+def _build_provider_client(
+    route_config: dict,
+    genai_client: "genai.Client | None",
+    file_registry: IFileRegistry | None,
+    metrics_recorder: IMetricsRecorder | None
+) -> ILlmClient:
+    provider = route_config.get("provider", "gemini").lower()
+    if provider == "gemini":
+        from src.infrastruture.adapters.gemini_client import GeminiClient
+        return GeminiClient(
+            client=genai_client,
+            file_registry=file_registry,
+            metrics_recorder=metrics_recorder,
+            model_name=route_config.get("model")
+        )
+    if provider == "stub":
+        from src.infrastruture.adapters.stub_llm_client import StubLlmClient
+        return StubLlmClient(
+            model_name=route_config.get("model", "stub"),
+            latency_seconds=route_config.get("latency_seconds", 0.1),
+            seconds_per_page=route_config.get("seconds_per_page", 0.0),
+            error_rate=route_config.get("error_rate", 0.0)
+        )
+    raise ValueError(f"Unknown LLM provider '{provider}' in route '{route_config.get('name')}'")
+
+
+def build_llm_router(
+    genai_client: "genai.Client | None" = None,
+    file_registry: IFileRegistry | None = None,
+    metrics_recorder: IMetricsRecorder | None = None,
+    route_configs: list[dict] | None = None
+) -> LlmRouter:
+    """Builds the router of the LLM_ROUTES settings, each route with its own call policy (provider quotas are per model)"""
+    routes = []
+    for index, route_config in enumerate(route_configs if route_configs is not None else settings.LLM_ROUTES):
+        name = route_config.get("name") or f"route-{index}"
+        provider_client = _build_provider_client({**route_config, "name": name}, genai_client, file_registry, metrics_recorder)
+        routes.append(LlmRoute(
+            name=name,
+            llm_client=build_resilient_llm_client(provider_client, route_config),
+            max_pages=route_config.get("max_pages", 0),
+            cost_per_page=route_config.get("cost_per_page", 1.0),
+            latency_budget_seconds=route_config.get("latency_budget_seconds", 0.0)
+        ))
+        logger.info(f"LLM route '{name}': {provider_client.model_name} up to {route_config.get('max_pages', 0) or 'any'} pages")
+    return LlmRouter(routes, metrics_recorder=metrics_recorder)
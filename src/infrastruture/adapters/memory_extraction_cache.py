@@ -0,0 +1,51 @@
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from src.domain.ports.extraction_cache_interface import IExtractionCache
+
+
+class InMemoryExtractionCache(IExtractionCache):
+    """In-process LRU implementation of the extraction cache with size and TTL eviction"""
+    def __init__(self, max_size: int = 128, ttl_seconds: int = 86400):
+        self.logger = logging.getLogger(__name__)
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict | None:
+        """Returns a copy of the cached data, evicting the entry if it is expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, data = entry
+            if self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(data)
+
+    def set(self, key: str, data: dict) -> None:
+        """Stores a copy of the data, evicting the least recently used entries over max_size."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(data))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self.logger.info(f"Evicted extraction cache entry: {evicted_key}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
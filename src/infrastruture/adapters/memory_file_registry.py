@@ -0,0 +1,36 @@
+import threading
+from datetime import datetime, timezone
+from src.domain.ports.file_registry_interface import IFileRegistry
+
+
+class InMemoryFileRegistry(IFileRegistry):
+    """In-process implementation of the registry of the files uploaded to the LLM provider"""
+    def __init__(self):
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, content_hash: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            return dict(entry) if entry else None
+
+    def save(self, content_hash: str, entry: dict) -> None:
+        with self._lock:
+            self._entries[content_hash] = dict(entry)
+
+    def touch(self, content_hash: str) -> None:
+        with self._lock:
+            if content_hash in self._entries:
+                self._entries[content_hash]["last_used_at"] = datetime.now(timezone.utc)
+
+    def delete(self, content_hash: str) -> None:
+        with self._lock:
+            self._entries.pop(content_hash, None)
+
+    def find_stale(self, expires_before: datetime, unused_before: datetime) -> list[dict]:
+        with self._lock:
+            return [
+                {**entry, "content_hash": content_hash}
+                for content_hash, entry in self._entries.items()
+                if entry["expires_at"] < expires_before or entry["last_used_at"] < unused_before
+            ]
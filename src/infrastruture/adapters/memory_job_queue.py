@@ -0,0 +1,24 @@
+import asyncio
+import logging
+from src.domain.ports.job_queue_interface import IJobQueue
+
+
+class InMemoryJobQueue(IJobQueue):
+    """In-process implementation of the job queue for local runs, pending jobs are lost on restart"""
+    def __init__(self, max_size: int = 0):
+        self.logger = logging.getLogger(__name__)
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_size)
+
+    async def enqueue(self, message: dict) -> None:
+        await self._queue.put(message)
+        self.logger.info(f"Job {message.get('job_id')} enqueued, {self._queue.qsize()} pending")
+
+    async def dequeue(self, wait_seconds: int) -> tuple[str, dict] | None:
+        try:
+            message = await asyncio.wait_for(self._queue.get(), timeout=wait_seconds)
+        except asyncio.TimeoutError:
+            return None
+        return message.get("job_id", ""), message
+
+    async def ack(self, receipt: str) -> None:
+        self._queue.task_done()
@@ -0,0 +1,59 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from pymongo import MongoClient
+from src.infrastruture.configs.app_config import settings
+from src.domain.ports.extraction_cache_interface import IExtractionCache
+
+
+class MongoDBExtractionCache(IExtractionCache):
+    """Implementation of the extraction cache using a MongoDB collection next to process_data"""
+    def __init__(self, client: MongoClient | None = None, ttl_seconds: int = 86400):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        try:
+            self.client = client or MongoClient(settings.MONGODB_URI)
+            self.db = self.client[settings.MONGODB_DB_NAME]
+            self.collection = self.db["extraction_cache"]
+            if ttl_seconds > 0:
+                # mongo removes expired entries in the background
+                self.collection.create_index("created_at", expireAfterSeconds=ttl_seconds)
+            self.logger.info("Connected to MongoDB extraction cache")
+        except Exception as e:
+            self.logger.error(f"Failed to connect to MongoDB extraction cache: {e}")
+            raise
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> dict | None:
+        """Returns the cached data for the key, a failing lookup is treated as a miss."""
+        try:
+            document = self.collection.find_one({"_id": key}, {"data": 1})
+        except Exception as e:
+            self.logger.warning(f"Failed to read extraction cache entry {key}: {e}")
+            document = None
+
+        self._count(document is not None)
+        return document["data"] if document else None
+
+    def set(self, key: str, data: dict) -> None:
+        """Upserts the cached data for the key, failures are logged and ignored."""
+        try:
+            self.collection.update_one(
+                {"_id": key},
+                {"$set": {"data": data, "created_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to write extraction cache entry {key}: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
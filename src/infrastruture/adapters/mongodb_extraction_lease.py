@@ -0,0 +1,43 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from pymongo import MongoClient
+from pymongo.errors import DuplicateKeyError
+from src.infrastruture.configs.app_config import settings
+from src.domain.ports.extraction_lease_interface import IExtractionLease
+
+
+class MongoDBExtractionLease(IExtractionLease):
+    """Implementation of the extraction lease using a MongoDB collection, one document per key being extracted"""
+    def __init__(self, client: MongoClient | None = None):
+        self.logger = logging.getLogger(__name__)
+        try:
+            self.client = client or MongoClient(settings.MONGODB_URI)
+            self.db = self.client[settings.MONGODB_DB_NAME]
+            self.collection = self.db["extraction_leases"]
+            # mongo removes the expired leases in the background, try_acquire does not depend on it
+            self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self.logger.info("Connected to MongoDB extraction leases")
+        except Exception as e:
+            self.logger.error(f"Failed to connect to MongoDB extraction leases: {e}")
+            raise
+
+    def try_acquire(self, key: str, owner: str, ttl_seconds: int) -> bool:
+        """Upserts the lease if it is free, expired or already held by the owner."""
+        now = datetime.now(timezone.utc)
+        try:
+            self.collection.update_one(
+                {"_id": key, "$or": [{"expires_at": {"$lte": now}}, {"owner": owner}]},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # the filter did not match an existing lease, another owner holds it
+            return False
+
+    def release(self, key: str, owner: str) -> None:
+        """Deletes the lease if the owner still holds it, failures are logged and ignored (it expires)."""
+        try:
+            self.collection.delete_one({"_id": key, "owner": owner})
+        except Exception as e:
+            self.logger.warning(f"Failed to release extraction lease {key}: {e}")
@@ -0,0 +1,41 @@
+import logging
+from datetime import datetime, timezone
+from pymongo import MongoClient
+from src.infrastruture.configs.app_config import settings
+from src.domain.ports.file_registry_interface import IFileRegistry
+
+
+class MongoDBFileRegistry(IFileRegistry):
+    """Implementation of the registry of the files uploaded to the LLM provider using a MongoDB collection"""
+    def __init__(self, client: MongoClient | None = None):
+        self.logger = logging.getLogger(__name__)
+        try:
+            # tz_aware so the stored dates are compared as utc datetimes
+            self.client = client or MongoClient(settings.MONGODB_URI)
+            self.collection = self.client[settings.MONGODB_DB_NAME].get_collection(
+                "gemini_files",
+                codec_options=self.client.codec_options.with_options(tz_aware=True, tzinfo=timezone.utc)
+            )
+            self.logger.info("Connected to MongoDB file registry")
+        except Exception as e:
+            self.logger.error(f"Failed to connect to MongoDB file registry: {e}")
+            raise
+
+    def get(self, content_hash: str) -> dict | None:
+        return self.collection.find_one({"_id": content_hash}, {"_id": 0})
+
+    def save(self, content_hash: str, entry: dict) -> None:
+        self.collection.update_one({"_id": content_hash}, {"$set": entry}, upsert=True)
+
+    def touch(self, content_hash: str) -> None:
+        self.collection.update_one({"_id": content_hash}, {"$set": {"last_used_at": datetime.now(timezone.utc)}})
+
+    def delete(self, content_hash: str) -> None:
+        self.collection.delete_one({"_id": content_hash})
+
+    def find_stale(self, expires_before: datetime, unused_before: datetime) -> list[dict]:
+        stale = self.collection.find({"$or": [
+            {"expires_at": {"$lt": expires_before}},
+            {"last_used_at": {"$lt": unused_before}}
+        ]})
+        return [{**entry, "content_hash": entry.pop("_id")} for entry in stale]
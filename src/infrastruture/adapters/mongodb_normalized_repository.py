@@ -0,0 +1,302 @@
+import datetime
+import hashlib
+import json
+from pymongo import ASCENDING, DESCENDING, AsyncMongoClient, DeleteMany, IndexModel, MongoClient, UpdateOne
+from src.domain.ports.storage_repository_interface import PartialSaveError
+from src.infrastruture.adapters.mongodb_repository import FULL_PROJECTION, SUMMARY_PROJECTION, MongoDBRepository
+from src.infrastruture.configs.app_config import settings
+
+CASE_INDEXES = [
+    IndexModel([("case_id", ASCENDING)], unique=True, name="case_id_unique"),
+    IndexModel([("persisted_at", DESCENDING), ("case_id", DESCENDING)], name="persisted_at_case_id")
+]
+TIMELINE_INDEXES = [
+    IndexModel([("case_id", ASCENDING), ("event_id", ASCENDING)], unique=True, name="case_id_event_id_unique"),
+    # cross-case queries, e.g. all the hearings of a month
+    IndexModel([("event_date", ASCENDING), ("case_id", ASCENDING)], name="event_date_case_id")
+]
+EVIDENCE_INDEXES = [
+    IndexModel([("case_id", ASCENDING), ("evidence_id", ASCENDING)], unique=True, name="case_id_evidence_id_unique"),
+    IndexModel([("evidence_name", ASCENDING), ("case_id", ASCENDING)], name="evidence_name_case_id")
+]
+ITEM_PROJECTION = {"_id": 0, "case_id": 0, "content_hash": 0}
+# cases saved with the embedded layout moved to the item collections per bulk write
+MIGRATION_BATCH_SIZE = 100
+
+
+class MongoDBNormalizedRepository(MongoDBRepository):
+    """
+    Storage repository keeping the case header (resume, persisted_at) in process_data and each
+    timeline event and evidence item in its own document of the timeline_events and evidence
+    collections, keyed by (case_id, id), with native BSON dates.
+
+    Items carry the hash of their content, so a re-extraction only writes the items that changed
+    and deletes the ones that are gone, and a case document stays small whatever the process size.
+    """
+    def __init__(self, client: MongoClient | None = None, async_client: AsyncMongoClient | None = None):
+        super().__init__(client=client, async_client=async_client)
+        self.timeline_collection = self.db["timeline_events"]
+        self.evidence_collection = self.db["evidence"]
+        async_db = self.async_client[settings.MONGODB_DB_NAME]
+        self.async_timeline_collection = async_db["timeline_events"]
+        self.async_evidence_collection = async_db["evidence"]
+
+    def _hash_item(self, item: dict) -> str:
+        return hashlib.sha256(json.dumps(item, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _build_case_update(self, case_id: str, data: dict) -> UpdateOne:
+        timeline, evidence = data.get("timeline") or [], data.get("evidence") or []
+        header = {key: value for key, value in data.items() if key not in ("timeline", "evidence")}
+        header["persisted_at"] = self._to_datetime(header.get("persisted_at"))
+        header["timeline_count"] = len(timeline)
+        header["evidence_count"] = len(evidence)
+        # drops the arrays of a case saved with the embedded layout
+        return UpdateOne({"case_id": case_id}, {"$set": header, "$unset": {"timeline": "", "evidence": ""}}, upsert=True)
+
+    def _build_item_writes(
+        self,
+        case_id: str,
+        items: list[dict],
+        id_key: str,
+        existing_hashes: dict[int, str],
+        date_key: str | None = None
+    ) -> list:
+        """Returns the upserts of the new or changed items and the delete of the items no longer extracted"""
+        writes = []
+        for item in items:
+            content_hash = self._hash_item(item)
+            if existing_hashes.get(item[id_key]) == content_hash:
+                continue
+            document = {**item, "case_id": case_id, "content_hash": content_hash}
+            if date_key:
+                document[date_key] = self._to_datetime(document.get(date_key))
+            writes.append(UpdateOne({"case_id": case_id, id_key: item[id_key]}, {"$set": document}, upsert=True))
+
+        stale_ids = set(existing_hashes) - {item[id_key] for item in items}
+        if stale_ids:
+            writes.append(DeleteMany({"case_id": case_id, id_key: {"$in": sorted(stale_ids)}}))
+        return writes
+
+    def _group_hashes(self, documents: list[dict], id_key: str) -> dict[str, dict[int, str]]:
+        hashes = {}
+        for document in documents:
+            hashes.setdefault(document["case_id"], {})[document[id_key]] = document.get("content_hash")
+        return hashes
+
+    def _build_writes(self, data_by_case_id: dict[str, dict], timeline_hashes: dict, evidence_hashes: dict) -> tuple[list, list, list]:
+        """Returns the (case_id, write) pairs of the case, timeline and evidence collections"""
+        case_writes, timeline_writes, evidence_writes = [], [], []
+        for case_id, data in data_by_case_id.items():
+            case_writes.append((case_id, self._build_case_update(case_id, data)))
+            timeline_writes.extend((case_id, write) for write in self._build_item_writes(
+                case_id, data.get("timeline") or [], "event_id", timeline_hashes.get(case_id, {}), date_key="event_date"
+            ))
+            evidence_writes.extend((case_id, write) for write in self._build_item_writes(
+                case_id, data.get("evidence") or [], "evidence_id", evidence_hashes.get(case_id, {})
+            ))
+        return case_writes, timeline_writes, evidence_writes
+
+    def _save_many(self, data_by_case_id: dict[str, dict]) -> None:
+        case_ids = list(data_by_case_id)
+        timeline_hashes = self._group_hashes(list(self.timeline_collection.find(
+            {"case_id": {"$in": case_ids}}, {"_id": 0, "case_id": 1, "event_id": 1, "content_hash": 1}
+        )), "event_id")
+        evidence_hashes = self._group_hashes(list(self.evidence_collection.find(
+            {"case_id": {"$in": case_ids}}, {"_id": 0, "case_id": 1, "evidence_id": 1, "content_hash": 1}
+        )), "evidence_id")
+        case_writes, timeline_writes, evidence_writes = self._build_writes(data_by_case_id, timeline_hashes, evidence_hashes)
+        # the items first, a case header is never visible before its items
+        errors_by_case_id = {}
+        if timeline_writes:
+            errors_by_case_id.update(self._bulk_write(self.timeline_collection, timeline_writes))
+        if evidence_writes:
+            errors_by_case_id.update(self._bulk_write(self.evidence_collection, evidence_writes))
+        # the header of a case with failed item writes is not written, its previous version stays
+        case_writes = [(case_id, write) for case_id, write in case_writes if case_id not in errors_by_case_id]
+        if case_writes:
+            errors_by_case_id.update(self._bulk_write(self.collection, case_writes))
+        self.logger.info(f"Saved {len(case_writes)} cases, {len(timeline_writes)} timeline and {len(evidence_writes)} evidence writes")
+        if errors_by_case_id:
+            raise PartialSaveError(errors_by_case_id)
+
+    async def _save_many_async(self, data_by_case_id: dict[str, dict]) -> None:
+        case_ids = list(data_by_case_id)
+        timeline_hashes = self._group_hashes(await self.async_timeline_collection.find(
+            {"case_id": {"$in": case_ids}}, {"_id": 0, "case_id": 1, "event_id": 1, "content_hash": 1}
+        ).to_list(), "event_id")
+        evidence_hashes = self._group_hashes(await self.async_evidence_collection.find(
+            {"case_id": {"$in": case_ids}}, {"_id": 0, "case_id": 1, "evidence_id": 1, "content_hash": 1}
+        ).to_list(), "evidence_id")
+        case_writes, timeline_writes, evidence_writes = self._build_writes(data_by_case_id, timeline_hashes, evidence_hashes)
+        errors_by_case_id = {}
+        if timeline_writes:
+            errors_by_case_id.update(await self._bulk_write_async(self.async_timeline_collection, timeline_writes))
+        if evidence_writes:
+            errors_by_case_id.update(await self._bulk_write_async(self.async_evidence_collection, evidence_writes))
+        case_writes = [(case_id, write) for case_id, write in case_writes if case_id not in errors_by_case_id]
+        if case_writes:
+            errors_by_case_id.update(await self._bulk_write_async(self.async_collection, case_writes))
+        self.logger.info(f"Saved {len(case_writes)} cases, {len(timeline_writes)} timeline and {len(evidence_writes)} evidence writes")
+        if errors_by_case_id:
+            raise PartialSaveError(errors_by_case_id)
+
+    def save(self, case_id: str, data: dict) -> None:
+        """Saves the case header and the changed timeline and evidence items."""
+        try:
+            self.logger.info(f"Saving data for case_id: {case_id} to MongoDB")
+            self._save_many({case_id: data})
+        except Exception as e:
+            self.logger.error(f"Failed to save data for case_id {case_id}: {e}")
+            raise
+
+    async def save_async(self, case_id: str, data: dict) -> None:
+        """Saves the case header and the changed timeline and evidence items without blocking the event loop."""
+        try:
+            self.logger.info(f"Saving data for case_id: {case_id} to MongoDB")
+            await self._save_many_async({case_id: data})
+        except Exception as e:
+            self.logger.error(f"Failed to save data for case_id {case_id}: {e}")
+            raise
+
+    async def save_many_async(self, data_by_case_id: dict[str, dict]) -> None:
+        """Saves several cases with a single bulk write per collection."""
+        try:
+            self.logger.info(f"Saving data for {len(data_by_case_id)} cases to MongoDB")
+            await self._save_many_async(data_by_case_id)
+        except Exception as e:
+            self.logger.error(f"Failed to save data for cases {list(data_by_case_id)}: {e}")
+            raise
+
+    def _to_case_data(self, header: dict, timeline: list[dict] | None = None, evidence: list[dict] | None = None) -> dict:
+        """Converts the stored documents back into the shape of the embedded layout (json dates)"""
+        data = {key: value for key, value in header.items() if key not in ("timeline_count", "evidence_count")}
+        if isinstance(data.get("persisted_at"), datetime.datetime):
+            data["persisted_at"] = self._format_datetime(data["persisted_at"])
+        if timeline is not None:
+            for event in timeline:
+                if isinstance(event.get("event_date"), datetime.datetime):
+                    event["event_date"] = event["event_date"].date().isoformat()
+            data["timeline"] = timeline
+        if evidence is not None:
+            data["evidence"] = evidence
+        return data
+
+    async def _find_items_async(self, case_ids: list[str]) -> tuple[dict[str, list], dict[str, list]]:
+        timeline_by_case_id, evidence_by_case_id = {}, {}
+        async for event in self.async_timeline_collection.find(
+            {"case_id": {"$in": case_ids}}, {**ITEM_PROJECTION, "case_id": 1}
+        ).sort([("case_id", ASCENDING), ("event_id", ASCENDING)]):
+            timeline_by_case_id.setdefault(event.pop("case_id"), []).append(event)
+        async for item in self.async_evidence_collection.find(
+            {"case_id": {"$in": case_ids}}, {**ITEM_PROJECTION, "case_id": 1}
+        ).sort([("case_id", ASCENDING), ("evidence_id", ASCENDING)]):
+            evidence_by_case_id.setdefault(item.pop("case_id"), []).append(item)
+        return timeline_by_case_id, evidence_by_case_id
+
+    async def find_by_case_id_async(self, case_id: str, summary_only: bool = False) -> dict | None:
+        """Finds the case header and, unless summary_only, its timeline and evidence."""
+        try:
+            header = await self.async_collection.find_one({"case_id": case_id}, FULL_PROJECTION)
+            if header is None:
+                return None
+            if summary_only:
+                return self._to_case_data({key: header.get(key) for key in ("case_id", "resume", "persisted_at")})
+            if "timeline" in header:
+                # not migrated yet, saved with the embedded layout
+                return self._to_case_data(header)
+            timeline_by_case_id, evidence_by_case_id = await self._find_items_async([case_id])
+            return self._to_case_data(header, timeline_by_case_id.get(case_id, []), evidence_by_case_id.get(case_id, []))
+        except Exception as e:
+            self.logger.error(f"Failed to find data for case_id {case_id}: {e}")
+            raise
+
+    async def find_cases_async(
+        self,
+        persisted_from: datetime.datetime | None = None,
+        persisted_to: datetime.datetime | None = None,
+        event_date_from: datetime.date | None = None,
+        event_date_to: datetime.date | None = None,
+        evidence_name: str | None = None,
+        after: tuple[str, str] | None = None,
+        limit: int = 20,
+        summary_only: bool = True
+    ) -> list[dict]:
+        """
+        Lists the cases newest first. The item filters are joined per case ($lookup stopping at the first
+        matching item, on the case_id indexes of the item collections), so the listing stops at limit cases.
+        """
+        query = self._build_cases_query(persisted_from, persisted_to, None, None, None, after)
+        try:
+            pipeline = [{"$match": query}, {"$sort": {"persisted_at": DESCENDING, "case_id": DESCENDING}}]
+            joined = []
+            if event_date_from is not None or event_date_to is not None:
+                event_date = {}
+                if event_date_from is not None:
+                    event_date["$gte"] = datetime.datetime.combine(event_date_from, datetime.time(), datetime.timezone.utc)
+                if event_date_to is not None:
+                    event_date["$lte"] = datetime.datetime.combine(event_date_to, datetime.time(), datetime.timezone.utc)
+                joined.append(("timeline_events", {"event_date": event_date}))
+            if evidence_name:
+                joined.append(("evidence", {"evidence_name": evidence_name}))
+            for collection_name, item_query in joined:
+                matched_key = f"matched_{collection_name}"
+                pipeline.append({"$lookup": {
+                    "from": collection_name,
+                    "localField": "case_id",
+                    "foreignField": "case_id",
+                    "pipeline": [{"$match": item_query}, {"$limit": 1}, {"$project": {"_id": 1}}],
+                    "as": matched_key
+                }})
+                pipeline.append({"$match": {f"{matched_key}.0": {"$exists": True}}})
+            pipeline.append({"$limit": limit})
+
+            if summary_only:
+                pipeline.append({"$project": SUMMARY_PROJECTION})
+            else:
+                pipeline.append({"$project": {**FULL_PROJECTION, **{f"matched_{name}": 0 for name, _ in joined}}})
+            headers = await (await self.async_collection.aggregate(pipeline)).to_list(length=limit)
+            if summary_only:
+                return [self._to_case_data(header) for header in headers]
+
+            timeline_by_case_id, evidence_by_case_id = await self._find_items_async([header["case_id"] for header in headers])
+            return [
+                self._to_case_data(header, timeline_by_case_id.get(header["case_id"], []), evidence_by_case_id.get(header["case_id"], []))
+                for header in headers
+            ]
+        except Exception as e:
+            self.logger.error(f"Failed to list cases with query {query}: {e}")
+            raise
+
+    async def _migrate_embedded_cases_async(self) -> None:
+        """Moves the timeline and evidence of the cases saved with the embedded layout to the item collections"""
+        migrated = 0
+        query = {"$or": [{"timeline": {"$exists": True}}, {"evidence": {"$exists": True}}]}
+        while True:
+            # the migrated cases lose their arrays, so each batch is read from the start of the query
+            cases = await self.async_collection.find(query, FULL_PROJECTION).limit(MIGRATION_BATCH_SIZE).to_list()
+            if not cases:
+                break
+            await self._save_many_async({case["case_id"]: case for case in cases})
+            migrated += len(cases)
+        if migrated:
+            self.logger.info(f"Migrated {migrated} cases from the embedded layout")
+
+    async def ensure_indexes_async(self) -> None:
+        """
+        Converts the cases saved with the embedded layout and creates the indexes of the case, timeline
+        and evidence collections, once per process. The listing filters only see migrated cases.
+        """
+        if self._indexes_ensured:
+            return
+        try:
+            await self._migrate_persisted_at_async()
+            await self.async_collection.create_indexes(CASE_INDEXES)
+            await self.async_timeline_collection.create_indexes(TIMELINE_INDEXES)
+            await self.async_evidence_collection.create_indexes(EVIDENCE_INDEXES)
+            # after the unique indexes, two processes migrating the same case can not duplicate its items
+            await self._migrate_embedded_cases_async()
+            self._indexes_ensured = True
+            self.logger.info("MongoDB indexes ensured")
+        except Exception as e:
+            self.logger.error(f"Failed to create MongoDB indexes: {e}")
+            raise
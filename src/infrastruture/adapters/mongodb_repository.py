@@ -1,32 +1,260 @@
+import datetime
 import logging
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, AsyncMongoClient, IndexModel, MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
 from src.infrastruture.configs.app_config import settings
-from src.domain.ports.storage_repository_interface import IStorageRepository
+from src.domain.ports.storage_repository_interface import IStorageRepository, PartialSaveError
+
+SUMMARY_PROJECTION = {"_id": 0, "case_id": 1, "resume": 1, "persisted_at": 1}
+# the page hashes only serve the incremental extraction, they are not part of the case data
+FULL_PROJECTION = {"_id": 0, "page_hashes": 0}
+
+PROCESS_DATA_INDEXES = [
+    IndexModel([("case_id", ASCENDING)], unique=True, name="case_id_unique"),
+    # listing order and cursor of the pagination
+    IndexModel([("persisted_at", DESCENDING), ("case_id", DESCENDING)], name="persisted_at_case_id"),
+    IndexModel([("timeline.event_date", ASCENDING)], name="timeline_event_date"),
+    IndexModel([("evidence.evidence_name", ASCENDING), ("persisted_at", DESCENDING)], name="evidence_name_persisted_at")
+]
 
 
 class MongoDBRepository(IStorageRepository):
-    """Implementation of the storage repository using MongoDB"""
-    def __init__(self):
+    """
+    Implementation of the storage repository using MongoDB. persisted_at is stored as a BSON date,
+    so the range filters and the listing order compare instants, and read back as its json dump.
+    """
+    def __init__(self, client: MongoClient | None = None, async_client: AsyncMongoClient | None = None):
         self.logger = logging.getLogger(__name__)
         try:
-            self.client = MongoClient(settings.MONGODB_URI)
+            self.client = client or MongoClient(settings.MONGODB_URI)
             self.db = self.client[settings.MONGODB_DB_NAME]
             self.collection = self.db["process_data"]
+            # the async client only connects on its first operation
+            self.async_client = async_client or AsyncMongoClient(settings.MONGODB_URI)
+            self.async_collection = self.async_client[settings.MONGODB_DB_NAME]["process_data"]
+            self.async_jobs_collection = self.async_client[settings.MONGODB_DB_NAME]["extraction_jobs"]
+            self._indexes_ensured = False
             self.logger.info("Connected to MongoDB")
         except Exception as e:
             self.logger.error(f"Failed to connect to MongoDB: {e}")
             raise
 
+    def _to_datetime(self, value) -> datetime.datetime | None:
+        """Converts the json dump of a date or datetime into a BSON date, naive values are UTC"""
+        if isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if isinstance(value, datetime.datetime) and value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value
+
+    def _to_document(self, data: dict) -> dict:
+        if "persisted_at" not in data:
+            return data
+        return {**data, "persisted_at": self._to_datetime(data["persisted_at"])}
+
+    def _to_case_data(self, document: dict) -> dict:
+        """Converts a stored case back into its json shape"""
+        if isinstance(document.get("persisted_at"), datetime.datetime):
+            document["persisted_at"] = self._format_datetime(document["persisted_at"])
+        return document
+
+    def _map_write_errors(self, error: BulkWriteError, writes: list[tuple[str, object]]) -> dict[str, str]:
+        """
+        Returns the error of each case whose writes failed in an unordered bulk write of (case_id, write)
+        pairs. A write concern error leaves every write unconfirmed, so the whole bulk write failed.
+        """
+        write_errors = error.details.get("writeErrors") or []
+        if not write_errors or error.details.get("writeConcernErrors"):
+            raise error
+        return {writes[write_error["index"]][0]: write_error.get("errmsg", str(error)) for write_error in write_errors}
+
+    def _bulk_write(self, collection, writes: list[tuple[str, object]]) -> dict[str, str]:
+        """Runs an unordered bulk write of (case_id, write) pairs, returns the error of each case whose writes failed"""
+        try:
+            collection.bulk_write([write for _, write in writes], ordered=False)
+        except BulkWriteError as e:
+            return self._map_write_errors(e, writes)
+        return {}
+
+    async def _bulk_write_async(self, collection, writes: list[tuple[str, object]]) -> dict[str, str]:
+        """Async variant of _bulk_write"""
+        try:
+            await collection.bulk_write([write for _, write in writes], ordered=False)
+        except BulkWriteError as e:
+            return self._map_write_errors(e, writes)
+        return {}
+
     def save(self, case_id: str, data: dict) -> None:
         """Saves the extracted data in the mongo database."""
         try:
             self.logger.info(f"Saving data for case_id: {case_id} to MongoDB")
             self.collection.update_one(
                 {"case_id": case_id},
-                {"$set": data},
+                {"$set": self._to_document(data)},
+                upsert=True
+            )
+            self.logger.info(f"Data for case_id: {case_id} saved successfully")
+        except Exception as e:
+            self.logger.error(f"Failed to save data for case_id {case_id}: {e}")
+            raise
+
+    async def save_async(self, case_id: str, data: dict) -> None:
+        """Saves the extracted data in the mongo database without blocking the event loop."""
+        try:
+            self.logger.info(f"Saving data for case_id: {case_id} to MongoDB")
+            await self.async_collection.update_one(
+                {"case_id": case_id},
+                {"$set": self._to_document(data)},
                 upsert=True
             )
             self.logger.info(f"Data for case_id: {case_id} saved successfully")
         except Exception as e:
             self.logger.error(f"Failed to save data for case_id {case_id}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def save_many_async(self, data_by_case_id: dict[str, dict]) -> None:
+        """Saves the extracted data of several cases with a single bulk write."""
+        try:
+            self.logger.info(f"Saving data for {len(data_by_case_id)} cases to MongoDB")
+            errors_by_case_id = await self._bulk_write_async(self.async_collection, [
+                (case_id, UpdateOne({"case_id": case_id}, {"$set": self._to_document(data)}, upsert=True))
+                for case_id, data in data_by_case_id.items()
+            ])
+            if errors_by_case_id:
+                raise PartialSaveError(errors_by_case_id)
+            self.logger.info(f"Data for {len(data_by_case_id)} cases saved successfully")
+        except Exception as e:
+            self.logger.error(f"Failed to save data for cases {list(data_by_case_id)}: {e}")
+            raise
+
+    async def find_by_case_id_async(self, case_id: str, summary_only: bool = False) -> dict | None:
+        """Finds the extracted data of a case in the mongo database."""
+        try:
+            projection = SUMMARY_PROJECTION if summary_only else FULL_PROJECTION
+            data = await self.async_collection.find_one({"case_id": case_id}, projection)
+        except Exception as e:
+            self.logger.error(f"Failed to find data for case_id {case_id}: {e}")
+            raise
+        return self._to_case_data(data) if data else None
+
+    async def find_page_hashes_async(self, case_id: str) -> list[str] | None:
+        """Finds the page hashes stored with a case, projecting only them."""
+        try:
+            data = await self.async_collection.find_one({"case_id": case_id}, {"_id": 0, "page_hashes": 1})
+        except Exception as e:
+            self.logger.error(f"Failed to find the page hashes of case_id {case_id}: {e}")
+            raise
+        return data.get("page_hashes") if data else None
+
+    def _format_datetime(self, value: datetime.datetime) -> str:
+        """Formats a datetime as the json dump of the output dto, naive datetimes (as read from mongo) are UTC"""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.astimezone(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+    def _build_cases_query(
+        self,
+        persisted_from: datetime.datetime | None,
+        persisted_to: datetime.datetime | None,
+        event_date_from: datetime.date | None,
+        event_date_to: datetime.date | None,
+        evidence_name: str | None,
+        after: tuple[str, str] | None
+    ) -> dict:
+        query = {}
+        persisted_at = {}
+        if persisted_from is not None:
+            persisted_at["$gte"] = self._to_datetime(persisted_from)
+        if persisted_to is not None:
+            persisted_at["$lt"] = self._to_datetime(persisted_to)
+        if persisted_at:
+            query["persisted_at"] = persisted_at
+
+        event_date = {}
+        if event_date_from is not None:
+            event_date["$gte"] = event_date_from.isoformat()
+        if event_date_to is not None:
+            event_date["$lte"] = event_date_to.isoformat()
+        if event_date:
+            # both bounds apply to the same event
+            query["timeline"] = {"$elemMatch": {"event_date": event_date}}
+
+        if evidence_name:
+            query["evidence.evidence_name"] = evidence_name
+
+        if after is not None:
+            after_persisted_at, after_case_id = self._to_datetime(after[0]), after[1]
+            query["$or"] = [
+                {"persisted_at": {"$lt": after_persisted_at}},
+                {"persisted_at": after_persisted_at, "case_id": {"$lt": after_case_id}}
+            ]
+        return query
+
+    async def find_cases_async(
+        self,
+        persisted_from: datetime.datetime | None = None,
+        persisted_to: datetime.datetime | None = None,
+        event_date_from: datetime.date | None = None,
+        event_date_to: datetime.date | None = None,
+        evidence_name: str | None = None,
+        after: tuple[str, str] | None = None,
+        limit: int = 20,
+        summary_only: bool = True
+    ) -> list[dict]:
+        """Lists the cases newest first, a page at a time, using the persisted_at/case_id index."""
+        query = self._build_cases_query(persisted_from, persisted_to, event_date_from, event_date_to, evidence_name, after)
+        try:
+            cursor = self.async_collection.find(
+                query,
+                SUMMARY_PROJECTION if summary_only else FULL_PROJECTION
+            ).sort([("persisted_at", DESCENDING), ("case_id", DESCENDING)]).limit(limit)
+            cases = await cursor.to_list(length=limit)
+        except Exception as e:
+            self.logger.error(f"Failed to list cases with query {query}: {e}")
+            raise
+        return [self._to_case_data(data) for data in cases]
+
+    async def _migrate_persisted_at_async(self) -> None:
+        """Converts the persisted_at stored as json strings (before it was stored as a date) into BSON dates"""
+        result = await self.async_collection.update_many(
+            {"persisted_at": {"$type": "string"}},
+            [{"$set": {"persisted_at": {"$toDate": "$persisted_at"}}}]
+        )
+        if result.modified_count:
+            self.logger.info(f"Converted the persisted_at of {result.modified_count} cases into dates")
+
+    async def ensure_indexes_async(self) -> None:
+        """Converts the cases stored before the current format and creates the indexes of the process_data collection, once per process."""
+        if self._indexes_ensured:
+            return
+        try:
+            await self._migrate_persisted_at_async()
+            await self.async_collection.create_indexes(PROCESS_DATA_INDEXES)
+            self._indexes_ensured = True
+            self.logger.info("MongoDB indexes ensured")
+        except Exception as e:
+            self.logger.error(f"Failed to create MongoDB indexes: {e}")
+            raise
+
+    async def save_job_async(self, job_id: str, data: dict) -> None:
+        """Upserts the state of an extraction job, the job_id is used as the document _id."""
+        try:
+            await self.async_jobs_collection.update_one(
+                {"_id": job_id},
+                {"$set": data},
+                upsert=True
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to save job {job_id}: {e}")
+            raise
+
+    async def find_job_async(self, job_id: str) -> dict | None:
+        """Finds the state of an extraction job."""
+        try:
+            job = await self.async_jobs_collection.find_one({"_id": job_id})
+        except Exception as e:
+            self.logger.error(f"Failed to find job {job_id}: {e}")
+            raise
+        if job is not None:
+            job["job_id"] = job.pop("_id")
+        return job
\ No newline at end of file
@@ -0,0 +1,180 @@
+import bisect
+import json
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from src.domain.ports.metrics_recorder_interface import IMetricsRecorder
+from src.infrastruture.configs.app_config import settings
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+BYTES_BUCKETS = (10_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000, 25_000_000, 50_000_000, 100_000_000)
+COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# metrics of the request being handled, shared with the tasks and threads it starts
+_request_metrics: ContextVar[dict | None] = ContextVar("request_metrics", default=None)
+
+
+def _get_buckets(name: str) -> tuple:
+    if name.endswith("_seconds"):
+        return SECONDS_BUCKETS
+    if name.endswith("_bytes"):
+        return BYTES_BUCKETS
+    return COUNT_BUCKETS
+
+
+def _get_unit(name: str) -> str:
+    if name.endswith("_seconds"):
+        return "Seconds"
+    if name.endswith("_bytes"):
+        return "Bytes"
+    return "Count"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple, extra: str = "") -> str:
+    pairs = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class PrometheusMetricsRecorder(IMetricsRecorder):
+    """
+    In-process counters, gauges and histograms rendered in the Prometheus text format, and
+    per-request metrics published as CloudWatch embedded metric format (EMF) logs.
+
+    The registry is per process: behind a load balancer each instance is scraped, on Lambda
+    each container has its own registry, so the EMF logs are the source of the metrics there.
+    """
+    def __init__(self, emf_enabled: bool = False, emf_namespace: str = "ProcessDataExtract"):
+        self.emf_enabled = emf_enabled
+        self.emf_namespace = emf_namespace
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._gauges: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], dict] = {}
+        self._lock = threading.Lock()
+
+    def _get_series_key(self, name: str, labels: dict[str, str] | None) -> tuple[str, tuple]:
+        return name, tuple(sorted((labels or {}).items()))
+
+    def _add_to_request(self, name: str, value: float, labels: dict[str, str] | None) -> None:
+        request_metrics = _request_metrics.get()
+        if request_metrics is None:
+            return
+        key = "_".join([name, *[str(label_value) for _, label_value in sorted((labels or {}).items())]])
+        key = re.sub(r"[^a-zA-Z0-9_]", "_", key)
+        request_metrics[key] = request_metrics.get(key, 0) + value
+
+    def increment(self, name: str, amount: float = 1.0, labels: dict[str, str] | None = None) -> None:
+        series_key = self._get_series_key(name, labels)
+        with self._lock:
+            self._counters[series_key] = self._counters.get(series_key, 0) + amount
+        self._add_to_request(name, amount, labels)
+
+    def observe(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
+        series_key = self._get_series_key(name, labels)
+        buckets = _get_buckets(name)
+        with self._lock:
+            histogram = self._histograms.get(series_key)
+            if histogram is None:
+                histogram = {"buckets": buckets, "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+                self._histograms[series_key] = histogram
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                histogram["counts"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+        self._add_to_request(name, value, labels)
+
+    def set_gauge(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
+        with self._lock:
+            self._gauges[self._get_series_key(name, labels)] = value
+
+    @contextmanager
+    def time(self, name: str, labels: dict[str, str] | None = None):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started_at, labels)
+
+    @contextmanager
+    def request(self, operation: str):
+        request_metrics = {}
+        token = _request_metrics.set(request_metrics)
+        started_at = time.perf_counter()
+        try:
+            yield request_metrics
+        finally:
+            _request_metrics.reset(token)
+            request_metrics["request_seconds"] = time.perf_counter() - started_at
+            if self.emf_enabled:
+                self._publish_emf(operation, request_metrics)
+
+    def _publish_emf(self, operation: str, request_metrics: dict) -> None:
+        """Writes the request metrics to stdout in the embedded metric format, CloudWatch extracts them from the logs"""
+        document = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": self.emf_namespace,
+                    "Dimensions": [["operation"]],
+                    "Metrics": [{"Name": name, "Unit": _get_unit(name)} for name in request_metrics]
+                }]
+            },
+            "operation": operation,
+            **request_metrics
+        }
+        # a raw json line, the log formatter prefix would keep cloudwatch from parsing it
+        sys.stdout.write(json.dumps(document) + "\n")
+        sys.stdout.flush()
+
+    def render(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {key: {**value, "counts": list(value["counts"])} for key, value in self._histograms.items()}
+
+        lines = []
+        for metric_type, series in (("counter", counters), ("gauge", gauges)):
+            for name in sorted({name for name, _ in series}):
+                lines.append(f"# TYPE {name} {metric_type}")
+                for (series_name, labels), value in sorted(series.items()):
+                    if series_name == name:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name in sorted({name for name, _ in histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (series_name, labels), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+                if series_name != name:
+                    continue
+                cumulative = 0
+                for bucket, count in zip(histogram["buckets"], histogram["counts"]):
+                    cumulative += count
+                    le = f'le="{bucket}"'
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                le = 'le="+Inf"'
+                lines.append(f"{name}_bucket{_format_labels(labels, le)} {histogram['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=1)
+def get_metrics_recorder() -> PrometheusMetricsRecorder:
+    """Returns the process-wide metrics recorder, shared by the components and the /metrics endpoint"""
+    return PrometheusMetricsRecorder(
+        emf_enabled=settings.METRICS_EMF_ENABLED,
+        emf_namespace=settings.METRICS_NAMESPACE
+    )
@@ -0,0 +1,66 @@
+import hashlib
+import io
+import logging
+from pypdf import PdfReader, PdfWriter
+from src.domain.entities.pdf_document_entity import PdfDocument, PdfPage
+from src.domain.ports.pdf_processor_interface import IPdfProcessor
+
+
+class PyPdfProcessor(IPdfProcessor):
+    """Implementation of the local PDF processing using pypdf"""
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def count_pages(self, pdf_binary: bytes) -> int:
+        return len(PdfReader(io.BytesIO(pdf_binary)).pages)
+
+    def read_pages(self, pdf_binary: bytes, min_text_chars: int = 20) -> PdfDocument:
+        reader = PdfReader(io.BytesIO(pdf_binary))
+        pages = []
+        for page_index, page in enumerate(reader.pages):
+            try:
+                text = page.extract_text() or ""
+            except Exception as e:
+                # a broken content stream only loses the text of its page
+                self.logger.warning(f"Failed to read the text of page {page_index + 1}: {e}")
+                text = ""
+            pages.append(PdfPage(
+                page_number=page_index + 1,
+                text=text,
+                is_scanned=len(text.strip()) < min_text_chars
+            ))
+        document = PdfDocument(page_count=len(pages), pages=pages)
+        self.logger.info(f"Read the text of {document.page_count} pages, {document.scanned_page_count} scanned")
+        return document
+
+    def hash_pages(self, pdf_binary: bytes) -> list[str]:
+        # the drawing operators and the images/forms they draw, not the object numbers that change when the file is rewritten
+        reader = PdfReader(io.BytesIO(pdf_binary))
+        page_hashes = []
+        for page in reader.pages:
+            digest = hashlib.sha256()
+            contents = page.get_contents()
+            if contents is not None:
+                digest.update(contents.get_data())
+            resources = page.get("/Resources")
+            xobjects = resources.get_object().get("/XObject") if resources is not None else None
+            if xobjects is not None:
+                xobjects = xobjects.get_object()
+                for name in sorted(xobjects):
+                    digest.update(name.encode("utf-8"))
+                    digest.update(xobjects[name].get_object().get_data())
+            page_hashes.append(digest.hexdigest())
+        return page_hashes
+
+    def split(self, pdf_binary: bytes, page_ranges: list[tuple[int, int]]) -> list[bytes]:
+        reader = PdfReader(io.BytesIO(pdf_binary))
+        documents = []
+        for page_init, page_end in page_ranges:
+            writer = PdfWriter()
+            for page_index in range(page_init - 1, page_end):
+                writer.add_page(reader.pages[page_index])
+            output = io.BytesIO()
+            writer.write(output)
+            documents.append(output.getvalue())
+        self.logger.info(f"Split PDF into {len(documents)} documents")
+        return documents
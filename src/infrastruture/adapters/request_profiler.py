@@ -0,0 +1,44 @@
+import cProfile
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+
+class RequestProfiler:
+    """
+    Profiles single requests with cProfile and writes the stats to a .prof file (open it with
+    snakeviz or pstats). One request is profiled at a time, the others run unprofiled.
+
+    The profiler follows the thread of the event loop: work moved to worker threads is not in the
+    stats, and the tasks of concurrent requests are, so profile with low concurrency.
+    """
+    def __init__(self, output_dir: str):
+        self.logger = logging.getLogger(__name__)
+        self.output_dir = output_dir
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile(self, name: str):
+        """Profiles the block, yields the path of the stats file or None if another profile is running"""
+        if not self._lock.acquire(blocking=False):
+            yield None
+            return
+        file_name = re.sub(r"[^a-zA-Z0-9_.-]", "_", f"{time.strftime('%Y%m%dT%H%M%S')}-{name}") + ".prof"
+        path = os.path.join(self.output_dir, file_name)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            yield path
+        finally:
+            profiler.disable()
+            try:
+                os.makedirs(self.output_dir, exist_ok=True)
+                profiler.dump_stats(path)
+                self.logger.info(f"Request profile written to {path}")
+            except OSError as e:
+                self.logger.error(f"Failed to write the request profile: {e}")
+            finally:
+                self._lock.release()
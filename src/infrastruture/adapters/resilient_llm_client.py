@@ -0,0 +1,356 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import aclosing
+import httpx
+from tenacity import AsyncRetrying, Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+from src.domain.ports.llm_client_interface import ILlmClient
+from src.infrastruture.adapters.llm_call_usage import track_call_tokens
+
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while the circuit breaker is open"""
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Returns True for the errors worth retrying: rate limits, provider overload, timeouts and network failures"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if getattr(error, "code", None) in TRANSIENT_STATUS_CODES:
+        return True
+    return isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError, httpx.TimeoutException, httpx.TransportError))
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at capacity per minute"""
+    def __init__(self, capacity_per_minute: int):
+        self.capacity = float(capacity_per_minute)
+        self.tokens = float(capacity_per_minute)
+        self.refill_rate = capacity_per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, amount: float) -> float:
+        """Takes the tokens and returns 0, or returns the seconds to wait before retrying without taking them"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+            self.updated_at = now
+            # a request larger than the bucket waits for a full bucket
+            amount = min(amount, self.capacity)
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.refill_rate
+
+    def peek(self, amount: float) -> float:
+        """Returns the seconds to wait before the tokens are available, without taking them"""
+        with self._lock:
+            tokens = min(self.capacity, self.tokens + (time.monotonic() - self.updated_at) * self.refill_rate)
+            return max(0.0, (min(amount, self.capacity) - tokens) / self.refill_rate)
+
+    def release(self, amount: float) -> None:
+        """Gives back tokens taken for a call that was not made"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def charge(self, amount: float) -> None:
+        """Takes tokens used beyond what was acquired, the bucket may go below zero and delay the next calls"""
+        with self._lock:
+            now = time.monotonic()
+            # refilled first, the refill is capped at capacity and would cancel the charge
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate) - amount
+            self.updated_at = now
+
+
+class CircuitBreaker:
+    """Opens after consecutive transient failures, then lets a single trial call through after reset_seconds"""
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """Tells whether calls are rejected now, without moving to half open"""
+        with self._lock:
+            return self.state == "open" and time.monotonic() - self.opened_at < self.reset_seconds
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            now = time.monotonic()
+            if self.state == "open" and now - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self.trial_started_at = now
+                return
+            # a trial that never reported its outcome does not block the calls for good
+            if self.state == "half_open" and now - self.trial_started_at >= self.reset_seconds:
+                self.trial_started_at = now
+                return
+            raise CircuitOpenError("LLM provider circuit is open, failing fast")
+
+    def release_trial(self) -> None:
+        """Ends a call cancelled before its outcome, neither a success nor a failure: the next call may be the trial"""
+        with self._lock:
+            if self.state == "half_open":
+                self.trial_started_at = 0.0
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class ResilientLlmClient(ILlmClient):
+    """
+    Policy layer around an LLM client: a shared requests/tokens per minute limiter, retries with
+    exponential backoff and jitter for transient errors, per-call deadlines and a circuit breaker.
+    """
+    def __init__(
+        self,
+        llm_client: ILlmClient,
+        requests_per_minute: int = 150,
+        tokens_per_minute: int = 4_000_000,
+        estimated_tokens_per_request: int = 20_000,
+        max_retries: int = 3,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 30.0,
+        call_timeout_seconds: float = 120.0,
+        circuit_failure_threshold: int = 5,
+        circuit_reset_seconds: float = 30.0
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.llm_client = llm_client
+        self.requests_bucket = TokenBucket(requests_per_minute)
+        self.tokens_bucket = TokenBucket(tokens_per_minute)
+        self.estimated_tokens_per_request = estimated_tokens_per_request
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.call_timeout_seconds = call_timeout_seconds
+        self.circuit_breaker = CircuitBreaker(circuit_failure_threshold, circuit_reset_seconds)
+        self._counters_lock = threading.Lock()
+        self.counters = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "throttled": 0,
+            "circuit_rejections": 0
+        }
+
+    def _count(self, name: str) -> None:
+        with self._counters_lock:
+            self.counters[name] += 1
+
+    def stats(self) -> dict:
+        with self._counters_lock:
+            return {**self.counters, "circuit_state": self.circuit_breaker.state}
+
+    def _retry_policy(self) -> dict:
+        return {
+            "retry": retry_if_exception(is_transient_error),
+            "wait": wait_random_exponential(multiplier=self.retry_base_seconds, max=self.retry_max_seconds),
+            "stop": stop_after_attempt(self.max_retries + 1),
+            "before_sleep": self._log_retry,
+            "reraise": True
+        }
+
+    def _log_retry(self, retry_state) -> None:
+        self._count("retries")
+        self.logger.warning(
+            f"Transient LLM error, retrying (attempt {retry_state.attempt_number}): {retry_state.outcome.exception()!r}"
+        )
+
+    def is_saturated(self) -> bool:
+        """Tells whether a call made now would be rejected by the circuit breaker or wait for the rate limits"""
+        if self.circuit_breaker.is_open():
+            return True
+        return self.requests_bucket.peek(1) > 0 or self.tokens_bucket.peek(self.estimated_tokens_per_request) > 0
+
+    def _next_wait(self) -> float:
+        """
+        Returns 0 when a request and its estimated tokens were taken from the limiters, or the seconds to wait.
+        The estimate is replaced by the actual usage of the call once it is known.
+        """
+        wait = self.requests_bucket.try_acquire(1)
+        if wait > 0:
+            return wait
+        wait = self.tokens_bucket.try_acquire(self.estimated_tokens_per_request)
+        if wait > 0:
+            # give the request slot back, the call is not made yet
+            self.requests_bucket.release(1)
+        return wait
+
+    def _reconcile_tokens(self, call_tokens: list[int]) -> None:
+        """
+        Replaces the estimate taken for a call by the tokens its responses reported. A call without a
+        reported usage (failed, or a provider without usage metadata) keeps the estimate.
+        """
+        if not call_tokens:
+            return
+        difference = sum(call_tokens) - self.estimated_tokens_per_request
+        if difference > 0:
+            self.tokens_bucket.charge(difference)
+        elif difference < 0:
+            self.tokens_bucket.release(-difference)
+
+    def _before_call(self) -> None:
+        try:
+            self.circuit_breaker.before_call()
+        except CircuitOpenError:
+            self._count("circuit_rejections")
+            raise
+        self._count("calls")
+
+    def _cancel_call(self) -> None:
+        # cancelled (client gone, deadline of the caller, shutdown): the provider gave no answer to count
+        self.circuit_breaker.release_trial()
+
+    def _after_call(self, error: BaseException | None) -> None:
+        if error is None:
+            self._count("successes")
+            self.circuit_breaker.record_success()
+            return
+        self._count("failures")
+        if is_transient_error(error):
+            self.circuit_breaker.record_failure()
+        else:
+            # the provider answered, the error is in the request or the response content
+            self.circuit_breaker.record_success()
+
+    def _call(self, function, *args):
+        for attempt in Retrying(**self._retry_policy()):
+            with attempt:
+                self._before_call()
+                # the per-call deadline of sync calls is the http timeout of the provider client
+                call_tokens = []
+                try:
+                    while (wait := self._next_wait()) > 0:
+                        self._count("throttled")
+                        time.sleep(wait)
+                    with track_call_tokens(call_tokens):
+                        result = function(*args)
+                except Exception as e:
+                    self._after_call(e)
+                    raise
+                except BaseException:
+                    self._cancel_call()
+                    raise
+                finally:
+                    self._reconcile_tokens(call_tokens)
+                self._after_call(None)
+        return result
+
+    async def _call_async(self, function, *args):
+        async for attempt in AsyncRetrying(**self._retry_policy()):
+            with attempt:
+                self._before_call()
+                call_tokens = []
+                try:
+                    while (wait := self._next_wait()) > 0:
+                        self._count("throttled")
+                        await asyncio.sleep(wait)
+                    with track_call_tokens(call_tokens):
+                        result = await asyncio.wait_for(function(*args), timeout=self.call_timeout_seconds)
+                except Exception as e:
+                    self._after_call(e)
+                    raise
+                except BaseException:
+                    self._cancel_call()
+                    raise
+                finally:
+                    self._reconcile_tokens(call_tokens)
+                self._after_call(None)
+        return result
+
+    async def _stream_async(self, function, *args):
+        """
+        Streams the fragments of a call under the same policy. A failed stream is retried only
+        before its first fragment, the fragments already handed to the caller can not be taken
+        back; the deadline applies to the wait for each fragment.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_call()
+            streamed = False
+            call_tokens = []
+            fragments = function(*args)
+            try:
+                while (wait := self._next_wait()) > 0:
+                    self._count("throttled")
+                    await asyncio.sleep(wait)
+                while True:
+                    try:
+                        # set around each wait only, the caller handles the fragments in its own context
+                        with track_call_tokens(call_tokens):
+                            fragment = await asyncio.wait_for(anext(fragments), timeout=self.call_timeout_seconds)
+                    except StopAsyncIteration:
+                        break
+                    streamed = True
+                    yield fragment
+            except Exception as e:
+                self._after_call(e)
+                if streamed or not is_transient_error(e) or attempt > self.max_retries:
+                    raise
+                self._count("retries")
+                self.logger.warning(f"Transient LLM error before the first fragment, retrying (attempt {attempt}): {e!r}")
+                await asyncio.sleep(random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt)))
+                continue
+            except BaseException:
+                # also GeneratorExit, when the consumer stops reading the stream
+                self._cancel_call()
+                raise
+            finally:
+                await fragments.aclose()
+                self._reconcile_tokens(call_tokens)
+            self._after_call(None)
+            return
+
+    def extract_data_from_pdf(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        return self._call(self.llm_client.extract_data_from_pdf, pdf_binary, page_count)
+
+    async def extract_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        return await self._call_async(self.llm_client.extract_data_from_pdf_async, pdf_binary, page_count)
+
+    def extract_data_from_text(self, document_text: str) -> dict:
+        return self._call(self.llm_client.extract_data_from_text, document_text)
+
+    async def extract_data_from_text_async(self, document_text: str) -> dict:
+        return await self._call_async(self.llm_client.extract_data_from_text_async, document_text)
+
+    async def stream_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None):
+        async with aclosing(self._stream_async(self.llm_client.stream_data_from_pdf_async, pdf_binary, page_count)) as fragments:
+            async for fragment in fragments:
+                yield fragment
+
+    async def stream_data_from_text_async(self, document_text: str):
+        async with aclosing(self._stream_async(self.llm_client.stream_data_from_text_async, document_text)) as fragments:
+            async for fragment in fragments:
+                yield fragment
+
+    async def extract_chunk_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        return await self._call_async(self.llm_client.extract_chunk_data_from_pdf_async, pdf_binary, page_count)
+
+    async def generate_resume_async(self, data: dict) -> str:
+        return await self._call_async(self.llm_client.generate_resume_async, data)
+
+    def get_fingerprint(self) -> str:
+        return self.llm_client.get_fingerprint()
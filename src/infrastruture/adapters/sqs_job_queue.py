@@ -0,0 +1,49 @@
+import asyncio
+import json
+import logging
+from src.domain.ports.job_queue_interface import IJobQueue
+
+
+class SQSJobQueue(IJobQueue):
+    """Implementation of the job queue using Amazon SQS (or an SQS-compatible endpoint like localstack)"""
+    def __init__(self, queue_url: str, region_name: str, endpoint_url: str | None = None):
+        self.logger = logging.getLogger(__name__)
+        try:
+            # boto3 is provided by the lambda runtime, install it for local runs
+            import boto3
+        except ImportError as e:
+            raise ImportError("The 'sqs' job queue backend requires boto3 (pip install boto3)") from e
+
+        if not queue_url:
+            raise ValueError("JOB_QUEUE_URL must be set for the 'sqs' job queue backend")
+
+        self.queue_url = queue_url
+        self.client = boto3.client("sqs", region_name=region_name, endpoint_url=endpoint_url or None)
+
+    async def enqueue(self, message: dict) -> None:
+        # boto3 is blocking, the calls run in a worker thread
+        await asyncio.to_thread(
+            self.client.send_message,
+            QueueUrl=self.queue_url,
+            MessageBody=json.dumps(message)
+        )
+        self.logger.info(f"Job {message.get('job_id')} sent to SQS")
+
+    async def dequeue(self, wait_seconds: int) -> tuple[str, dict] | None:
+        response = await asyncio.to_thread(
+            self.client.receive_message,
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=1,
+            WaitTimeSeconds=min(wait_seconds, 20)
+        )
+        messages = response.get("Messages", [])
+        if not messages:
+            return None
+        return messages[0]["ReceiptHandle"], json.loads(messages[0]["Body"])
+
+    async def ack(self, receipt: str) -> None:
+        await asyncio.to_thread(
+            self.client.delete_message,
+            QueueUrl=self.queue_url,
+            ReceiptHandle=receipt
+        )
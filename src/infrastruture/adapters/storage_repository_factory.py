@@ -0,0 +1,21 @@
+from typing import TYPE_CHECKING
+from src.domain.ports.storage_repository_interface import IStorageRepository
+from src.infrastruture.configs.app_config import settings
+
+if TYPE_CHECKING:
+    from pymongo import AsyncMongoClient, MongoClient
+
+
+def build_storage_repository(
+    mongo_client: "MongoClient | None" = None,
+    async_mongo_client: "AsyncMongoClient | None" = None
+) -> IStorageRepository:
+    """Builds the storage repository selected by STORAGE_LAYOUT ('embedded' or 'normalized')"""
+    layout = settings.STORAGE_LAYOUT.lower()
+    if layout == "embedded":
+        from src.infrastruture.adapters.mongodb_repository import MongoDBRepository
+        return MongoDBRepository(client=mongo_client, async_client=async_mongo_client)
+    if layout == "normalized":
+        from src.infrastruture.adapters.mongodb_normalized_repository import MongoDBNormalizedRepository
+        return MongoDBNormalizedRepository(client=mongo_client, async_client=async_mongo_client)
+    raise ValueError(f"Unknown storage layout '{layout}'")
@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from src.domain.ports.llm_client_interface import ILlmClient
+
+
+class StubLlmError(Exception):
+    """Injected provider failure, the 503 code makes it a transient error for the policy layer"""
+    code = 503
+
+
+class StubLlmClient(ILlmClient):
+    """
+    Local provider answering without any API call, for running and testing the routing without keys.
+
+    Returns a valid extraction (one event and one evidence spanning the document) after a latency
+    of latency_seconds plus seconds_per_page for each page, and fails with error_rate.
+    """
+    def __init__(self, model_name: str = "stub", latency_seconds: float = 0.1, seconds_per_page: float = 0.0, error_rate: float = 0.0):
+        self.logger = logging.getLogger(__name__)
+        self.model_name = model_name
+        self.latency_seconds = latency_seconds
+        self.seconds_per_page = seconds_per_page
+        self.error_rate = error_rate
+
+    def _count_text_pages(self, document_text: str) -> int:
+        return max(1, len(re.findall(r"<page number=", document_text)))
+
+    def _count_pdf_pages(self, pdf_binary: bytes, page_count: int | None = None) -> int:
+        if page_count:
+            return page_count
+        # a rough count from the page objects, enough for a stub
+        return max(1, len(re.findall(rb"/Type\s*/Page(?!s)", pdf_binary)))
+
+    def _next_delay(self, page_count: int) -> float:
+        if random.random() < self.error_rate:
+            raise StubLlmError(f"503 UNAVAILABLE (injected by the stub provider {self.model_name})")
+        return self.latency_seconds + self.seconds_per_page * page_count
+
+    def _build_extraction(self, page_count: int) -> dict:
+        return {
+            "resume": f"Stub extraction of a document of {page_count} pages by {self.model_name}.",
+            "timeline": [{
+                "event_id": 0,
+                "event_name": "Documento",
+                "event_description": f"Document of {page_count} pages.",
+                "event_date": "1970-01-01",
+                "event_page_init": 1,
+                "event_page_end": page_count
+            }],
+            "evidence": [{
+                "evidence_id": 0,
+                "evidence_name": "Documento",
+                "evidence_flaw": "Sem inconsistências",
+                "evidence_page_init": 1,
+                "evidence_page_end": page_count
+            }]
+        }
+
+    async def _stream_extraction(self, page_count: int, fragments: int = 10):
+        delay = self._next_delay(page_count) / fragments
+        text = json.dumps(self._build_extraction(page_count), ensure_ascii=False)
+        size = -(-len(text) // fragments)
+        for start in range(0, len(text), size):
+            await asyncio.sleep(delay)
+            yield text[start:start + size]
+
+    def extract_data_from_pdf(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        page_count = self._count_pdf_pages(pdf_binary, page_count)
+        time.sleep(self._next_delay(page_count))
+        return self._build_extraction(page_count)
+
+    async def extract_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        page_count = self._count_pdf_pages(pdf_binary, page_count)
+        await asyncio.sleep(self._next_delay(page_count))
+        return self._build_extraction(page_count)
+
+    def extract_data_from_text(self, document_text: str) -> dict:
+        page_count = self._count_text_pages(document_text)
+        time.sleep(self._next_delay(page_count))
+        return self._build_extraction(page_count)
+
+    async def extract_data_from_text_async(self, document_text: str) -> dict:
+        page_count = self._count_text_pages(document_text)
+        await asyncio.sleep(self._next_delay(page_count))
+        return self._build_extraction(page_count)
+
+    async def stream_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None):
+        async for fragment in self._stream_extraction(self._count_pdf_pages(pdf_binary, page_count)):
+            yield fragment
+
+    async def stream_data_from_text_async(self, document_text: str):
+        async for fragment in self._stream_extraction(self._count_text_pages(document_text)):
+            yield fragment
+
+    async def extract_chunk_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        page_count = self._count_pdf_pages(pdf_binary, page_count)
+        await asyncio.sleep(self._next_delay(page_count))
+        data = self._build_extraction(page_count)
+        return {"timeline": data["timeline"], "evidence": data["evidence"]}
+
+    async def generate_resume_async(self, data: dict) -> str:
+        await asyncio.sleep(self._next_delay(1))
+        return f"Stub resume of {len(data.get('timeline') or [])} events and {len(data.get('evidence') or [])} evidence by {self.model_name}."
+
+    def get_fingerprint(self) -> str:
+        return hashlib.sha256(f"stub\n{self.model_name}".encode("utf-8")).hexdigest()
@@ -9,6 +9,107 @@ class Settings(BaseSettings):
     GEMINI_MODEL_NAME: str = "gemini-2.0-flash"
     MONGODB_URI: str = "mongodb://localhost:27017/"
     MONGODB_DB_NAME: str = "process_data_db"
+    # "embedded" keeps timeline and evidence in the case document, "normalized" in their own collections
+    STORAGE_LAYOUT: str = "embedded"
+
+    # connection pools shared by the process-wide clients
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    MONGODB_MAX_POOL_SIZE: int = 50
+    MONGODB_MIN_POOL_SIZE: int = 0
+
+    # extraction jobs queue: "memory" or "sqs"
+    JOB_QUEUE_BACKEND: str = "memory"
+    JOB_QUEUE_URL: str = ""
+    JOB_QUEUE_REGION: str = "us-east-1"
+    JOB_QUEUE_ENDPOINT_URL: str = ""
+    JOB_QUEUE_WAIT_SECONDS: int = 20
+    # number of workers consuming the queue in the api process, 0 disables them
+    JOB_WORKERS: int = 4
+
+    # pdf download
+    PDF_MAX_SIZE_BYTES: int = 50 * 1024 * 1024
+    DOWNLOAD_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    DOWNLOAD_READ_TIMEOUT_SECONDS: float = 30.0
+    DOWNLOAD_CHUNK_SIZE_BYTES: int = 64 * 1024
+
+    # registry of the files uploaded to gemini: "memory", "mongodb" or "none"
+    GEMINI_FILE_REGISTRY_BACKEND: str = "memory"
+    # lifetime assumed when the api does not return the expiration (gemini keeps files for 48h)
+    GEMINI_FILE_TTL_SECONDS: int = 47 * 3600
+    GEMINI_FILE_MAX_IDLE_SECONDS: int = 6 * 3600
+    # 0 disables the background sweeper
+    GEMINI_FILE_SWEEP_INTERVAL_SECONDS: int = 600
+
+    # context cache of the system prompts, prompts under the model minimum (about 1024 tokens for the flash
+    # models, 4096 for pro) are sent inline. The built-in prompts are under it, the cache is for longer ones
+    GEMINI_PROMPT_CACHE_ENABLED: bool = False
+    GEMINI_PROMPT_CACHE_MIN_TOKENS: int = 1024
+    GEMINI_PROMPT_CACHE_TTL_SECONDS: int = 3600
+
+    # metrics: per-request cloudwatch embedded metric format logs (lambda) and profiling of single requests
+    METRICS_EMF_ENABLED: bool = False
+    METRICS_NAMESPACE: str = "ProcessDataExtract"
+    PROFILING_ENABLED: bool = False
+    PROFILING_OUTPUT_DIR: str = "/tmp/profiles"
+
+    # llm call policy: rate limits, retries, deadline and circuit breaker
+    LLM_REQUESTS_PER_MINUTE: int = 150
+    LLM_TOKENS_PER_MINUTE: int = 4_000_000
+    LLM_ESTIMATED_TOKENS_PER_REQUEST: int = 20_000
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SECONDS: float = 1.0
+    LLM_RETRY_MAX_SECONDS: float = 30.0
+    LLM_CALL_TIMEOUT_SECONDS: float = 120.0
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # routing of each document to a model by its page count, with failover to the next route.
+    # Routes fitting a document (max_pages, 0 for any size) are tried from the lowest cost_per_page,
+    # the saturated ones and the ones over their p95 latency_budget_seconds last. provider: "gemini" or "stub"
+    LLM_ROUTING_ENABLED: bool = False
+    LLM_ROUTES: list[dict] = [
+        {"name": "flash-lite", "provider": "gemini", "model": "gemini-2.0-flash-lite", "max_pages": 30, "cost_per_page": 0.25, "latency_budget_seconds": 30},
+        {"name": "flash", "provider": "gemini", "model": "gemini-2.0-flash", "max_pages": 150, "cost_per_page": 1.0, "latency_budget_seconds": 90},
+        {"name": "pro", "provider": "gemini", "model": "gemini-2.5-pro", "max_pages": 0, "cost_per_page": 5.0}
+    ]
+
+    # local pre-processing of the pdf: page count (page ranges returned by the llm are clamped to it)
+    # and text mode, sending the page-tagged text layer instead of the pdf when few pages are scanned
+    PDF_PREPROCESSING_ENABLED: bool = True
+    PDF_TEXT_MODE_ENABLED: bool = False
+    PDF_SCANNED_PAGE_MIN_CHARS: int = 20
+    PDF_TEXT_MODE_MAX_SCANNED_RATIO: float = 0.1
+    PDF_TEXT_MODE_MAX_CHARS: int = 2_000_000
+
+    # chunked extraction of large documents (N+1 llm calls with another prompt), only on the async paths
+    CHUNKED_EXTRACTION_ENABLED: bool = False
+    CHUNKED_EXTRACTION_MIN_PAGES: int = 100
+    CHUNK_PAGES: int = 40
+    CHUNK_OVERLAP_PAGES: int = 2
+    CHUNK_MAX_PARALLEL: int = 4
+
+    # incremental re-extraction: the page hashes are stored with the case, a document that comes back with
+    # new pages at its end only has these pages extracted (in chunks of CHUNK_PAGES) and merged into the case.
+    # Applies to /extract, /extract/stream, /extract/batch and the jobs, the sync service path extracts it all
+    INCREMENTAL_EXTRACTION_ENABLED: bool = False
+
+    # batch extraction limits
+    BATCH_MAX_ITEMS: int = 50
+    BATCH_MAX_PARALLEL_DOWNLOADS: int = 8
+    BATCH_MAX_PARALLEL_EXTRACTIONS: int = 4
+
+    # extraction cache: "memory", "mongodb" or "none"
+    EXTRACTION_CACHE_BACKEND: str = "memory"
+    EXTRACTION_CACHE_MAX_SIZE: int = 128
+    EXTRACTION_CACHE_TTL_SECONDS: int = 86400
+
+    # cross-instance coalescing of the extractions: "mongodb" (requires the mongodb extraction cache) or "none"
+    EXTRACTION_LEASE_BACKEND: str = "none"
+    # above the duration of an extraction, a crashed owner blocks its document for this time at most
+    EXTRACTION_LEASE_TTL_SECONDS: int = 600
+    EXTRACTION_LEASE_WAIT_SECONDS: int = 600
+    EXTRACTION_LEASE_POLL_SECONDS: float = 2.0
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -0,0 +1,273 @@
+import logging
+import threading
+from src.application.services.extraction_job_worker_pool import ExtractionJobWorkerPool
+from src.application.use_cases.case_query_use_case import CaseQueryUseCase
+from src.application.use_cases.extract_process_data_batch_use_case import ProcessDataBatchUseCase
+from src.application.use_cases.extract_process_data_use_case import ProcessDataUseCase
+from src.application.use_cases.extraction_job_use_case import ExtractionJobUseCase
+from src.infrastruture.adapters.extraction_cache_factory import build_extraction_cache
+from src.infrastruture.adapters.extraction_lease_factory import build_extraction_lease
+from src.infrastruture.adapters.job_queue_factory import build_job_queue
+from src.infrastruture.adapters.file_registry_factory import build_file_registry
+from src.infrastruture.adapters.llm_router_factory import build_llm_router, build_resilient_llm_client
+from src.infrastruture.adapters.prometheus_metrics_recorder import get_metrics_recorder
+from src.infrastruture.adapters.storage_repository_factory import build_storage_repository
+from src.infrastruture.configs.app_config import settings
+
+
+class Container:
+    """
+    Holds the process-wide clients and their connection pools.
+
+    The clients are built once and shared by every request, so the HTTP, Gemini and MongoDB
+    connections (and the pymongo monitor threads) are reused across requests and across warm
+    Lambda invocations instead of being created and leaked per request.
+
+    Each client is built, and its SDK imported, on first use: a cold start only pays for the
+    clients of the route it serves (e.g. /cases never imports the Gemini SDK).
+    """
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        # reentrant, building a client may build the clients it depends on
+        self._lock = threading.RLock()
+        self._clients = {}
+
+        # process-wide, the /metrics endpoint renders it
+        self.metrics_recorder = get_metrics_recorder()
+
+        self._process_data_use_case = None
+        self._process_data_batch_use_case = None
+        self._extraction_job_use_case = None
+        self._case_query_use_case = None
+        self._job_worker_pool = None
+        self._file_sweeper = None
+
+    def _get_or_build(self, name: str, build):
+        """Returns the named client, building it once on first use"""
+        if name not in self._clients:
+            with self._lock:
+                if name not in self._clients:
+                    self._clients[name] = build()
+                    self.logger.info(f"Container client '{name}' initialized")
+        return self._clients[name]
+
+    def is_initialized(self, name: str) -> bool:
+        """Tells whether a client was already built, without building it"""
+        return name in self._clients
+
+    @property
+    def async_http_client(self):
+        """Client of the async pdf downloads"""
+        def build():
+            import httpx
+            return httpx.AsyncClient(follow_redirects=True, limits=self._get_httpx_limits())
+        return self._get_or_build("async_http_client", build)
+
+    @property
+    def genai_client(self):
+        def build():
+            from google import genai
+            return genai.Client(
+                api_key=settings.GEMINI_API_KEY,
+                http_options={
+                    # per-call deadline of the sync calls, in milliseconds
+                    "timeout": int(settings.LLM_CALL_TIMEOUT_SECONDS * 1000),
+                    "client_args": {"limits": self._get_httpx_limits()},
+                    "async_client_args": {"limits": self._get_httpx_limits()}
+                }
+            )
+        return self._get_or_build("genai_client", build)
+
+    @property
+    def mongo_client(self):
+        def build():
+            from pymongo import MongoClient
+            return MongoClient(settings.MONGODB_URI, **self._get_mongo_options())
+        return self._get_or_build("mongo_client", build)
+
+    @property
+    def async_mongo_client(self):
+        """The async client only connects on its first operation"""
+        def build():
+            from pymongo import AsyncMongoClient
+            return AsyncMongoClient(settings.MONGODB_URI, **self._get_mongo_options())
+        return self._get_or_build("async_mongo_client", build)
+
+    @property
+    def file_registry(self):
+        """Shared by the gemini clients of every model, the uploaded files belong to the api key"""
+        return self._get_or_build("file_registry", lambda: build_file_registry(mongo_client=self.mongo_client))
+
+    @property
+    def gemini_client(self):
+        def build():
+            from src.infrastruture.adapters.gemini_client import GeminiClient
+            return GeminiClient(
+                client=self.genai_client,
+                file_registry=self.file_registry,
+                metrics_recorder=self.metrics_recorder
+            )
+        return self._get_or_build("gemini_client", build)
+
+    @property
+    def llm_client(self):
+        """
+        One policy layer for the whole process, so the rate limits are shared by all requests. With
+        LLM_ROUTING_ENABLED, a router with a policy layer per route.
+        """
+        def build():
+            if settings.LLM_ROUTING_ENABLED:
+                return build_llm_router(
+                    # the genai client is only built when a gemini route needs it
+                    genai_client=self.genai_client if self._has_gemini_route() else None,
+                    file_registry=self.file_registry,
+                    metrics_recorder=self.metrics_recorder
+                )
+            return build_resilient_llm_client(self.gemini_client)
+        return self._get_or_build("llm_client", build)
+
+    def _has_gemini_route(self) -> bool:
+        return any(route.get("provider", "gemini").lower() == "gemini" for route in settings.LLM_ROUTES)
+
+    @property
+    def extraction_cache(self):
+        return self._get_or_build("extraction_cache", lambda: build_extraction_cache(mongo_client=self.mongo_client))
+
+    @property
+    def extraction_lease(self):
+        return self._get_or_build("extraction_lease", lambda: build_extraction_lease(mongo_client=self.mongo_client))
+
+    @property
+    def job_queue(self):
+        return self._get_or_build("job_queue", build_job_queue)
+
+    @property
+    def storage_repository(self):
+        return self._get_or_build("storage_repository", lambda: build_storage_repository(
+            mongo_client=self.mongo_client,
+            async_mongo_client=self.async_mongo_client
+        ))
+
+    def _get_mongo_options(self) -> dict:
+        return {
+            "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGODB_MIN_POOL_SIZE
+        }
+
+    def _get_httpx_limits(self):
+        import httpx
+        return httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+        )
+
+    def get_process_data_use_case(self) -> ProcessDataUseCase:
+        """Returns the use case wired with the shared clients"""
+        if self._process_data_use_case is None:
+            from src.application.services.process_data_service import ProcessDataService
+            process_data_service = ProcessDataService(
+                llm_client=self.llm_client,
+                async_http_client=self.async_http_client,
+                extraction_cache=self.extraction_cache,
+                metrics_recorder=self.metrics_recorder,
+                extraction_lease=self.extraction_lease
+            )
+            self._process_data_use_case = ProcessDataUseCase(
+                process_data_service=process_data_service,
+                storage_repository=self.storage_repository,
+                metrics_recorder=self.metrics_recorder
+            )
+        return self._process_data_use_case
+
+    def get_process_data_batch_use_case(self) -> ProcessDataBatchUseCase:
+        """Returns the batch use case sharing the service and repository of the single extraction"""
+        if self._process_data_batch_use_case is None:
+            process_data_use_case = self.get_process_data_use_case()
+            self._process_data_batch_use_case = ProcessDataBatchUseCase(
+                process_data_service=process_data_use_case.process_data_service,
+                storage_repository=process_data_use_case.storage_repository,
+                max_parallel_downloads=settings.BATCH_MAX_PARALLEL_DOWNLOADS,
+                max_parallel_extractions=settings.BATCH_MAX_PARALLEL_EXTRACTIONS,
+                metrics_recorder=self.metrics_recorder,
+                process_data_use_case=process_data_use_case
+            )
+        return self._process_data_batch_use_case
+
+    def get_extraction_job_use_case(self) -> ExtractionJobUseCase:
+        """Returns the jobs use case wired with the shared use case and queue"""
+        if self._extraction_job_use_case is None:
+            process_data_use_case = self.get_process_data_use_case()
+            self._extraction_job_use_case = ExtractionJobUseCase(
+                process_data_use_case=process_data_use_case,
+                storage_repository=process_data_use_case.storage_repository,
+                job_queue=self.job_queue,
+                metrics_recorder=self.metrics_recorder
+            )
+        return self._extraction_job_use_case
+
+    def get_case_query_use_case(self) -> CaseQueryUseCase:
+        """Returns the read use case sharing the repository of the extraction"""
+        if self._case_query_use_case is None:
+            self._case_query_use_case = CaseQueryUseCase(
+                storage_repository=self.storage_repository
+            )
+        return self._case_query_use_case
+
+    def get_job_worker_pool(self) -> ExtractionJobWorkerPool:
+        if self._job_worker_pool is None:
+            self._job_worker_pool = ExtractionJobWorkerPool(
+                job_queue=self.job_queue,
+                job_use_case=self.get_extraction_job_use_case(),
+                workers=settings.JOB_WORKERS,
+                wait_seconds=settings.JOB_QUEUE_WAIT_SECONDS
+            )
+        return self._job_worker_pool
+
+    def get_file_sweeper(self):
+        if self._file_sweeper is None:
+            from src.infrastruture.adapters.gemini_file_sweeper import GeminiFileSweeper
+            self._file_sweeper = GeminiFileSweeper(
+                gemini_client=self.gemini_client,
+                interval_seconds=settings.GEMINI_FILE_SWEEP_INTERVAL_SECONDS,
+                max_idle_seconds=settings.GEMINI_FILE_MAX_IDLE_SECONDS
+            )
+        return self._file_sweeper
+
+    async def aclose(self) -> None:
+        """Stops the background tasks and closes the connection pools owned by the container"""
+        self.logger.info("Closing container clients")
+        if self._job_worker_pool is not None:
+            await self._job_worker_pool.stop()
+        if self._file_sweeper is not None:
+            await self._file_sweeper.stop()
+        # only the clients that were built
+        clients = self._clients
+        if "async_http_client" in clients:
+            await clients["async_http_client"].aclose()
+        if "mongo_client" in clients:
+            clients["mongo_client"].close()
+        if "async_mongo_client" in clients:
+            await clients["async_mongo_client"].close()
+
+
+_container: Container | None = None
+_container_lock = threading.Lock()
+
+
+def get_container() -> Container:
+    """Returns the process-wide container, building it on first use"""
+    global _container
+    if _container is None:
+        with _container_lock:
+            if _container is None:
+                _container = Container()
+    return _container
+
+
+async def close_container() -> None:
+    """Closes and discards the process-wide container, if it was built"""
+    global _container
+    with _container_lock:
+        container, _container = _container, None
+    if container is not None:
+        await container.aclose()
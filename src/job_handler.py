@@ -0,0 +1,31 @@
+import asyncio
+import json
+import logging
+import src.infrastruture.configs.log_config  # logging configuratio
+from src.infrastruture.container import get_container
+
+logger = logging.getLogger(__name__)
+
+# one loop for the lifetime of the container, the async clients of the container stay bound to it
+_loop = asyncio.new_event_loop()
+asyncio.set_event_loop(_loop)
+
+
+async def _process_records(records: list[dict]) -> list[dict]:
+    """Processes the SQS records and returns the ids of the messages to be retried"""
+    job_use_case = get_container().get_extraction_job_use_case()
+    failures = []
+    for record in records:
+        try:
+            await job_use_case.process_async(json.loads(record["body"]))
+        except Exception as e:
+            # failed extractions are recorded in the job, only unexpected errors are retried
+            logger.error(f"Failed to process SQS message {record.get('messageId')}: {e}", exc_info=True)
+            failures.append({"itemIdentifier": record["messageId"]})
+    return failures
+
+
+def handler(event: dict, context) -> dict:
+    """AWS Lambda entry point for the extraction jobs queue (SQS event source with partial batch responses)"""
+    failures = _loop.run_until_complete(_process_records(event.get("Records", [])))
+    return {"batchItemFailures": failures}
@@ -0,0 +1,9 @@
+import src.infrastruture.configs.log_config  # logging configuratio
+from mangum import Mangum # aws lambda
+from src.app_factory import create_app
+
+# slim entry point of the api function: no lifespan (the job workers and the file sweeper belong
+# to the api server, and mangum would run it on every invocation) and no uvicorn code. The
+# container is built on the first invocation and kept warm across the following ones.
+app = create_app()
+handler = Mangum(app, lifespan="off")
@@ -1,15 +1,35 @@
-import sys
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from logging.config import dictConfig
-from src.routes.process__data_routes import router as process_data_router
 import src.infrastruture.configs.log_config  # logging configuratio
 from mangum import Mangum # aws lambda
+from src.app_factory import create_app
 from src.infrastruture.configs.app_config import settings
+from src.infrastruture.container import close_container, get_container
 
-app = FastAPI(title="Cria AI Juridic Intelligence Challenge", version="1.0.0")
-app.include_router(process_data_router)
 
-handler = Mangum(app) # aws lambda
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # build the shared clients once and close their pools on shutdown
+    container = get_container()
+    try:
+        await container.storage_repository.ensure_indexes_async()
+    except Exception as e:
+        # the api still serves the extractions, the reads check the indexes again
+        logging.getLogger(__name__).warning(f"Failed to ensure the MongoDB indexes at startup: {e}")
+    if settings.JOB_WORKERS > 0:
+        container.get_job_worker_pool().start()
+    if settings.GEMINI_FILE_SWEEP_INTERVAL_SECONDS > 0:
+        container.get_file_sweeper().start()
+    yield
+    await close_container()
+
+app = create_app(lifespan=lifespan)
+
+# aws lambda: kept for the deployments pointing to src.main.handler, src.lambda_handler.handler
+# is the slim entry point. mangum runs the lifespan on every invocation, so it is disabled to keep
+# the container (built on first use) and its connections warm across invocations
+handler = Mangum(app, lifespan="off")
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,41 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.application.dtos.input.case_query_input_dto import CaseQueryInputDTO, CaseView
+from src.application.dtos.output.case_output_dto import CaseListOutputDTO, CaseSummaryOutputDTO
+from src.application.dtos.output.process_data_output_dto import ProcessDataOutputDTO
+from src.application.use_cases.case_query_use_case import CaseQueryUseCase
+from src.infrastruture.container import get_container
+
+router = APIRouter()
+
+
+def get_case_query_use_case() -> CaseQueryUseCase:
+    """Returns the read use case shared by all requests"""
+    return get_container().get_case_query_use_case()
+
+@router.get("/cases", response_model=CaseListOutputDTO)
+async def list_cases(query: Annotated[CaseQueryInputDTO, Query()], case_query_use_case: CaseQueryUseCase = Depends(get_case_query_use_case)):
+    """
+    Lists the persisted cases newest first, filtered by persisted_at range, event date range and evidence name. Pass the next_cursor of a page to get the following one.
+    """
+    try:
+        return await case_query_use_case.list_cases_async(query)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cases/{case_id}", response_model=ProcessDataOutputDTO | CaseSummaryOutputDTO)
+async def get_case(case_id: str, view: CaseView = CaseView.FULL, case_query_use_case: CaseQueryUseCase = Depends(get_case_query_use_case)):
+    """
+    Returns the persisted data of a case, view=summary returns only the resume without the timeline and evidence.
+    """
+    try:
+        case = await case_query_use_case.get_case_async(case_id, view)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if case is None:
+        raise HTTPException(status_code=404, detail=f"Case {case_id} not found")
+    return case
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.application.dtos.input.process_data_input_dto import ProcessDataInputDTO
+from src.application.dtos.output.extraction_job_output_dto import ExtractionJobOutputDTO, ExtractionJobStatus
+from src.application.dtos.output.process_data_output_dto import ProcessDataOutputDTO
+from src.application.use_cases.extraction_job_use_case import ExtractionJobUseCase
+from src.infrastruture.container import get_container
+
+router = APIRouter()
+
+
+def get_extraction_job_use_case() -> ExtractionJobUseCase:
+    """Returns the jobs use case shared by all requests"""
+    return get_container().get_extraction_job_use_case()
+
+@router.post("/extract/jobs", response_model=ExtractionJobOutputDTO, status_code=202)
+async def submit_extraction_job(request: ProcessDataInputDTO, job_use_case: ExtractionJobUseCase = Depends(get_extraction_job_use_case)):
+    """
+    Submits the extraction of the pdf file as a background job and returns the job id immediately, without waiting for the extraction.
+    """
+    try:
+        return await job_use_case.submit_async(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/extract/jobs/{job_id}", response_model=ExtractionJobOutputDTO)
+async def get_extraction_job(job_id: str, job_use_case: ExtractionJobUseCase = Depends(get_extraction_job_use_case)):
+    """
+    Returns the status of an extraction job.
+    """
+    job = await job_use_case.get_job_async(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@router.get("/extract/jobs/{job_id}/result", response_model=ProcessDataOutputDTO)
+async def get_extraction_job_result(job_id: str, job_use_case: ExtractionJobUseCase = Depends(get_extraction_job_use_case)):
+    """
+    Returns the data extracted by a succeeded job, or 409 while the job is not finished.
+    """
+    job = await job_use_case.get_job_async(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job.status != ExtractionJobStatus.SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job.status.value}: {job.error or 'result not available yet'}")
+
+    result = await job_use_case.get_result_async(job_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Result of job {job_id} not found")
+    return result
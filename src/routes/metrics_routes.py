@@ -0,0 +1,49 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.infrastruture.adapters.prometheus_metrics_recorder import get_metrics_recorder
+from src.infrastruture.container import get_container
+
+router = APIRouter()
+
+CIRCUIT_STATES = ("closed", "open", "half_open")
+
+
+def _set_component_gauges() -> None:
+    """Copies the counters of the cache and of the gemini call policy into gauges, once they are built"""
+    metrics_recorder = get_metrics_recorder()
+    container = get_container()
+    # a scrape never builds the clients (nor imports their sdk) on a cold container
+    if container.is_initialized("extraction_cache") and container.extraction_cache is not None:
+        for name, value in container.extraction_cache.stats().items():
+            if isinstance(value, (int, float)):
+                metrics_recorder.set_gauge(f"extraction_cache_{name}", value)
+
+    if not container.is_initialized("llm_client"):
+        return
+    llm_stats = container.llm_client.stats()
+    # the router has a policy layer per route
+    for route, route_stats in llm_stats.pop("routes", {}).items():
+        _set_llm_policy_gauges(route_stats, {"route": route})
+    if llm_stats:
+        _set_llm_policy_gauges(llm_stats, {})
+
+
+def _set_llm_policy_gauges(llm_stats: dict, labels: dict[str, str]) -> None:
+    metrics_recorder = get_metrics_recorder()
+    circuit_state = llm_stats.pop("circuit_state", None)
+    for name, value in llm_stats.items():
+        metrics_recorder.set_gauge(f"llm_policy_{name}", value, labels)
+    if circuit_state is None:
+        return
+    for state in CIRCUIT_STATES:
+        metrics_recorder.set_gauge("llm_circuit_state", 1 if state == circuit_state else 0, {**labels, "state": state})
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """
+    Returns the metrics of the process in the Prometheus text format.
+    """
+    _set_component_gauges()
+    return PlainTextResponse(get_metrics_recorder().render(), media_type="text/plain; version=0.0.4")
@@ -1,20 +1,93 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
 
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from src.application.dtos.input.process_data_batch_input_dto import ProcessDataBatchInputDTO
 from src.application.dtos.input.process_data_input_dto import ProcessDataInputDTO
+from src.application.dtos.output.process_data_batch_output_dto import ProcessDataBatchOutputDTO
 from src.application.dtos.output.process_data_output_dto import ProcessDataOutputDTO
+from src.application.use_cases.extract_process_data_batch_use_case import ProcessDataBatchUseCase
 from src.application.use_cases.extract_process_data_use_case import ProcessDataUseCase
+from src.infrastruture.configs.app_config import settings
+from src.infrastruture.container import get_container
 
 router = APIRouter()
 
+
+def get_process_data_use_case() -> ProcessDataUseCase:
+    """Returns the use case shared by all requests"""
+    return get_container().get_process_data_use_case()
+
+
+def get_process_data_batch_use_case() -> ProcessDataBatchUseCase:
+    """Returns the batch use case shared by all requests"""
+    return get_container().get_process_data_batch_use_case()
+
 # @router.post("/extract", response_model=ProcessDataOutputDTO)
 @router.post("/extract")
-async def extract_process_data(request: ProcessDataInputDTO, process_data_use_case: ProcessDataUseCase = Depends(ProcessDataUseCase)):
+async def extract_process_data(request: ProcessDataInputDTO, process_data_use_case: ProcessDataUseCase = Depends(get_process_data_use_case)):
     """
     Extract data from pdf file provided as an url in the request body and returns a json containing the extracted data in a strutured format.
     """
     try:
-        result = process_data_use_case.execute(request)
+        result = await process_data_use_case.execute_async(request)
         return result
 
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def format_ndjson_event(event: tuple[str, dict]) -> str:
+    name, data = event
+    return json.dumps({"event": name, "data": data}, ensure_ascii=False) + "\n"
+
+
+def format_sse_event(event: tuple[str, dict]) -> str:
+    name, data = event
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/extract/stream")
+async def extract_process_data_stream(request: ProcessDataInputDTO, http_request: Request, process_data_use_case: ProcessDataUseCase = Depends(get_process_data_use_case)):
+    """
+    Streaming variant of /extract: sends the resume, each timeline event and each evidence as soon as they are extracted,
+    then a 'completed' event once the case is persisted (or an 'error' event). The events are NDJSON lines
+    {"event": ..., "data": ...}, or Server-Sent Events when the request accepts text/event-stream.
+    """
+    events = process_data_use_case.execute_stream_async(request)
+    try:
+        # a failed download still answers with an error status, before the stream starts
+        first_event = await anext(events)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    use_sse = "text/event-stream" in http_request.headers.get("accept", "")
+    format_event = format_sse_event if use_sse else format_ndjson_event
+
+    async def stream_events():
+        try:
+            yield format_event(first_event)
+            async for event in events:
+                yield format_event(event)
+        except Exception as e:
+            yield format_event(("error", {"detail": str(e)}))
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/extract/batch", response_model=ProcessDataBatchOutputDTO)
+async def extract_process_data_batch(request: ProcessDataBatchInputDTO, batch_use_case: ProcessDataBatchUseCase = Depends(get_process_data_batch_use_case)):
+    """
+    Extract data from a list of pdf files concurrently and returns the result of each item, a failing item does not fail the batch.
+    """
+    if len(request.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=422, detail=f"A batch accepts at most {settings.BATCH_MAX_ITEMS} items")
+    try:
+        return await batch_use_case.execute_async(request)
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,66 @@
+import asyncio
+from unittest.mock import MagicMock
+import pytest
+from src.application.services.process_data_service import ProcessDataService
+from src.infrastruture.adapters.memory_extraction_cache import InMemoryExtractionCache
+from src.infrastruture.adapters.stub_llm_client import StubLlmClient
+
+PDF_BINARY = b"%PDF-1.4 test document"
+
+
+class MalformedLlmClient(StubLlmClient):
+    """Answers an extraction missing the resume"""
+    def extract_data_from_pdf(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        return {"timeline": [], "evidence": []}
+
+    async def extract_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        return {"timeline": [], "evidence": []}
+
+    async def stream_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None):
+        yield '{"timeline": [], "evidence": []}'
+
+
+def build_service(llm_client: StubLlmClient, extraction_cache: InMemoryExtractionCache) -> ProcessDataService:
+    pdf_processor = MagicMock()
+    pdf_processor.count_pages.return_value = 1
+    return ProcessDataService(
+        llm_client=llm_client,
+        extraction_cache=extraction_cache,
+        pdf_processor=pdf_processor,
+        metrics_recorder=MagicMock()
+    )
+
+
+def test_valid_extraction_is_cached_as_json():
+    extraction_cache = InMemoryExtractionCache()
+    service = build_service(StubLlmClient(latency_seconds=0), extraction_cache)
+
+    extracted_data = asyncio.run(service.extract_information_from_pdf_async(PDF_BINARY))
+
+    cached_data = extraction_cache.get(service._build_cache_key(PDF_BINARY))
+    assert cached_data == extracted_data
+    assert cached_data["timeline"][0]["event_date"] == "1970-01-01"
+
+
+def test_invalid_extraction_is_not_cached():
+    extraction_cache = InMemoryExtractionCache()
+    service = build_service(MalformedLlmClient(), extraction_cache)
+
+    with pytest.raises(Exception):
+        asyncio.run(service.extract_information_from_pdf_async(PDF_BINARY))
+
+    assert extraction_cache.get(service._build_cache_key(PDF_BINARY)) is None
+
+
+def test_invalid_streamed_extraction_is_not_cached():
+    extraction_cache = InMemoryExtractionCache()
+    service = build_service(MalformedLlmClient(), extraction_cache)
+
+    async def consume():
+        async for _ in service.stream_information_from_pdf_async(PDF_BINARY):
+            pass
+
+    with pytest.raises(Exception):
+        asyncio.run(consume())
+
+    assert extraction_cache.get(service._build_cache_key(PDF_BINARY)) is None
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from src.application.services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def extract(value: str) -> str:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value.upper()
+
+    async def run_concurrently():
+        return await asyncio.gather(*[single_flight.run("key", extract, "data") for _ in range(3)])
+
+    results = asyncio.run(run_concurrently())
+
+    assert calls == ["data"]
+    assert sorted(results, key=lambda result: result[1]) == [("DATA", False), ("DATA", True), ("DATA", True)]
+
+
+def test_different_keys_run_apart():
+    single_flight = SingleFlight()
+
+    async def run_concurrently():
+        return await asyncio.gather(
+            single_flight.run("a", asyncio.sleep, 0.01, "a"),
+            single_flight.run("b", asyncio.sleep, 0.01, "b")
+        )
+
+    assert asyncio.run(run_concurrently()) == [("a", False), ("b", False)]
+
+
+def test_exception_is_shared_and_the_key_is_released():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    async def run_concurrently():
+        return await asyncio.gather(single_flight.run("key", fail), single_flight.run("key", fail), return_exceptions=True)
+
+    errors = asyncio.run(run_concurrently())
+
+    assert len(calls) == 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    # a later call runs again
+    with pytest.raises(RuntimeError):
+        asyncio.run(single_flight.run("key", fail))
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    single_flight = SingleFlight()
+
+    async def extract() -> str:
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def cancel_first_caller():
+        first = asyncio.create_task(single_flight.run("key", extract))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(single_flight.run("key", extract))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(cancel_first_caller()) == ("done", True)
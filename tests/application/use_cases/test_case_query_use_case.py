@@ -0,0 +1,56 @@
+import asyncio
+import base64
+from unittest.mock import AsyncMock
+import pytest
+from src.application.dtos.input.case_query_input_dto import CaseQueryInputDTO
+from src.application.use_cases.case_query_use_case import CaseQueryUseCase
+
+
+def build_case(index: int) -> dict:
+    return {"case_id": f"case-{index}", "resume": "resume", "persisted_at": f"2025-08-{28 - index:02d}T00:00:00Z"}
+
+
+def test_cursor_round_trip():
+    use_case = CaseQueryUseCase(storage_repository=AsyncMock())
+
+    cursor = use_case._encode_cursor(build_case(0))
+
+    assert use_case._decode_cursor(cursor) == ("2025-08-28T00:00:00Z", "case-0")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !",
+    base64.urlsafe_b64encode(b"not json").decode("ascii"),
+    base64.urlsafe_b64encode(b'["2025-08-28T00:00:00Z"]').decode("ascii"),
+    base64.urlsafe_b64encode(b'[1, "case-0"]').decode("ascii"),
+    base64.urlsafe_b64encode(b'["yesterday", "case-0"]').decode("ascii")
+])
+def test_invalid_cursor_is_rejected(cursor: str):
+    use_case = CaseQueryUseCase(storage_repository=AsyncMock())
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        use_case._decode_cursor(cursor)
+
+
+def test_next_cursor_points_at_the_last_case_of_the_page():
+    storage_repository = AsyncMock()
+    storage_repository.find_cases_async.return_value = [build_case(index) for index in range(3)]
+    use_case = CaseQueryUseCase(storage_repository=storage_repository)
+
+    page = asyncio.run(use_case.list_cases_async(CaseQueryInputDTO(limit=2)))
+
+    assert [item.case_id for item in page.items] == ["case-0", "case-1"]
+    assert use_case._decode_cursor(page.next_cursor) == ("2025-08-27T00:00:00Z", "case-1")
+    # one extra case is read to know whether there is a next page
+    assert storage_repository.find_cases_async.call_args.kwargs["limit"] == 3
+
+
+def test_last_page_has_no_cursor():
+    storage_repository = AsyncMock()
+    storage_repository.find_cases_async.return_value = [build_case(0)]
+    use_case = CaseQueryUseCase(storage_repository=storage_repository)
+
+    page = asyncio.run(use_case.list_cases_async(CaseQueryInputDTO(limit=2, cursor=use_case._encode_cursor(build_case(5)))))
+
+    assert page.next_cursor is None
+    assert storage_repository.find_cases_async.call_args.kwargs["after"] == ("2025-08-23T00:00:00Z", "case-5")
@@ -0,0 +1,67 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from src.application.dtos.input.process_data_batch_input_dto import ProcessDataBatchInputDTO
+from src.application.use_cases.extract_process_data_batch_use_case import ProcessDataBatchUseCase
+from src.domain.ports.storage_repository_interface import PartialSaveError
+
+EXTRACTION = {"resume": "resume", "timeline": [], "evidence": []}
+
+
+def build_batch(size: int) -> ProcessDataBatchInputDTO:
+    return ProcessDataBatchInputDTO(items=[
+        {"pdf_url": f"https://example.com/{index}.pdf", "case_id": f"case-{index}"} for index in range(size)
+    ])
+
+
+def build_use_case(process_data_service, storage_repository, process_data_use_case) -> ProcessDataBatchUseCase:
+    return ProcessDataBatchUseCase(
+        process_data_service=process_data_service,
+        storage_repository=storage_repository,
+        max_parallel_downloads=2,
+        max_parallel_extractions=1,
+        metrics_recorder=MagicMock(),
+        process_data_use_case=process_data_use_case
+    )
+
+
+def test_downloaded_pdfs_waiting_for_extraction_are_bounded():
+    held = {"current": 0, "peak": 0}
+
+    async def download(pdf_url: str) -> bytes:
+        held["current"] += 1
+        held["peak"] = max(held["peak"], held["current"])
+        return b"%PDF-"
+
+    async def extract(case_id: str, pdf_binary: bytes):
+        await asyncio.sleep(0.01)
+        held["current"] -= 1
+        return dict(EXTRACTION), None
+
+    process_data_service = MagicMock()
+    process_data_service.dowload_pdf_from_url_async = download
+    process_data_use_case = MagicMock()
+    process_data_use_case.extract_document_async = extract
+    use_case = build_use_case(process_data_service, AsyncMock(), process_data_use_case)
+
+    result = asyncio.run(use_case.execute_async(build_batch(10)))
+
+    assert result.succeeded == 10
+    # the downloads in progress or waiting plus the extraction in progress
+    assert held["peak"] <= 3
+
+
+def test_partial_save_only_fails_the_cases_not_saved():
+    process_data_service = MagicMock()
+    process_data_service.dowload_pdf_from_url_async = AsyncMock(return_value=b"%PDF-")
+    process_data_use_case = MagicMock()
+    process_data_use_case.extract_document_async = AsyncMock(return_value=(dict(EXTRACTION), None))
+    storage_repository = AsyncMock()
+    storage_repository.save_many_async.side_effect = PartialSaveError({"case-1": "duplicate key"})
+    use_case = build_use_case(process_data_service, storage_repository, process_data_use_case)
+
+    result = asyncio.run(use_case.execute_async(build_batch(3)))
+
+    assert (result.succeeded, result.failed) == (2, 1)
+    failed = [item for item in result.items if not item.success]
+    assert [item.case_id for item in failed] == ["case-1"]
+    assert "duplicate key" in failed[0].error
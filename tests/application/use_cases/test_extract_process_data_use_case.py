@@ -0,0 +1,50 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from src.application.dtos.input.process_data_input_dto import ProcessDataInputDTO
+from src.application.use_cases.extract_process_data_use_case import ProcessDataUseCase
+
+INPUT_DTO = ProcessDataInputDTO(pdf_url="https://example.com/case.pdf", case_id="case-0")
+
+
+def build_use_case(events: list[tuple[str, object]], storage_repository: AsyncMock) -> ProcessDataUseCase:
+    async def stream_information_from_pdf_async(pdf_binary: bytes, page_count: int | None = None):
+        for event in events:
+            yield event
+
+    process_data_service = MagicMock()
+    process_data_service.dowload_pdf_from_url_async = AsyncMock(return_value=b"%PDF-")
+    process_data_service.hash_pages_async = AsyncMock(return_value=None)
+    process_data_service.stream_information_from_pdf_async = stream_information_from_pdf_async
+    return ProcessDataUseCase(
+        process_data_service=process_data_service,
+        storage_repository=storage_repository,
+        metrics_recorder=MagicMock()
+    )
+
+
+async def collect(events) -> list[tuple[str, object]]:
+    return [event async for event in events]
+
+
+def test_stream_is_persisted_once_completed():
+    storage_repository = AsyncMock()
+    use_case = build_use_case([
+        ("resume", "resume"),
+        ("completed", {"resume": "resume", "timeline": [], "evidence": []})
+    ], storage_repository)
+
+    events = asyncio.run(collect(use_case.execute_stream_async(INPUT_DTO)))
+
+    assert [name for name, _ in events] == ["started", "resume", "completed"]
+    storage_repository.save_async.assert_awaited_once()
+
+
+def test_stream_without_completion_fails_without_persisting():
+    storage_repository = AsyncMock()
+    use_case = build_use_case([("resume", "resume")], storage_repository)
+
+    with pytest.raises(ValueError, match="without the extracted data"):
+        asyncio.run(collect(use_case.execute_stream_async(INPUT_DTO)))
+
+    storage_repository.save_async.assert_not_awaited()
@@ -0,0 +1,43 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from src.infrastruture.adapters.gemini_client import GeminiClient
+from src.infrastruture.adapters.memory_file_registry import InMemoryFileRegistry
+
+
+def register_idle_file(file_registry: InMemoryFileRegistry, content_hash: str) -> None:
+    now = datetime.now(timezone.utc)
+    file_registry.save(content_hash, {
+        "name": f"files/{content_hash}",
+        "uri": f"https://files/{content_hash}",
+        "mime_type": "application/pdf",
+        "expires_at": now + timedelta(days=1),
+        "last_used_at": now - timedelta(days=1)
+    })
+
+
+def build_client(file_registry: InMemoryFileRegistry) -> GeminiClient:
+    client = MagicMock()
+    client.aio.files.upload = AsyncMock(return_value=MagicMock(mime_type="application/pdf", expiration_time=None))
+    client.aio.files.delete = AsyncMock()
+    return GeminiClient(client=client, file_registry=file_registry, metrics_recorder=MagicMock(), model_name="test")
+
+
+def test_upload_sweeps_the_idle_files_once_per_interval():
+    file_registry = InMemoryFileRegistry()
+    gemini_client = build_client(file_registry)
+
+    async def upload_twice():
+        register_idle_file(file_registry, "idle-1")
+        await gemini_client._upload_pdf_async(b"%PDF-1", "pdf-1")
+        await gemini_client._sweep_task
+        register_idle_file(file_registry, "idle-2")
+        await gemini_client._upload_pdf_async(b"%PDF-2", "pdf-2")
+        await asyncio.sleep(0)
+
+    asyncio.run(upload_twice())
+
+    # the second upload comes within the sweep interval, the file idle since then is kept
+    gemini_client.client.aio.files.delete.assert_awaited_once_with(name="files/idle-1")
+    assert file_registry.get("idle-1") is None
+    assert file_registry.get("idle-2") is not None
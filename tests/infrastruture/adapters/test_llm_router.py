@@ -0,0 +1,34 @@
+import asyncio
+from unittest.mock import MagicMock
+from src.infrastruture.adapters.llm_router import LlmRoute, LlmRouter
+from src.infrastruture.adapters.stub_llm_client import StubLlmClient
+
+
+def build_router(pdf_processor: MagicMock) -> LlmRouter:
+    return LlmRouter([
+        LlmRoute(name="small", llm_client=StubLlmClient(model_name="small", latency_seconds=0), max_pages=10, cost_per_page=0.5),
+        LlmRoute(name="large", llm_client=StubLlmClient(model_name="large", latency_seconds=0))
+    ], pdf_processor=pdf_processor, metrics_recorder=MagicMock())
+
+
+def test_known_page_count_routes_without_parsing_the_pdf():
+    pdf_processor = MagicMock()
+    router = build_router(pdf_processor)
+
+    data = asyncio.run(router.extract_data_from_pdf_async(b"%PDF-", page_count=50))
+
+    pdf_processor.count_pages.assert_not_called()
+    assert "large" in data["resume"]
+    # the route client gets the page count too
+    assert data["timeline"][0]["event_page_end"] == 50
+
+
+def test_unknown_page_count_is_parsed_once():
+    pdf_processor = MagicMock()
+    pdf_processor.count_pages.return_value = 5
+    router = build_router(pdf_processor)
+
+    data = asyncio.run(router.extract_chunk_data_from_pdf_async(b"%PDF-"))
+
+    pdf_processor.count_pages.assert_called_once()
+    assert data["timeline"][0]["event_page_end"] == 5
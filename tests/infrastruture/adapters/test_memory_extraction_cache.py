@@ -0,0 +1,46 @@
+import time
+from src.infrastruture.adapters.memory_extraction_cache import InMemoryExtractionCache
+
+EXTRACTION = {"resume": "resume", "timeline": [{"event_id": 0}], "evidence": []}
+
+
+def test_get_returns_a_copy_of_the_cached_data():
+    cache = InMemoryExtractionCache()
+    cache.set("key", EXTRACTION)
+
+    cached_data = cache.get("key")
+    cached_data["timeline"].append({"event_id": 1})
+
+    assert cache.get("key") == EXTRACTION
+    assert cache.stats() == {"hits": 2, "misses": 0, "size": 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = InMemoryExtractionCache(max_size=2)
+    cache.set("a", EXTRACTION)
+    cache.set("b", EXTRACTION)
+    cache.get("a")
+
+    cache.set("c", EXTRACTION)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == EXTRACTION
+    assert cache.get("c") == EXTRACTION
+
+
+def test_expired_entry_is_a_miss(monkeypatch):
+    cache = InMemoryExtractionCache(ttl_seconds=10)
+    cache.set("key", EXTRACTION)
+    now = time.monotonic()
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+    assert cache.get("key") is None
+    assert cache.stats() == {"hits": 0, "misses": 1, "size": 0}
+
+
+def test_zero_max_size_disables_the_cache():
+    cache = InMemoryExtractionCache(max_size=0)
+    cache.set("key", EXTRACTION)
+
+    assert cache.get("key") is None
@@ -0,0 +1,110 @@
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from pymongo import DeleteMany, UpdateOne
+from pymongo.errors import BulkWriteError
+from src.domain.ports.storage_repository_interface import PartialSaveError
+from src.infrastruture.adapters.mongodb_normalized_repository import MongoDBNormalizedRepository
+
+CASE_DATA = {"resume": "resume", "timeline": [], "evidence": [], "persisted_at": "2025-08-28T00:00:00Z"}
+
+
+def build_event(event_id: int, event_name: str = "name") -> dict:
+    return {
+        "event_id": event_id,
+        "event_name": event_name,
+        "event_description": "description",
+        "event_date": "2024-08-28",
+        "event_page_init": 1,
+        "event_page_end": 1
+    }
+
+
+def build_repository() -> MongoDBNormalizedRepository:
+    return MongoDBNormalizedRepository(client=MagicMock(), async_client=MagicMock())
+
+
+def test_unchanged_items_are_not_written():
+    repository = build_repository()
+    events = [build_event(0), build_event(1)]
+    existing_hashes = {event["event_id"]: repository._hash_item(event) for event in events}
+
+    assert repository._build_item_writes("case-0", events, "event_id", existing_hashes, date_key="event_date") == []
+
+
+def test_changed_and_new_items_are_upserted_with_bson_dates():
+    repository = build_repository()
+    existing_hashes = {0: repository._hash_item(build_event(0)), 1: repository._hash_item(build_event(1))}
+    changed_event, new_event = build_event(1, "renamed"), build_event(2)
+
+    writes = repository._build_item_writes(
+        "case-0", [build_event(0), changed_event, new_event], "event_id", existing_hashes, date_key="event_date"
+    )
+
+    assert writes == [
+        UpdateOne({"case_id": "case-0", "event_id": event["event_id"]}, {"$set": {
+            **event,
+            "case_id": "case-0",
+            "content_hash": repository._hash_item(event),
+            "event_date": datetime.datetime(2024, 8, 28, tzinfo=datetime.timezone.utc)
+        }}, upsert=True)
+        for event in (changed_event, new_event)
+    ]
+
+
+def test_items_no_longer_extracted_are_deleted():
+    repository = build_repository()
+    existing_hashes = {event_id: repository._hash_item(build_event(event_id)) for event_id in range(4)}
+
+    writes = repository._build_item_writes("case-0", [build_event(0), build_event(2)], "event_id", existing_hashes)
+
+    assert writes == [DeleteMany({"case_id": "case-0", "event_id": {"$in": [1, 3]}})]
+
+
+def test_writes_are_paired_with_their_case():
+    repository = build_repository()
+    data_by_case_id = {
+        "case-0": {**CASE_DATA, "timeline": [build_event(0)]},
+        "case-1": {**CASE_DATA, "evidence": [{"evidence_id": 0, "evidence_name": "name", "evidence_flaw": None, "evidence_page_init": 1, "evidence_page_end": 1}]}
+    }
+    # case-1 had a timeline event, gone from the new extraction
+    timeline_hashes = {"case-1": {0: "previous hash"}}
+
+    case_writes, timeline_writes, evidence_writes = repository._build_writes(data_by_case_id, timeline_hashes, {})
+
+    assert [case_id for case_id, _ in case_writes] == ["case-0", "case-1"]
+    assert [case_id for case_id, _ in timeline_writes] == ["case-0", "case-1"]
+    assert isinstance(timeline_writes[1][1], DeleteMany)
+    assert [case_id for case_id, _ in evidence_writes] == ["case-1"]
+    # the header counts the items and drops the arrays of the embedded layout
+    header_update = case_writes[0][1]._doc
+    assert header_update["$set"]["timeline_count"] == 1
+    assert header_update["$set"]["persisted_at"] == datetime.datetime(2025, 8, 28, tzinfo=datetime.timezone.utc)
+    assert header_update["$unset"] == {"timeline": "", "evidence": ""}
+
+
+def bulk_write_error(*indexes: int) -> BulkWriteError:
+    return BulkWriteError({
+        "writeErrors": [{"index": index, "code": 11000, "errmsg": f"duplicate key {index}"} for index in indexes],
+        "writeConcernErrors": []
+    })
+
+
+def test_normalized_header_is_not_written_when_its_items_failed():
+    repository = build_repository()
+    for name in ("async_timeline_collection", "async_evidence_collection"):
+        collection = MagicMock(bulk_write=AsyncMock())
+        collection.find.return_value.to_list = AsyncMock(return_value=[])
+        setattr(repository, name, collection)
+    # the first event of case-1 is the second timeline write
+    repository.async_timeline_collection.bulk_write.side_effect = bulk_write_error(1)
+    repository.async_collection = MagicMock(bulk_write=AsyncMock())
+    data = {**CASE_DATA, "timeline": [build_event(0)]}
+
+    with pytest.raises(PartialSaveError) as error:
+        asyncio.run(repository.save_many_async({"case-0": data, "case-1": data}))
+
+    assert list(error.value.errors_by_case_id) == ["case-1"]
+    case_writes = repository.async_collection.bulk_write.call_args.args[0]
+    assert [write._filter for write in case_writes] == [{"case_id": "case-0"}]
@@ -0,0 +1,35 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from pymongo.errors import BulkWriteError
+from src.domain.ports.storage_repository_interface import PartialSaveError
+from src.infrastruture.adapters.mongodb_repository import MongoDBRepository
+
+CASE_DATA = {"resume": "resume", "timeline": [], "evidence": [], "persisted_at": "2025-08-28T00:00:00Z"}
+
+
+def bulk_write_error(*indexes: int) -> BulkWriteError:
+    return BulkWriteError({
+        "writeErrors": [{"index": index, "code": 11000, "errmsg": f"duplicate key {index}"} for index in indexes],
+        "writeConcernErrors": []
+    })
+
+
+def test_partial_bulk_write_reports_the_failed_cases():
+    repository = MongoDBRepository(client=MagicMock(), async_client=MagicMock())
+    repository.async_collection = MagicMock(bulk_write=AsyncMock(side_effect=bulk_write_error(1)))
+
+    with pytest.raises(PartialSaveError) as error:
+        asyncio.run(repository.save_many_async({"case-0": CASE_DATA, "case-1": CASE_DATA, "case-2": CASE_DATA}))
+
+    assert error.value.errors_by_case_id == {"case-1": "duplicate key 1"}
+
+
+def test_write_concern_error_fails_the_whole_bulk_write():
+    repository = MongoDBRepository(client=MagicMock(), async_client=MagicMock())
+    error = BulkWriteError({"writeErrors": [], "writeConcernErrors": [{"code": 64, "errmsg": "waiting for replication timed out"}]})
+    repository.async_collection = MagicMock(bulk_write=AsyncMock(side_effect=error))
+
+    with pytest.raises(BulkWriteError):
+        asyncio.run(repository.save_many_async({"case-0": CASE_DATA}))
+
@@ -0,0 +1,108 @@
+import asyncio
+import time
+import pytest
+from src.infrastruture.adapters.resilient_llm_client import CircuitBreaker, CircuitOpenError, ResilientLlmClient
+from src.infrastruture.adapters.stub_llm_client import StubLlmClient, StubLlmError
+
+RESET_SECONDS = 0.05
+
+
+class ScriptedLlmClient(StubLlmClient):
+    """Fails, hangs or answers each call as scripted"""
+    def __init__(self, outcomes: list[str]):
+        super().__init__(latency_seconds=0)
+        self.outcomes = outcomes
+
+    async def _next_outcome(self) -> dict:
+        outcome = self.outcomes.pop(0)
+        if outcome == "fail":
+            raise StubLlmError("503 UNAVAILABLE")
+        if outcome == "hang":
+            await asyncio.Event().wait()
+        return {"resume": outcome, "timeline": [], "evidence": []}
+
+    async def extract_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None) -> dict:
+        return await self._next_outcome()
+
+    async def stream_data_from_pdf_async(self, pdf_binary: bytes, page_count: int | None = None):
+        data = await self._next_outcome()
+        yield data["resume"]
+        yield "second fragment"
+
+
+def build_client(outcomes: list[str]) -> ResilientLlmClient:
+    return ResilientLlmClient(
+        ScriptedLlmClient(outcomes),
+        max_retries=0,
+        circuit_failure_threshold=1,
+        circuit_reset_seconds=RESET_SECONDS
+    )
+
+
+async def open_circuit(client: ResilientLlmClient) -> None:
+    with pytest.raises(StubLlmError):
+        await client.extract_data_from_pdf_async(b"")
+    assert client.circuit_breaker.state == "open"
+    await asyncio.sleep(RESET_SECONDS * 1.2)
+
+
+def test_breaker_opens_after_threshold_and_closes_after_successful_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=RESET_SECONDS)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(RESET_SECONDS * 1.2)
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    # a single trial at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_breaker_allows_a_new_trial_when_the_trial_never_reports():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=RESET_SECONDS)
+    breaker.record_failure()
+    time.sleep(RESET_SECONDS * 1.2)
+    breaker.before_call()
+    time.sleep(RESET_SECONDS * 1.2)
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+
+def test_cancelled_trial_call_does_not_block_the_next_calls():
+    async def scenario():
+        client = build_client(["fail", "hang", "healthy"])
+        await open_circuit(client)
+
+        trial = asyncio.create_task(client.extract_data_from_pdf_async(b""))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        # immediately, without waiting for the trial to expire
+        data = await client.extract_data_from_pdf_async(b"")
+        assert data["resume"] == "healthy"
+        assert client.circuit_breaker.state == "closed"
+    asyncio.run(scenario())
+
+
+def test_abandoned_trial_stream_does_not_block_the_next_calls():
+    async def scenario():
+        client = build_client(["fail", "first", "healthy"])
+        await open_circuit(client)
+
+        fragments = client.stream_data_from_pdf_async(b"")
+        assert await anext(fragments) == "first"
+        # the consumer goes away (e.g. the client disconnected) before the end of the stream
+        await fragments.aclose()
+
+        data = await client.extract_data_from_pdf_async(b"")
+        assert data["resume"] == "healthy"
+    asyncio.run(scenario())
@@ -0,0 +1,26 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from benchmarks.cold_start import LAZY_MODULES
+
+CHILD_SCRIPT = """
+import json, sys
+import {module}
+print(json.dumps([name for name in {lazy_modules!r} if name in sys.modules]))
+"""
+
+
+@pytest.mark.parametrize("module", ["src.lambda_handler", "src.job_handler"])
+def test_handler_import_does_not_load_the_lazy_sdks(module: str):
+    # a fresh interpreter, the modules imported by the other tests do not count
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT.format(module=module, lazy_modules=LAZY_MODULES)],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "cold-start-check")},
+        timeout=60
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert json.loads(completed.stdout.splitlines()[-1]) == []